@@ -39,7 +39,8 @@ def init_database():
             original_token_count INTEGER,
             summarized_token_count INTEGER,
             current_agent TEXT DEFAULT 'flight_agent',
-            last_handoff TEXT
+            last_handoff TEXT,
+            brief_search TEXT
         )
     ''')
     
@@ -79,6 +80,24 @@ def init_database():
     except sqlite3.OperationalError:
         pass  # Column already exists
     
+    try:
+        cursor.execute('ALTER TABLE search_sessions ADD COLUMN brief_search TEXT')
+    except sqlite3.OperationalError:
+        pass  # Column already exists
+    
+    # One row per flight search, recording whether it took the fast path or the agent
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            path TEXT NOT NULL,
+            latency_ms REAL,
+            total_tokens INTEGER DEFAULT 0,
+            fallback_reason TEXT
+        )
+    ''')
+    
     conn.commit()
     conn.close()
 
@@ -101,8 +120,9 @@ def save_session_to_db(session_id: str, session_data: Dict):
     cursor.execute('''
         INSERT OR REPLACE INTO search_sessions 
         (session_id, title, updated_at, step, messages, research_brief, flight_results, chat_messages, status,
-         token_count, is_summarized, summarized_at, original_token_count, summarized_token_count, current_agent, last_handoff)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+         token_count, is_summarized, summarized_at, original_token_count, summarized_token_count, current_agent, last_handoff,
+         brief_search)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     ''', (
         session_id,
         session_data.get('title', f'Flight Search {session_id[:8]}'),
@@ -119,7 +139,8 @@ def save_session_to_db(session_id: str, session_data: Dict):
         session_data.get('original_token_count'),
         session_data.get('summarized_token_count'),
         session_data.get('current_agent', 'flight_agent'),
-        json.dumps(session_data.get('last_handoff')) if session_data.get('last_handoff') else None
+        json.dumps(session_data.get('last_handoff')) if session_data.get('last_handoff') else None,
+        json.dumps(session_data.get('brief_search')) if session_data.get('brief_search') else None
     ))
     
     conn.commit()
@@ -141,7 +162,8 @@ def load_session_from_db(session_id: str) -> Optional[Dict]:
     
     cursor.execute('''
         SELECT title, step, messages, research_brief, flight_results, chat_messages, status, created_at, updated_at,
-               token_count, is_summarized, summarized_at, original_token_count, summarized_token_count, current_agent, last_handoff
+               token_count, is_summarized, summarized_at, original_token_count, summarized_token_count, current_agent, last_handoff,
+               brief_search
         FROM search_sessions WHERE session_id = ?
     ''', (session_id,))
     
@@ -165,7 +187,8 @@ def load_session_from_db(session_id: str) -> Optional[Dict]:
             'original_token_count': row[12],
             'summarized_token_count': row[13],
             'current_agent': row[14] or 'flight_agent',
-            'last_handoff': json.loads(row[15]) if row[15] else None
+            'last_handoff': json.loads(row[15]) if row[15] else None,
+            'brief_search': json.loads(row[16]) if row[16] else None
         }
     return None
 
@@ -319,5 +342,76 @@ def cleanup_old_sessions(days_old: int = 30):
     return deleted_count
 
 
+def record_search_run(session_id: Optional[str], path: str, latency_ms: float,
+                      total_tokens: int = 0, fallback_reason: Optional[str] = None):
+    """
+    Record how a flight search was answered.
+    
+    Args:
+        session_id: Session the search belongs to, if any
+        path: 'fast' for the direct search, 'agent' for the flight agent
+        latency_ms: Time from starting the search to the final answer
+        total_tokens: Model tokens used by the search
+        fallback_reason: Why the fast path was not taken (agent runs only)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        INSERT INTO search_runs (session_id, created_at, path, latency_ms, total_tokens, fallback_reason)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (session_id, datetime.now().isoformat(), path, latency_ms, total_tokens, fallback_reason))
+    
+    conn.commit()
+    conn.close()
+
+
+def get_fast_path_report(days: Optional[int] = None) -> Dict:
+    """
+    Summarize how often the fast path is taken and how each path performs.
+    
+    The fast path only takes simple briefs, so the two paths' averages
+    describe different searches and their difference is not a saving.
+    
+    Args:
+        days: Only include searches from the last this many days (all if None)
+        
+    Returns:
+        Dictionary with run counts, the fast path rate, average latency and
+        tokens per path and how often each fallback reason occurred
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    since = (datetime.now() - timedelta(days=days)).isoformat() if days else ''
+    cursor.execute('''
+        SELECT path, COUNT(*), AVG(latency_ms), AVG(total_tokens)
+        FROM search_runs WHERE created_at >= ?
+        GROUP BY path
+    ''', (since,))
+    paths = {
+        row[0]: {'runs': row[1], 'avg_latency_ms': row[2] or 0.0, 'avg_tokens': row[3] or 0.0}
+        for row in cursor.fetchall()
+    }
+    
+    cursor.execute('''
+        SELECT fallback_reason, COUNT(*)
+        FROM search_runs WHERE created_at >= ? AND fallback_reason IS NOT NULL
+        GROUP BY fallback_reason ORDER BY COUNT(*) DESC
+    ''', (since,))
+    fallback_reasons = dict(cursor.fetchall())
+    conn.close()
+    
+    fast = paths.get('fast')
+    runs = sum(path['runs'] for path in paths.values())
+    return {
+        'runs': runs,
+        'fast_path_runs': fast['runs'] if fast else 0,
+        'fast_path_rate': (fast['runs'] / runs) if fast and runs else 0.0,
+        'paths': paths,
+        'fallback_reasons': fallback_reasons,
+    }
+
+
 # Initialize database when module is imported
 init_database()
@@ -0,0 +1,228 @@
+"""
+Fast path for simple flight searches.
+
+Most briefs are a plain one-way or round-trip search. When the brief's
+structured search is complete, the search service is called directly,
+offers are ranked by a fixed weighted score, and a single cheap model call
+phrases the answer. Anything else goes to the flight agent. Every search
+is recorded in the search_runs table; get_fast_path_report() in db.py
+summarizes how often the fast path is taken and how each path performs.
+"""
+
+import re
+import json
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from agents import Agent, ModelSettings, Runner
+
+from db import record_search_run, get_fast_path_report
+from prompts import present_flight_results_prompt
+from scoping_agents import FlightSearchBrief, StructuredFlightSearch
+from single_agent_mcp import AgentEvent, get_runtime, stream_flights, use_flights_package
+
+# Fast path constants
+FAST_PATH_TOP_K = 3  # Offers handed to the answer writer, best first
+# Deterministic ranking: mostly price, with some weight on duration and stops
+FAST_PATH_SCORE_WEIGHTS = {'price': 1.0, 'duration': 0.3, 'stops': 0.3}
+
+IATA_CODE = re.compile(r'[A-Z]{3}')
+
+
+def _today_str() -> str:
+    return datetime.now().strftime("%a %b %-d, %Y")
+
+
+answer_writer_agent = Agent(
+    name="Flight Results Writer",
+    model='gpt-5-mini',
+    model_settings=ModelSettings(reasoning_effort='low'),
+    instructions=present_flight_results_prompt.format(date=_today_str()),
+)
+
+
+@dataclass
+class FastPathOutcome:
+    """Result of trying the fast path: an answer, or the reason to fall back to the agent."""
+    answer: Optional[str] = None
+    total_tokens: int = 0
+    fallback_reason: Optional[str] = None
+
+
+def _valid_date(value: Optional[str], earliest: date) -> bool:
+    try:
+        return date.fromisoformat(value) >= earliest
+    except (TypeError, ValueError):
+        return False
+
+
+def search_params(search: Optional[StructuredFlightSearch]) -> Tuple[Optional[object], Optional[str]]:
+    """
+    Turn a brief's structured search into flights search parameters.
+
+    Args:
+        search: The brief's structured search, if it has one
+
+    Returns:
+        Tuple of (FlightSearch or MultiCityRequest, None), or (None, reason)
+        when the brief has to go to the flight agent
+    """
+    if search is None:
+        return None, "no structured search"
+    if not search.complete:
+        return None, "brief needs the agent"
+
+    legs = search.legs
+    expected_legs = len(legs) >= 2 if search.type == "multi_city" else len(legs) == 1
+    if not expected_legs:
+        return None, "unexpected number of legs"
+    if any(not IATA_CODE.fullmatch(code.upper()) for leg in legs for code in (leg.origin, leg.destination)):
+        return None, "not an IATA code"
+
+    earliest = date.today()
+    for leg in legs:
+        if not _valid_date(leg.departure_date, earliest):
+            return None, "invalid or past date"
+        earliest = date.fromisoformat(leg.departure_date)
+    if search.type == "round_trip" and not _valid_date(search.return_date, earliest):
+        return None, "invalid or past date"
+
+    use_flights_package()
+    from flights.models.flight_search import FlightSearch, MultiCityRequest, ScoreWeights
+
+    common = dict(
+        cabin_class=search.cabin_class,
+        adults=search.adults,
+        score_weights=ScoreWeights(**FAST_PATH_SCORE_WEIGHTS),
+        top_k=FAST_PATH_TOP_K,
+    )
+    # Unset limits are left out rather than passed as None
+    if search.max_connections is not None:
+        common['max_connections'] = search.max_connections
+    if search.max_price is not None:
+        common['max_price'] = search.max_price
+    try:
+        if search.type == "multi_city":
+            return MultiCityRequest(
+                type="multi_city",
+                segments=[
+                    {'origin': leg.origin.upper(), 'destination': leg.destination.upper(), 'departure_date': leg.departure_date}
+                    for leg in legs
+                ],
+                **common
+            ), None
+        return FlightSearch(
+            type=search.type,
+            origin=legs[0].origin.upper(),
+            destination=legs[0].destination.upper(),
+            departure_date=legs[0].departure_date,
+            return_date=search.return_date if search.type == "round_trip" else None,
+            **common
+        ), None
+    except ValueError:  # pydantic's ValidationError, e.g. a non-positive max_price
+        return None, "invalid search parameters"
+
+
+def _format_offers(offers: list) -> str:
+    """Plain listing of offers, used when the answer writer is unavailable."""
+    lines = ["Here are the best flights I found:"]
+    for rank, offer in enumerate(offers, 1):
+        price = offer['price']
+        lines.append(f"\n{rank}. {price['amount']} {price['currency']} (offer ID: {offer['offer_id']})")
+        for slice_ in offer['slices']:
+            lines.append(f"   {slice_['origin']} → {slice_['destination']}: {slice_['carrier']}, "
+                         f"departs {slice_['departure']}, arrives {slice_['arrival']}, "
+                         f"{slice_['duration']}, {slice_['stops_description']}")
+    return "\n".join(lines)
+
+
+async def _fast_search(params, brief: str) -> FastPathOutcome:
+    """Search, then phrase the top offers with one model call (runs on the agent runtime's loop)."""
+    from flights.services import search_flights, search_multi_city
+
+    search_tool = search_multi_city if params.type == "multi_city" else search_flights
+    try:
+        response = json.loads(await search_tool(params))
+    except Exception as e:
+        print(f"⚠️ Fast path search failed: {str(e)}")
+        return FastPathOutcome(fallback_reason="search failed")
+    if response.get('error'):
+        print(f"⚠️ Fast path search failed: {response.get('message')}")
+        return FastPathOutcome(fallback_reason="search failed")
+    offers = response.get('offers') or []
+    if not offers:
+        return FastPathOutcome(fallback_reason="no offers")
+
+    writer_input = (
+        f"Flight search brief:\n{brief}\n\n"
+        f"Best offers, ranked (result_id {response.get('result_id')}):\n{json.dumps(offers, indent=1)}"
+    )
+    try:
+        result = await Runner.run(answer_writer_agent, writer_input, max_turns=1)
+        return FastPathOutcome(answer=result.final_output, total_tokens=result.context_wrapper.usage.total_tokens)
+    except Exception as e:
+        # The offers are still worth showing without the model's phrasing
+        print(f"⚠️ Answer writer failed, listing offers instead: {str(e)}")
+        return FastPathOutcome(answer=_format_offers(offers))
+
+
+async def stream_flights_from_brief(brief: FlightSearchBrief, session=None,
+                                    session_id: Optional[str] = None) -> AsyncIterator[AgentEvent]:
+    """
+    Search for a brief's flights, through the fast path when possible.
+
+    Args:
+        brief: Flight search brief from write_flight_search_brief
+        session: SQLiteSession for persistent conversation memory
+        session_id: Session to record the run under
+
+    Returns:
+        Async iterator of AgentEvents like stream_flights, ending with a
+        'final' event holding the results (or an 'error' event)
+    """
+    started = time.perf_counter()
+    params, fallback_reason = search_params(brief.search)
+
+    if params is not None:
+        tool_name = "search_multi_city" if params.type == "multi_city" else "search_flights"
+        yield AgentEvent('tool_started', tool_name)
+        outcome = await get_runtime().call(_fast_search, params, brief.flight_search_brief)
+        yield AgentEvent('tool_finished', tool_name)
+
+        if outcome.answer is not None:
+            latency_ms = (time.perf_counter() - started) * 1000
+            print(f"⚡ Fast path answered in {latency_ms / 1000:.1f} s using {outcome.total_tokens} tokens")
+            record_search_run(session_id, 'fast', latency_ms, outcome.total_tokens)
+            if session:
+                # Keep the exchange in the session so follow-up chat sees it, as after an agent run
+                await session.add_items([
+                    {"role": "user", "content": brief.flight_search_brief},
+                    {"role": "assistant", "content": outcome.answer},
+                ])
+            yield AgentEvent('final', outcome.answer)
+            return
+        fallback_reason = outcome.fallback_reason
+
+    print(f"↪️ Fast path not taken ({fallback_reason}); running the flight agent")
+    async for event in stream_flights(brief.flight_search_brief, verbose=False, session=session):
+        if event.kind == 'final':
+            record_search_run(session_id, 'agent', (time.perf_counter() - started) * 1000,
+                              event.result.context_wrapper.usage.total_tokens, fallback_reason)
+        yield event
+
+
+def format_fast_path_report(report: Dict) -> str:
+    """Render get_fast_path_report() as text."""
+    lines = [f"Searches: {report['runs']}, fast path: {report['fast_path_runs']} ({report['fast_path_rate']:.0%})"]
+    for path, stats in sorted(report['paths'].items()):
+        lines.append(f"  {path:>5}: {stats['runs']} runs, avg {stats['avg_latency_ms'] / 1000:.1f} s, "
+                     f"avg {stats['avg_tokens']:.0f} tokens")
+    for reason, count in report['fallback_reasons'].items():
+        lines.append(f"  fallback '{reason}': {count}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_fast_path_report(get_fast_path_report()))
@@ -0,0 +1,152 @@
+"""Synthetic Duffel payloads shaped like real offer request responses."""
+
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+AIRPORTS = ["SFO", "JFK", "LAX", "ORD", "DEN", "SEA", "BOS", "ATL", "DFW", "LHR"]
+CARRIERS = [("United Airlines", "UA"), ("American Airlines", "AA"), ("Delta Air Lines", "DL"),
+            ("Alaska Airlines", "AS"), ("JetBlue Airways", "B6")]
+FARE_BRANDS = ["Basic Economy", "Main Cabin", "Main Cabin Flexible", "Comfort+"]
+
+
+def _place(code: str) -> Dict:
+    return {
+        "type": "airport",
+        "iata_code": code,
+        "iata_city_code": code,
+        "icao_code": f"K{code}",
+        "name": f"{code} International Airport",
+        "city_name": f"{code} City",
+        "iata_country_code": "US",
+        "latitude": 37.6,
+        "longitude": -122.4,
+        "time_zone": "America/Los_Angeles",
+        "id": f"arp_{code.lower()}_us",
+    }
+
+
+def _carrier(name: str, code: str) -> Dict:
+    return {
+        "name": name,
+        "iata_code": code,
+        "id": f"arl_{code.lower()}",
+        "logo_symbol_url": f"https://assets.duffel.com/img/airlines/for-light-background/full-color-logo/{code}.svg",
+        "logo_lockup_url": f"https://assets.duffel.com/img/airlines/for-light-background/full-color-lockup/{code}.svg",
+        "conditions_of_carriage_url": f"https://www.example.com/{code}/conditions",
+    }
+
+
+def make_offer(index: int, rng: random.Random, base: datetime) -> Dict:
+    """Build one offer with the nesting and verbosity of a real Duffel offer."""
+    carrier_name, carrier_code = rng.choice(CARRIERS)
+    stops = rng.choice([0, 0, 1, 1, 2])
+    route = ["SFO"] + rng.sample(AIRPORTS[2:], stops) + ["JFK"]
+    departing = base + timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+    segments = []
+    total = 0
+    for leg in range(len(route) - 1):
+        minutes = rng.randrange(60, 330, 5)
+        total += minutes
+        arriving = departing + timedelta(minutes=minutes)
+        segments.append({
+            "id": f"seg_{index}_{leg}",
+            "origin": _place(route[leg]),
+            "destination": _place(route[leg + 1]),
+            "origin_terminal": "2",
+            "destination_terminal": "4",
+            "departing_at": departing.strftime("%Y-%m-%dT%H:%M:%S"),
+            "arriving_at": arriving.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duration": f"PT{minutes // 60}H{minutes % 60}M",
+            "distance": "4152.2",
+            "aircraft": {"name": "Boeing 777-300", "iata_code": "773", "id": "arc_00009VMF8AhXSSRnQDI6Hi"},
+            "marketing_carrier": _carrier(carrier_name, carrier_code),
+            "operating_carrier": _carrier(carrier_name, carrier_code),
+            "marketing_carrier_flight_number": str(rng.randrange(100, 2999)),
+            "operating_carrier_flight_number": str(rng.randrange(100, 2999)),
+            "stops": [],
+            "passengers": [{
+                "passenger_id": "pas_0000AUde3KY1SptM6ABSfU",
+                "cabin_class": "economy",
+                "cabin_class_marketing_name": "Economy",
+                "fare_basis_code": "Y20AA",
+                "baggages": [{"type": "checked", "quantity": 1}, {"type": "carry_on", "quantity": 1}],
+                "cabin": {
+                    "name": "economy",
+                    "marketing_name": "Economy",
+                    "amenities": {
+                        "wifi": {"available": True, "cost": "paid"},
+                        "seat": {"pitch": "31", "legroom": "standard"},
+                        "power": {"available": True},
+                    },
+                },
+            }],
+        })
+        layover = rng.randrange(45, 240, 5)
+        total += layover
+        departing = arriving + timedelta(minutes=layover)
+    total -= layover
+    amount = f"{rng.uniform(120, 1400):.2f}"
+    return {
+        "id": f"off_{index:020d}",
+        "live_mode": True,
+        "created_at": base.isoformat() + "Z",
+        "updated_at": base.isoformat() + "Z",
+        "expires_at": (base + timedelta(minutes=30)).isoformat() + "Z",
+        "total_amount": amount,
+        "total_currency": "USD",
+        "base_amount": amount,
+        "base_currency": "USD",
+        "tax_amount": "40.80",
+        "tax_currency": "USD",
+        "total_emissions_kg": "460",
+        "owner": _carrier(carrier_name, carrier_code),
+        "partial": False,
+        "passenger_identity_documents_required": False,
+        "supported_passenger_identity_document_types": ["passport"],
+        "payment_requirements": {"requires_instant_payment": False, "price_guarantee_expires_at": None,
+                                 "payment_required_by": None},
+        "available_services": None,
+        "conditions": {
+            "refund_before_departure": {"allowed": True, "penalty_amount": "100.00", "penalty_currency": "USD"},
+            "change_before_departure": {"allowed": True, "penalty_amount": "75.00", "penalty_currency": "USD"},
+        },
+        "passengers": [{"id": "pas_0000AUde3KY1SptM6ABSfU", "type": "adult", "age": None,
+                        "given_name": None, "family_name": None, "loyalty_programme_accounts": []}],
+        "slices": [{
+            "id": f"sli_{index}",
+            "origin": _place("SFO"),
+            "destination": _place("JFK"),
+            "origin_type": "airport",
+            "destination_type": "airport",
+            "duration": f"PT{total // 60}H{total % 60}M",
+            "fare_brand_name": rng.choice(FARE_BRANDS),
+            "conditions": {"change_before_departure": {"allowed": True, "penalty_amount": "75.00",
+                                                       "penalty_currency": "USD"}},
+            "segments": segments,
+        }],
+    }
+
+
+def make_offers(count: int, seed: int = 7) -> List[Dict]:
+    """Build ``count`` offers deterministically."""
+    rng = random.Random(seed)
+    base = datetime(2030, 1, 10)
+    return [make_offer(i, rng, base) for i in range(count)]
+
+
+def offer_request_chunks(count: int, chunk_size: int = 16384, seed: int = 7) -> Iterator[bytes]:
+    """Stream an offer request body of ``count`` offers without holding it in memory."""
+    rng = random.Random(seed)
+    base = datetime(2030, 1, 10)
+    pending = b'{"data":{"slices":[],"passengers":[{"id":"pas_0000AUde3KY1SptM6ABSfU","type":"adult"}],"offers":['
+    for i in range(count):
+        pending += (b"," if i else b"") + json.dumps(make_offer(i, rng, base)).encode()
+        while len(pending) >= chunk_size:
+            yield pending[:chunk_size]
+            pending = pending[chunk_size:]
+    pending += b'],"id":"orq_0000AUde3KY1SptM6ABSfT","live_mode":true,"cabin_class":"economy"}}'
+    while pending:
+        yield pending[:chunk_size]
+        pending = pending[chunk_size:]
@@ -0,0 +1,189 @@
+"""Compare dict-based offer formatting with the compact offer model.
+
+"dicts" is the previous pipeline: offers stay as Duffel-shaped dicts and are
+re-read (ISO durations and timestamps parsed again) on every sort, filter and
+format. "compact" wraps each offer in a ``CompactOffer`` that reads the
+ranking numbers once and builds slice objects only for the offers shown. Both
+handle the same search: sort all offers and format the page the tool
+returns, then answer a few follow-up queries against the stored set. Memory is the deep size of
+the stored set, strings included.
+
+    python benchmarks/bench_offer_formatting.py --offers 1000
+"""
+
+import argparse
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?")
+
+# Follow-up queries: (max_stops, max_layover_minutes, evening departures only, sort key)
+# Offers formatted per answer, as search_flights returns one page (RESULT_PAGE_SIZE)
+PAGE_SIZE = 10
+QUERIES = [(0, None, False, "price"), (1, 120, False, "duration"), (None, None, True, "price"),
+           (1, None, True, "departure_time"), (None, 90, False, "stops")]
+
+
+def _dict_minutes(duration):
+    match = _ISO_DURATION.fullmatch(duration or "")
+    days, hours, minutes = (int(part or 0) for part in match.groups()) if match else (0, 0, 0)
+    return days * 1440 + hours * 60 + minutes
+
+
+def _dict_format(offer):
+    """The search tools' formatting before the compact model."""
+    offer_details = {'offer_id': offer.get('id'),
+                     'price': {'amount': offer.get('total_amount'), 'currency': offer.get('total_currency')},
+                     'slices': []}
+    for slice in offer.get('slices', []):
+        segments = slice.get('segments', [])
+        if segments:
+            slice_details = {
+                'origin': slice['origin']['iata_code'],
+                'destination': slice['destination']['iata_code'],
+                'departure': segments[0].get('departing_at'),
+                'arrival': segments[-1].get('arriving_at'),
+                'duration': slice.get('duration'),
+                'carrier': segments[0].get('marketing_carrier', {}).get('name'),
+                'stops': len(segments) - 1,
+                'stops_description': 'Non-stop' if len(segments) == 1 else f'{len(segments) - 1} stop{"s" if len(segments) - 1 > 1 else ""}',
+                'connections': []
+            }
+            for i in range(len(segments) - 1):
+                slice_details['connections'].append({
+                    'airport': segments[i].get('destination', {}).get('iata_code'),
+                    'arrival': segments[i].get('arriving_at'),
+                    'departure': segments[i + 1].get('departing_at'),
+                    'duration': segments[i + 1].get('duration')
+                })
+            offer_details['slices'].append(slice_details)
+    return offer_details
+
+
+def _dict_matches(offer, max_stops, max_layover, evening):
+    for slice_data in offer['slices']:
+        segments = slice_data['segments']
+        if max_stops is not None and len(segments) - 1 > max_stops:
+            return False
+        if max_layover is not None:
+            for arriving, departing in zip(segments, segments[1:]):
+                gap = (datetime.fromisoformat(departing['departing_at'])
+                       - datetime.fromisoformat(arriving['arriving_at']))
+                if gap.total_seconds() / 60 > max_layover:
+                    return False
+    return not evening or offer['slices'][0]['segments'][0]['departing_at'][11:16] >= "17:00"
+
+
+_DICT_SORT = {
+    "price": lambda offer: float(offer['total_amount']),
+    "duration": lambda offer: sum(_dict_minutes(s['duration']) for s in offer['slices']),
+    "departure_time": lambda offer: offer['slices'][0]['segments'][0]['departing_at'],
+    "stops": lambda offer: sum(len(s['segments']) - 1 for s in offer['slices']),
+}
+
+
+def search_dicts(raw):
+    stored = raw
+    page = [_dict_format(offer) for offer in sorted(stored, key=_DICT_SORT["duration"])[:PAGE_SIZE]]
+    return stored, page
+
+
+def follow_up_dicts(stored):
+    for max_stops, max_layover, evening, sort_by in QUERIES:
+        matching = [offer for offer in stored if _dict_matches(offer, max_stops, max_layover, evening)]
+        page = [_dict_format(offer) for offer in sorted(matching, key=_DICT_SORT[sort_by])[:PAGE_SIZE]]
+    return page
+
+
+def _params(**filters):
+    from flights.models.search import FlightSearch
+    return FlightSearch(type="one_way", origin="SFO", destination="JFK", departure_date="2030-01-10", **filters)
+
+
+def search_compact(raw):
+    from flights.services.compact import compact_offers
+    from flights.services.ranking import select_offers
+
+    stored = compact_offers(raw)
+    page = [offer.to_summary() for offer in select_offers(stored, _params(sort_by="duration"))[:PAGE_SIZE]]
+    return stored, page
+
+
+def follow_up_compact(stored, queries):
+    from flights.services.ranking import select_offers
+
+    for query in queries:
+        page = [offer.to_summary() for offer in select_offers(stored, query)[:PAGE_SIZE]]
+    return page
+
+
+def _measure(search, follow_up, raw, repeat):
+    """Best search time, best follow-up time and the stored set's size."""
+    search_timings, follow_up_timings = [], []
+    held = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stored, _ = search(raw)
+        searched = time.perf_counter()
+        follow_up(stored)
+        search_timings.append(searched - start)
+        follow_up_timings.append(time.perf_counter() - searched)
+        held = held or _deep_size(stored)
+        # Free the set before the next run starts its timer: the result-set
+        # cache evicts old sets outside of any one search
+        del stored
+    return min(search_timings), min(follow_up_timings), held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offers", type=int, default=1000, help="Offers in the response")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per pipeline (best is reported)")
+    args = parser.parse_args()
+
+    from flights.api.streaming import slim_offer
+    from _payloads import make_offers
+
+    # What streaming parsing keeps of each offer
+    raw = [slim_offer(offer) for offer in make_offers(args.offers)]
+    # Tool parameters arrive validated, so the models are built up front
+    queries = [
+        _params(max_stops=max_stops, max_layover_minutes=max_layover, sort_by=sort_by,
+                departure_window={"from_time": "17:00", "to_time": "23:59"} if evening else None)
+        for max_stops, max_layover, evening, sort_by in QUERIES
+    ]
+    pipelines = (
+        ("dicts", search_dicts, follow_up_dicts),
+        ("compact", search_compact, lambda stored: follow_up_compact(stored, queries)),
+    )
+    print(f"{args.offers} offers; a search sorts all and formats a page, "
+          f"then {len(QUERIES)} filtered follow-up queries run on the stored set")
+    for name, search, follow_up in pipelines:
+        searched, followed_up, held = _measure(search, follow_up, raw, args.repeat)
+        print(f"{name:>8}: search {searched * 1000:6.1f} ms, follow-ups {followed_up * 1000:6.1f} ms, "
+              f"stored result set ~{held / 1024:7.0f} KB")
+
+def _deep_size(value, seen=None):
+    """Approximate bytes held by nested containers, slotted objects and strings."""
+    seen = seen if seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in value)
+    elif hasattr(type(value), "__slots__"):
+        size += sum(_deep_size(getattr(value, name), seen) for name in type(value).__slots__)
+    return size
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare buffered vs streaming parsing of a large offer request response.
+
+Each mode runs in a fresh subprocess so peak RSS is measured in isolation. The
+body is generated before measuring, so RSS growth is what parsing adds on top
+of the raw bytes.
+
+    python benchmarks/bench_offer_parsing.py --offers 500 --limit 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def _run_mode(mode: str, offers: int, limit: int) -> dict:
+    import httpx
+    from flights.api import client as client_module
+    from flights.api import DuffelClient
+    from _payloads import offer_request_chunks
+
+    client_module.get_api_token = lambda: "duffel_test_benchmark"
+    # Build the body up front so only transfer and parsing are measured
+    chunks = list(offer_request_chunks(offers))
+
+    class ChunkStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for chunk in chunks:
+                yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(201, stream=ChunkStream())
+
+    async def main() -> dict:
+        client = DuffelClient(logging.getLogger("bench"), transport=httpx.MockTransport(handler))
+        async with client:
+            before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            start = time.perf_counter()
+            result = await client.create_offer_request(
+                slices=[], max_offers=limit, stream=(mode == "stream")
+            )
+            elapsed = time.perf_counter() - start
+            after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {
+            "mode": mode,
+            "offers_kept": len(result["offers"]),
+            "seconds": round(elapsed, 4),
+            "peak_rss_growth_mb": round((after - before) / 1024, 1),
+        }
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offers", type=int, default=500, help="Offers in the response")
+    parser.add_argument("--limit", type=int, default=50, help="Offers kept by the caller")
+    parser.add_argument("--mode", choices=["buffered", "stream"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.mode, args.offers, args.limit)))
+        return
+
+    from _payloads import offer_request_chunks
+    body_mb = sum(len(chunk) for chunk in offer_request_chunks(args.offers)) / 1024 / 1024
+    print(f"Response body: {args.offers} offers, {body_mb:.1f} MB; keeping {args.limit}")
+    for mode in ("buffered", "stream"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--offers", str(args.offers), "--limit", str(args.limit)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:>9}: {result['seconds']:.3f}s, peak RSS +{result['peak_rss_growth_mb']} MB, "
+              f"{result['offers_kept']} offers kept")
+
+
+if __name__ == "__main__":
+    main()
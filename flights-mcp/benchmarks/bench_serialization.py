@@ -0,0 +1,62 @@
+"""Compare JSON encode/decode time and output size for tool payloads.
+
+"before" is what the tools used to do: ``response.json()`` to decode and
+``json.dumps(indent=2)`` to encode. The other rows go through
+``flights.serialization`` with the stdlib and (if installed) orjson backends.
+
+    python benchmarks/bench_serialization.py --offers 50 --repeat 200
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def _measure(label: str, encode, decode, payloads: dict, repeat: int) -> None:
+    for name, payload in payloads.items():
+        body = json.dumps(payload).encode()  # What Duffel sends over the wire
+        decode_ms = timeit.timeit(lambda: decode(body), number=repeat) / repeat * 1000
+        encode_ms = timeit.timeit(lambda: encode(payload), number=repeat) / repeat * 1000
+        size_kb = len(encode(payload).encode()) / 1024
+        print(f"{label:>14} {name:>12}: decode {decode_ms:7.3f} ms, "
+              f"encode {encode_ms:7.3f} ms, output {size_kb:8.1f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offers", type=int, default=50, help="Offers in the list payload")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    from flights import serialization
+    from _payloads import make_offers
+
+    offers = make_offers(args.offers)
+    payloads = {
+        "offer": {"data": offers[0]},  # get_offer_details
+        f"{args.offers} offers": {"data": offers},  # list offers / search results
+    }
+
+    _measure("before", lambda value: json.dumps(value, indent=2),
+             lambda body: json.loads(body.decode("utf-8")), payloads, args.repeat)
+
+    orjson = serialization.orjson
+    serialization.orjson = None
+    try:
+        _measure("stdlib compact", serialization.dumps, serialization.loads, payloads, args.repeat)
+    finally:
+        serialization.orjson = orjson
+
+    if orjson is None:
+        print("orjson is not installed; skipping the orjson backend")
+    else:
+        _measure("orjson", serialization.dumps, serialization.loads, payloads, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Compare per-call overhead of the in-process, stdio and HTTP tool modes.
+
+Each mode connects once (for stdio that includes starting the server
+process, in-process it is importing the package) and then calls ``query_results`` for an unknown result set, which
+answers without touching Duffel, so the timings are transport and dispatch
+overhead only.
+
+    python benchmarks/bench_tool_transport.py --calls 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+ARGUMENTS = {"params": {"result_id": "rs_benchmark", "limit": 10}}
+SERVER = [sys.executable, "-c", "from flights import main; main()"]
+
+
+def _env():
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    env.setdefault("DUFFEL_API_KEY_LIVE", "benchmark")  # No Duffel call is made
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def in_process():
+    from flights.inprocess import LOCAL_TOOLS, client_pool
+
+    tool = next(tool for tool in LOCAL_TOOLS if tool.name == "query_results")
+    async with client_pool():
+        yield lambda: tool.call(ARGUMENTS)
+
+
+@asynccontextmanager
+async def _session(read, write):
+    from mcp import ClientSession
+
+    async with ClientSession(read, write) as session:
+        await session.initialize()
+        await session.list_tools()
+        yield lambda: session.call_tool("query_results", ARGUMENTS)
+
+
+@asynccontextmanager
+async def stdio():
+    from mcp import StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(command=SERVER[0], args=SERVER[1:], env=_env())
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write):
+            async with _session(read, write) as call:
+                yield call
+
+
+@asynccontextmanager
+async def streamable_http(port: int):
+    from mcp.client.streamable_http import streamablehttp_client
+
+    async with streamablehttp_client(f"http://127.0.0.1:{port}/mcp") as (read, write, _):
+        async with _session(read, write) as call:
+            yield call
+
+
+@contextmanager
+def http_server():
+    """Start the long-running HTTP server once, outside the timings."""
+    port = _free_port()
+    server = subprocess.Popen(SERVER + ["--transport", "streamable-http", "--port", str(port)],
+                              env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        yield port
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def measure(name, mode, calls):
+    started = time.perf_counter()
+    async with mode() as call:
+        connect = time.perf_counter() - started
+        result = await call()
+        if name != "in-process":
+            result = result.content[0].text
+        assert json.loads(result)["error"] == "Result set not found"
+        timings = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await call()
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{name:>16}: connect {connect * 1000:8.1f} ms, per call median {statistics.median(timings) * 1000:7.3f} ms,"
+          f" p95 {timings[int(len(timings) * 0.95) - 1] * 1000:7.3f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200, help="Tool calls per mode")
+    args = parser.parse_args()
+
+    print(f"{args.calls} query_results calls per mode (stdio connect includes starting the server)")
+    await measure("in-process", in_process, args.calls)
+    await measure("stdio", stdio, args.calls)
+    with http_server() as port:
+        await measure("streamable-http", partial(streamable_http, port), args.calls)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, force=True)
+    asyncio.run(main())
@@ -1,5 +1,7 @@
 """Duffel API client package."""
 
 from .client import DuffelClient
+from .ratelimit import Priority, RateLimitQueueFull
+from .resilience import CircuitOpenError
 
-__all__ = ['DuffelClient'] 
\ No newline at end of file
+__all__ = ['DuffelClient', 'CircuitOpenError', 'Priority', 'RateLimitQueueFull'] 
\ No newline at end of file
@@ -1,15 +1,85 @@
 """Duffel API client."""
 
+import importlib.util
+import json
 import logging
 import httpx
-from typing import Dict, Any, List
-from ..config import get_api_token
+from typing import Dict, Any, List, Awaitable, Callable, Optional
+from ..config import (
+    get_api_token,
+    DUFFEL_HTTP_TIMEOUT,
+    DUFFEL_HTTP_CONNECT_TIMEOUT,
+    DUFFEL_HTTP_MAX_CONNECTIONS,
+    DUFFEL_HTTP_MAX_KEEPALIVE,
+    DUFFEL_HTTP_KEEPALIVE_EXPIRY,
+    DUFFEL_HTTP2,
+    DUFFEL_RETRY_MAX_ATTEMPTS,
+    DUFFEL_RETRY_BASE_DELAY,
+    DUFFEL_RETRY_MAX_DELAY,
+    DUFFEL_RETRY_MAX_RETRY_AFTER,
+    DUFFEL_RETRY_BUDGET_RATIO,
+    DUFFEL_CIRCUIT_FAILURE_THRESHOLD,
+    DUFFEL_CIRCUIT_RESET_TIMEOUT,
+    DUFFEL_RATE_LIMIT_PER_SECOND,
+    DUFFEL_RATE_LIMIT_BURST,
+    DUFFEL_RATE_LIMIT_MAX_QUEUE,
+)
+from ..metrics import Metrics
 from .endpoints import OfferEndpoints
+from .ratelimit import Priority, TokenBucketLimiter
+from .resilience import CircuitBreaker, Resilience, RetryBudget, RetryPolicy
+from .singleflight import SingleFlight
+
+
+class _ConnectionTrace:
+    """httpcore trace hook that notices when a request opens a new connection."""
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self.opened = False
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.opened = True
+            self.metrics.incr("http.connections_opened")
+
+
+def _http2_enabled(setting: Optional[bool]) -> bool:
+    """Resolve the HTTP/2 setting, falling back to HTTP/1.1 without h2."""
+    if setting is None:
+        setting = DUFFEL_HTTP2 in ("auto", "1", "true", "yes")
+    return setting and importlib.util.find_spec("h2") is not None
+
 
 class DuffelClient:
-    """Client for interacting with the Duffel API."""
+    """Client for interacting with the Duffel API.
+
+    The client owns one pooled, keep-alive ``httpx.AsyncClient`` shared by every
+    endpoint call. Entering the client as an async context manager opens the
+    pool; it is closed when the outermost context exits (or on ``aclose``), so
+    a long-lived owner such as the MCP server keeps connections warm across
+    tool calls.
+
+    Identical concurrent requests are coalesced into one HTTP call whose
+    result is shared by every caller, so callers must not mutate it. Every
+    HTTP attempt takes a token from a process-wide rate limiter, where
+    ``Priority.INTERACTIVE`` calls are served ahead of background traffic.
+    """
 
-    def __init__(self, logger: logging.Logger, timeout: float = 30.0):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        timeout: float = DUFFEL_HTTP_TIMEOUT,
+        *,
+        connect_timeout: float = DUFFEL_HTTP_CONNECT_TIMEOUT,
+        max_connections: int = DUFFEL_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DUFFEL_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = DUFFEL_HTTP_KEEPALIVE_EXPIRY,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        resilience: Optional[Resilience] = None,
+        limiter: Optional[TokenBucketLimiter] = None,
+    ):
         """Initialize the Duffel API client."""
         self.logger = logger
         self.timeout = timeout
@@ -25,24 +95,132 @@ class DuffelClient:
             "Content-Type": "application/json"
         }
 
+        # Connection pool setup
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http_timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.http2 = _http2_enabled(http2)
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._users = 0
+        self.metrics = Metrics()
+        self._single_flight = SingleFlight(self.metrics)
+        self.resilience = resilience or self._default_resilience()
+        self.limiter = limiter or TokenBucketLimiter(
+            rate=DUFFEL_RATE_LIMIT_PER_SECOND,
+            burst=DUFFEL_RATE_LIMIT_BURST,
+            max_queue=DUFFEL_RATE_LIMIT_MAX_QUEUE,
+            metrics=self.metrics,
+        )
+
         self.logger.info(f"API key starts with: {self._token[:8] if self._token else None}")
         self.logger.info(f"Using base URL: {self.base_url}")
 
         # Initialize endpoints
-        self.offers = OfferEndpoints(self.base_url, self.headers, self.logger)
+        self.offers = OfferEndpoints(self.base_url, self._get_http, self.logger, self.resilience, self.limiter)
+
+    def _default_resilience(self) -> Resilience:
+        """Build retry and circuit breaker settings from configuration."""
+        def policy(**overrides) -> RetryPolicy:
+            return RetryPolicy(
+                max_attempts=DUFFEL_RETRY_MAX_ATTEMPTS,
+                base_delay=DUFFEL_RETRY_BASE_DELAY,
+                max_delay=DUFFEL_RETRY_MAX_DELAY,
+                max_retry_after=DUFFEL_RETRY_MAX_RETRY_AFTER,
+                **overrides,
+            )
+
+        return Resilience(
+            self.logger,
+            self.metrics,
+            # Offer requests already wait on suppliers for up to the supplier
+            # timeout; repeating a read timeout would only double the wait
+            policies={"offer_requests": policy(retry_read_timeouts=False)},
+            default_policy=policy(),
+            budget_factory=lambda: RetryBudget(ratio=DUFFEL_RETRY_BUDGET_RATIO),
+            breaker_factory=lambda: CircuitBreaker(
+                failure_threshold=DUFFEL_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=DUFFEL_CIRCUIT_RESET_TIMEOUT,
+            ),
+        )
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client, opening it on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.http_timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self._transport,
+                event_hooks={
+                    "request": [self._on_request],
+                    "response": [self._on_response],
+                },
+            )
+            self.metrics.incr("http.pools_opened")
+            self.logger.info(
+                f"Opened HTTP pool (http2={self.http2}, "
+                f"max_connections={self.limits.max_connections}, "
+                f"max_keepalive={self.limits.max_keepalive_connections})"
+            )
+        return self._http
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        """Attach a connection trace to every outgoing request."""
+        self.metrics.incr("http.requests")
+        request.extensions["trace"] = _ConnectionTrace(self.metrics)
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        """Count requests that were served over an existing connection."""
+        trace = response.request.extensions.get("trace")
+        if isinstance(trace, _ConnectionTrace) and not trace.opened:
+            self.metrics.incr("http.connections_reused")
 
     async def __aenter__(self):
-        """Async context manager entry."""
+        """Async context manager entry: open (or share) the connection pool."""
+        self._get_http()
+        self._users += 1
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        pass
+        """Async context manager exit: close the pool when the last user leaves."""
+        self._users = max(self._users - 1, 0)
+        if self._users == 0:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+            self.logger.info(f"Closed HTTP pool: {self.metrics.snapshot()['counters']}")
+        self._http = None
+
+    async def create_offer_request(self, priority: Priority = Priority.INTERACTIVE,
+                                   on_offers: Optional[Callable[[int], Awaitable[None]]] = None,
+                                   **kwargs) -> Dict[str, Any]:
+        """Create an offer request.
+
+        ``on_offers`` reports streaming progress; callers that join an
+        identical request already in flight are not called back.
+        """
+        key = ("offer_request", json.dumps(kwargs, sort_keys=True, default=str))
+        return await self._single_flight.do(
+            key, lambda: self.offers.create_offer_request(priority=priority, on_offers=on_offers, **kwargs)
+        )
 
-    async def create_offer_request(self, **kwargs) -> Dict[str, Any]:
-        """Create an offer request."""
-        return await self.offers.create_offer_request(**kwargs)
+    async def list_offers(self, priority: Priority = Priority.INTERACTIVE, **kwargs) -> Dict[str, Any]:
+        """List a page of offers for an offer request."""
+        key = ("offers", json.dumps(kwargs, sort_keys=True, default=str))
+        return await self._single_flight.do(
+            key, lambda: self.offers.list_offers(priority=priority, **kwargs)
+        )
 
-    async def get_offer(self, offer_id: str) -> Dict[str, Any]:
+    async def get_offer(self, offer_id: str, priority: Priority = Priority.INTERACTIVE) -> Dict[str, Any]:
         """Get offer details."""
-        return await self.offers.get_offer(offer_id)
+        return await self._single_flight.do(
+            ("offer", offer_id), lambda: self.offers.get_offer(offer_id, priority=priority)
+        )
@@ -1,16 +1,36 @@
 """Duffel API endpoint handlers."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Awaitable, Callable, Optional
 import logging
 import httpx
+from ..config import DUFFEL_OFFER_REQUEST_TIMEOUT
+from ..serialization import loads
+from .ratelimit import Priority, TokenBucketLimiter
+from .resilience import Resilience
+from .streaming import OfferStreamParser
+
+# Offers parsed between progress callbacks while streaming an offer request
+OFFER_PROGRESS_STEP = 25
 
 class OfferEndpoints:
     """Offer-related API endpoints."""
     
-    def __init__(self, base_url: str, headers: Dict, logger: logging.Logger):
+    def __init__(self, base_url: str, http: Callable[[], httpx.AsyncClient], logger: logging.Logger,
+                 resilience: Resilience, limiter: TokenBucketLimiter):
         self.base_url = base_url
-        self.headers = headers
+        self.http = http  # Returns the client's shared, pooled HTTP client
         self.logger = logger
+        self.resilience = resilience  # Retries, retry budgets and circuit breakers
+        self.limiter = limiter  # Process-wide rate limit shared by all tool calls
+
+    async def _send(self, endpoint: str, priority: Priority,
+                    send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a request through the rate limiter (per attempt) and retry layer."""
+        async def limited_send() -> httpx.Response:
+            await self.limiter.acquire(priority)
+            return await send()
+
+        return await self.resilience.call(endpoint, limited_send)
 
     async def create_offer_request(
         self,
@@ -19,9 +39,20 @@ class OfferEndpoints:
         adult_count: int = 1,
         max_connections: int = None,
         return_offers: bool = True,
-        supplier_timeout: int = 15000
+        supplier_timeout: int = 15000,
+        max_offers: Optional[int] = None,
+        stream: bool = False,
+        priority: Priority = Priority.INTERACTIVE,
+        on_offers: Optional[Callable[[int], Awaitable[None]]] = None
     ) -> Dict:
-        """Create a flight offer request."""
+        """Create a flight offer request.
+
+        With ``stream`` the response body is parsed incrementally: offers are
+        reduced to the fields the search tools use and nothing past
+        ``max_offers`` is decoded. ``on_offers`` is then awaited with the
+        number of offers parsed so far, once when Duffel starts responding and
+        again every ``OFFER_PROGRESS_STEP`` offers.
+        """
         try:
             # Format request data
             request_data = {
@@ -40,46 +71,135 @@ class OfferEndpoints:
                 "supplier_timeout": supplier_timeout
             }
 
-            async with httpx.AsyncClient(timeout=httpx.Timeout(90.0)) as client:
-                self.logger.info(f"Creating offer request with data: {request_data}")
-                response = await client.post(
-                    f"{self.base_url}/offer_requests",
-                    headers=self.headers,
-                    params=params,
-                    json=request_data
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                request_id = data["data"]["id"]
-                offers = data["data"].get("offers", [])
-                
-                self.logger.info(f"Created offer request with ID: {request_id}")
-                self.logger.info(f"Received {len(offers)} offers")
-                
-                return {
-                    "request_id": request_id,
-                    "offers": offers
-                }
+            self.logger.info(f"Creating offer request with data: {request_data}")
+            if stream:
+                return await self._stream_offer_request(params, request_data, max_offers, priority, on_offers)
+
+            response = await self._send("offer_requests", priority, lambda: self.http().post(
+                f"{self.base_url}/offer_requests",
+                params=params,
+                json=request_data,
+                timeout=httpx.Timeout(DUFFEL_OFFER_REQUEST_TIMEOUT)
+            ))
+            response.raise_for_status()
+            data = loads(response.content)
+            
+            request_id = data["data"]["id"]
+            offers = data["data"].get("offers", [])
+            
+            self.logger.info(f"Created offer request with ID: {request_id}")
+            self.logger.info(f"Received {len(offers)} offers")
+            
+            return {
+                "request_id": request_id,
+                "offers": offers[:max_offers] if max_offers is not None else offers
+            }
 
         except Exception as e:
             error_msg = f"Error creating offer request: {str(e)}"
             self.logger.error(error_msg)
             raise
 
-    async def get_offer(self, offer_id: str) -> Dict:
+    async def _stream_offer_request(self, params: Dict, request_data: Dict,
+                                    max_offers: Optional[int], priority: Priority,
+                                    on_offers: Optional[Callable[[int], Awaitable[None]]] = None) -> Dict:
+        """Create an offer request, parsing offers as the body arrives."""
+        parser = OfferStreamParser(limit=max_offers)
+
+        def send() -> Awaitable[httpx.Response]:
+            http = self.http()
+            request = http.build_request(
+                "POST",
+                f"{self.base_url}/offer_requests",
+                params=params,
+                json=request_data,
+                timeout=httpx.Timeout(DUFFEL_OFFER_REQUEST_TIMEOUT)
+            )
+            return http.send(request, stream=True)
+
+        response = await self._send("offer_requests", priority, send)
+        try:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            reported = 0
+            if on_offers is not None:
+                await on_offers(0)
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                if on_offers is not None and len(parser.offers) >= reported + OFFER_PROGRESS_STEP:
+                    reported = len(parser.offers)
+                    await on_offers(reported)
+                if parser.done:
+                    break  # Skip downloading offers past the limit
+            result = parser.close()
+        finally:
+            await response.aclose()
+
+        self.logger.info(f"Created offer request with ID: {result['request_id']}")
+        self.logger.info(
+            f"Received {len(result['offers'])} offers"
+            + (" (truncated)" if parser.truncated else "")
+        )
+        return result
+
+    async def list_offers(
+        self,
+        offer_request_id: str,
+        sort: Optional[str] = None,
+        limit: int = 50,
+        after: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Dict:
+        """List one page of offers for an offer request, sorted by Duffel."""
+        try:
+            params = {
+                "offer_request_id": offer_request_id,
+                "limit": limit
+            }
+            if sort is not None:
+                params["sort"] = sort
+            if after is not None:
+                params["after"] = after
+            if max_connections is not None:
+                params["max_connections"] = max_connections
+
+            response = await self._send(
+                "list_offers",
+                priority,
+                lambda: self.http().get(f"{self.base_url}/offers", params=params)
+            )
+            response.raise_for_status()
+            data = loads(response.content)
+
+            offers = data.get("data", [])
+            next_cursor = data.get("meta", {}).get("after")
+            self.logger.info(f"Listed {len(offers)} offers for {offer_request_id} (sort={sort})")
+
+            return {
+                "request_id": offer_request_id,
+                "offers": offers,
+                "next_cursor": next_cursor
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error listing offers for {offer_request_id}: {str(e)}")
+            raise
+
+    async def get_offer(self, offer_id: str, priority: Priority = Priority.INTERACTIVE) -> Dict:
         """Get details of a specific offer."""
         try:
             if not offer_id.startswith("off_"):
                 raise ValueError("Invalid offer ID format - must start with 'off_'")
             
-            async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-                response = await client.get(
-                    f"{self.base_url}/offers/{offer_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._send(
+                "get_offer",
+                priority,
+                lambda: self.http().get(f"{self.base_url}/offers/{offer_id}")
+            )
+            response.raise_for_status()
+            return loads(response.content)
         except Exception as e:
             self.logger.error(f"Error getting offer {offer_id}: {str(e)}")
             raise 
\ No newline at end of file
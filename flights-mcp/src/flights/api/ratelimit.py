@@ -0,0 +1,113 @@
+"""Client-side rate limiting of Duffel traffic."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Callable, List, Optional
+
+from ..metrics import Metrics
+
+
+class Priority(IntEnum):
+    """Request priority classes; lower values are served first."""
+    INTERACTIVE = 0  # A user is waiting on this call (e.g. search_flights)
+    BACKGROUND = 1   # Fan-out, prefetch and other bulk traffic
+
+
+class RateLimitQueueFull(Exception):
+    """Raised when too many calls are already waiting for the rate limiter."""
+
+    def __init__(self, max_queue: int):
+        super().__init__(f"Too many Duffel requests queued ({max_queue}); try again shortly")
+        self.max_queue = max_queue
+
+
+class TokenBucketLimiter:
+    """Token bucket shared by every caller in the process, with a priority wait queue.
+
+    Calls take a token immediately when one is free and nobody is queued;
+    otherwise they wait in a bounded queue ordered by priority, then arrival.
+    A ``rate`` of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int, max_queue: int, metrics: Metrics,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self.metrics = metrics
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._waiters: List[list] = []  # Heap of [priority, sequence, future]
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """Wait for a token."""
+        if self.rate <= 0:
+            return
+
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.metrics.observe("ratelimit.wait", 0.0)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.metrics.incr("ratelimit.rejected")
+            raise RateLimitQueueFull(self.max_queue)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [int(priority), next(self._sequence), future]
+        heapq.heappush(self._waiters, entry)
+        self.metrics.incr(f"ratelimit.queued.{priority.name.lower()}")
+        self._update_depth()
+        self._schedule()
+
+        started = self._clock()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._tokens += 1  # Granted just as we were cancelled; give it back
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._update_depth()
+            raise
+        finally:
+            self.metrics.observe("ratelimit.wait", self._clock() - started)
+            self.metrics.observe(f"ratelimit.wait.{priority.name.lower()}", self._clock() - started)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        self._update_depth()
+        self._schedule()
+
+    def _update_depth(self) -> None:
+        self.metrics.gauge("ratelimit.queue_depth", len(self._waiters))
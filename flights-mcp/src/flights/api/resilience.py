@@ -0,0 +1,272 @@
+"""Retries, retry budgets and circuit breaking for Duffel calls."""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from ..metrics import Metrics
+
+# Statuses worth retrying: rate limited or a transient server-side failure
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling Duffel while an endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"Duffel {endpoint} is temporarily unavailable after repeated failures; "
+            f"retry in {retry_in:.0f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """How often and how long to back off before retrying a call."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 max_retry_after: float = 20.0, retry_read_timeouts: bool = True):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after  # Longer server-requested waits fail fast
+        self.retry_read_timeouts = retry_read_timeouts
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given (1-based) attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class RetryBudget:
+    """Token bucket that caps retries to a fraction of an endpoint's traffic.
+
+    Every request deposits ``ratio`` tokens and every retry spends one, with
+    ``min_per_second`` tokens trickling in so low-traffic endpoints can still
+    retry. A sustained outage therefore cannot multiply load on Duffel.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 0.5, max_tokens: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._tokens = max_tokens
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self) -> None:
+        """Record a first attempt."""
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take a token for a retry, if one is available."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+
+class CircuitBreaker:
+    """Fail fast after consecutive failures, probing again after a cool-down."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """One of "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a probe through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (only one probe at a time while half open)."""
+        state = self.state
+        if state == "closed":
+            return True
+        now = self._clock()
+        # A probe that never reported back (e.g. cancelled) stops blocking after a cool-down
+        if state == "half_open" and (
+            self._probe_started is None or now - self._probe_started >= self.reset_timeout
+        ):
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if this call opened the circuit."""
+        self._failures += 1
+        was_probing = self._probe_started is not None
+        self._probe_started = None
+        if was_probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+            self._opened_at = self._clock()
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """End a half-open probe without a verdict, letting the next call probe again."""
+        self._probe_started = None
+
+
+def retry_after_seconds(response: httpx.Response, now: Optional[datetime] = None) -> Optional[float]:
+    """Read how long the server asked us to wait from Retry-After or ratelimit headers."""
+    now = now or datetime.now(timezone.utc)
+    for header in ("retry-after", "ratelimit-reset"):
+        value = response.headers.get(header)
+        if not value:
+            continue
+        if header == "ratelimit-reset" and response.headers.get("ratelimit-remaining") not in (None, "0"):
+            continue
+        try:
+            seconds = float(value)
+            # Large numbers are epoch timestamps rather than deltas
+            return max(0.0, seconds - now.timestamp()) if seconds > 1e9 else max(0.0, seconds)
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - now).total_seconds())
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class Resilience:
+    """Per-endpoint retries, retry budgets and circuit breakers."""
+
+    def __init__(self, logger: logging.Logger, metrics: Metrics,
+                 policies: Optional[Dict[str, RetryPolicy]] = None,
+                 default_policy: Optional[RetryPolicy] = None,
+                 budget_factory: Callable[[], RetryBudget] = RetryBudget,
+                 breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.logger = logger
+        self.metrics = metrics
+        self.policies = policies or {}
+        self.default_policy = default_policy or RetryPolicy()
+        self._budget_factory = budget_factory
+        self._breaker_factory = breaker_factory
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._sleep = sleep
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = self._breaker_factory()
+        return self._breakers[endpoint]
+
+    def budget(self, endpoint: str) -> RetryBudget:
+        if endpoint not in self._budgets:
+            self._budgets[endpoint] = self._budget_factory()
+        return self._budgets[endpoint]
+
+    def states(self) -> Dict[str, str]:
+        """Current circuit state per endpoint."""
+        return {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
+
+    async def call(self, endpoint: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a request, retrying transient failures within policy and budget.
+
+        Returns the last response (which may still be an error status for the
+        caller to raise), or raises the last transport error.
+        """
+        policy = self.policies.get(endpoint, self.default_policy)
+        breaker = self.breaker(endpoint)
+        budget = self.budget(endpoint)
+        budget.deposit()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                self.metrics.incr(f"circuit.rejected.{endpoint}")
+                raise CircuitOpenError(endpoint, breaker.retry_in())
+
+            error: Optional[Exception] = None
+            response: Optional[httpx.Response] = None
+            try:
+                response = await send()
+            except httpx.ReadTimeout as e:
+                if not policy.retry_read_timeouts:
+                    self._record_failure(endpoint, breaker)
+                    raise
+                error = e
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                error = e
+
+            if response is not None and response.status_code not in RETRYABLE_STATUSES:
+                breaker.record_success()
+                return response
+
+            # Rate limiting is not a sign of an unhealthy supplier
+            if response is None or response.status_code != 429:
+                self._record_failure(endpoint, breaker)
+            else:
+                breaker.release_probe()
+
+            delay = policy.backoff(attempt)
+            if response is not None:
+                requested = retry_after_seconds(response)
+                if requested is not None:
+                    if requested > policy.max_retry_after:
+                        self.metrics.incr(f"retry.gave_up.{endpoint}")
+                        return response
+                    delay = max(delay, requested)
+
+            if attempt >= policy.max_attempts:
+                self.metrics.incr(f"retry.exhausted.{endpoint}")
+                return self._give_up(response, error)
+            if not budget.try_spend():
+                self.metrics.incr(f"retry.budget_exhausted.{endpoint}")
+                return self._give_up(response, error)
+
+            reason = f"status {response.status_code}" if response is not None else type(error).__name__
+            self.logger.warning(f"Retrying Duffel {endpoint} in {delay:.2f}s after {reason} (attempt {attempt})")
+            self.metrics.incr(f"retry.attempts.{endpoint}")
+            self.metrics.observe("retry.delay", delay)
+            if response is not None:
+                await response.aclose()
+            await self._sleep(delay)
+
+    def _record_failure(self, endpoint: str, breaker: CircuitBreaker) -> None:
+        if breaker.record_failure():
+            self.metrics.incr(f"circuit.opened.{endpoint}")
+            self.logger.error(f"Circuit opened for Duffel {endpoint}")
+
+    @staticmethod
+    def _give_up(response: Optional[httpx.Response], error: Optional[Exception]) -> httpx.Response:
+        if response is not None:
+            return response
+        raise error
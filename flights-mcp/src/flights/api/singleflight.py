@@ -0,0 +1,65 @@
+"""In-flight deduplication of identical concurrent calls."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from ..metrics import Metrics
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One outstanding shared call and the number of callers awaiting it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it is in flight await the same task. Every waiter receives the
+    same result or exception. A waiter that is cancelled only stops waiting;
+    the shared call is cancelled once no waiters remain.
+    """
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self._calls: Dict[Hashable, _Call] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently outstanding."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key``, or join the identical call already in flight."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._forget(key, call))
+        else:
+            self.metrics.incr("singleflight.coalesced")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Forget the call now: its cleanup may take a few loop
+                # iterations, and a new caller must not join a cancelled call
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+                self.metrics.incr("singleflight.abandoned")
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        """Drop a finished call and retrieve its exception if nobody did."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            call.task.exception()
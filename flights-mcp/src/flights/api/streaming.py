@@ -0,0 +1,145 @@
+"""Incremental parsing of offer request responses."""
+
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+_OFFERS_START = re.compile(r'"offers"\s*:\s*\[')
+_REQUEST_ID = re.compile(r'"id"\s*:\s*"(orq_[^"]+)"')
+_SEPARATORS = re.compile(r'[\s,]*')
+
+# Enough trailing text to catch a request ID split across two chunks
+_ID_OVERLAP = 64
+
+
+def _pick(obj: Optional[Dict], *keys: str) -> Optional[Dict]:
+    """Copy a subset of keys from a nested object."""
+    if obj is None:
+        return None
+    return {key: obj.get(key) for key in keys}
+
+
+def slim_offer(offer: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the offer fields the search tools use, in Duffel's shape."""
+    return {
+        "id": offer.get("id"),
+        "total_amount": offer.get("total_amount"),
+        "total_currency": offer.get("total_currency"),
+        "expires_at": offer.get("expires_at"),
+        "owner": _pick(offer.get("owner"), "name", "iata_code"),
+        "slices": [
+            {
+                "origin": _pick(slice_data.get("origin"), "iata_code"),
+                "destination": _pick(slice_data.get("destination"), "iata_code"),
+                "duration": slice_data.get("duration"),
+                "fare_brand_name": slice_data.get("fare_brand_name"),
+                "segments": [
+                    {
+                        "origin": _pick(segment.get("origin"), "iata_code"),
+                        "destination": _pick(segment.get("destination"), "iata_code"),
+                        "departing_at": segment.get("departing_at"),
+                        "arriving_at": segment.get("arriving_at"),
+                        "duration": segment.get("duration"),
+                        "marketing_carrier": _pick(segment.get("marketing_carrier"), "name", "iata_code"),
+                        "marketing_carrier_flight_number": segment.get("marketing_carrier_flight_number"),
+                        "operating_carrier": _pick(segment.get("operating_carrier"), "name", "iata_code"),
+                    }
+                    for segment in slice_data.get("segments", [])
+                ],
+            }
+            for slice_data in offer.get("slices", [])
+        ],
+    }
+
+
+class OfferStreamParser:
+    """Extract offers from an offer request response body as it arrives.
+
+    Bytes are fed in chunks. Each element of ``data.offers`` is decoded on its
+    own as soon as it is complete and reduced with ``project``; once ``limit``
+    offers are kept, the rest of the body is only scanned for the offer
+    request ID and never decoded.
+    """
+
+    def __init__(self, limit: Optional[int] = None,
+                 project: Callable[[Dict[str, Any]], Dict[str, Any]] = slim_offer):
+        self.limit = limit
+        self.project = project
+        self.offers: List[Dict[str, Any]] = []
+        self.request_id: Optional[str] = None
+        self.truncated = False
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "seek_offers"
+
+    @property
+    def done(self) -> bool:
+        """Whether the rest of the body is not needed."""
+        return self._state == "skip_offers" and self.request_id is not None
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume the next chunk of the response body."""
+        self._buffer += self._text.decode(chunk)
+        if self._state == "seek_offers":
+            self._seek_offers()
+        if self._state == "in_offers":
+            self._read_offers()
+        if self._state in ("skip_offers", "after_offers"):
+            self._scan_for_request_id()
+
+    def close(self) -> Dict[str, Any]:
+        """Finish parsing and return the offer request result."""
+        self._buffer += self._text.decode(b"", final=True)
+        if self._state == "seek_offers":
+            self._seek_offers()
+        if self._state == "in_offers":
+            self._read_offers()
+            if self._state == "in_offers":
+                raise ValueError("Offer request response ended inside the offers list")
+        self._scan_for_request_id()
+        if self.request_id is None:
+            raise ValueError("Offer request response has no offer request ID")
+        return {"request_id": self.request_id, "offers": self.offers}
+
+    def _seek_offers(self) -> None:
+        match = _OFFERS_START.search(self._buffer)
+        if match is None:
+            return
+        self._find_request_id(self._buffer[:match.start()])
+        self._buffer = self._buffer[match.end():]
+        self._state = "in_offers"
+
+    def _read_offers(self) -> None:
+        pos = 0
+        while True:
+            pos = _SEPARATORS.match(self._buffer, pos).end()
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == "]":
+                pos += 1
+                self._state = "after_offers"
+                break
+            if self.limit is not None and len(self.offers) >= self.limit:
+                self.truncated = True
+                self._state = "skip_offers"
+                break
+            try:
+                offer, pos = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                break  # Offer is incomplete; wait for more data
+            self.offers.append(self.project(offer))
+        self._buffer = self._buffer[pos:]
+
+    def _scan_for_request_id(self) -> None:
+        if self.request_id is None:
+            self._find_request_id(self._buffer)
+        # Only the tail can still contain the start of a split ID
+        self._buffer = self._buffer[-_ID_OVERLAP:]
+
+    def _find_request_id(self, text: str) -> None:
+        if self.request_id is None:
+            match = _REQUEST_ID.search(text)
+            if match:
+                self.request_id = match.group(1)
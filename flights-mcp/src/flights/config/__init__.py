@@ -1,5 +1,80 @@
 """Configuration package."""
 
-from .api import DUFFEL_API_URL, DUFFEL_API_VERSION, get_api_token
+from .api import DUFFEL_API_URL, DUFFEL_API_VERSION, DUFFEL_OFFER_RETRIEVAL, FLIGHTS_JSON_PRETTY, get_api_token
+from .http import (
+    DUFFEL_HTTP_TIMEOUT,
+    DUFFEL_HTTP_CONNECT_TIMEOUT,
+    DUFFEL_OFFER_REQUEST_TIMEOUT,
+    DUFFEL_HTTP_MAX_CONNECTIONS,
+    DUFFEL_HTTP_MAX_KEEPALIVE,
+    DUFFEL_HTTP_KEEPALIVE_EXPIRY,
+    DUFFEL_HTTP2,
+    DUFFEL_STREAM_OFFERS,
+    DUFFEL_RATE_LIMIT_PER_SECOND,
+    DUFFEL_RATE_LIMIT_BURST,
+    DUFFEL_RATE_LIMIT_MAX_QUEUE,
+    DUFFEL_FAN_OUT_CONCURRENCY,
+)
+from .resilience import (
+    DUFFEL_RETRY_MAX_ATTEMPTS,
+    DUFFEL_RETRY_BASE_DELAY,
+    DUFFEL_RETRY_MAX_DELAY,
+    DUFFEL_RETRY_MAX_RETRY_AFTER,
+    DUFFEL_RETRY_BUDGET_RATIO,
+    DUFFEL_CIRCUIT_FAILURE_THRESHOLD,
+    DUFFEL_CIRCUIT_RESET_TIMEOUT,
+)
+from .cache import (
+    OFFER_REQUEST_CACHE_TTL,
+    OFFER_REQUEST_CACHE_MAX_ENTRIES,
+    OFFER_REQUEST_CACHE_MAX_BYTES,
+    OFFER_DETAILS_CACHE_TTL,
+    OFFER_DETAILS_CACHE_MAX_ENTRIES,
+    OFFER_DETAILS_CACHE_MAX_BYTES,
+    RESULT_SET_TTL,
+    RESULT_SET_MAX_ENTRIES,
+    RESULT_SET_MAX_BYTES,
+)
+from .airports import METRO_AIRPORTS, FLIGHTS_METRO_MAX_PAIRS
+from .server import FLIGHTS_MCP_TRANSPORT, FLIGHTS_MCP_HOST, FLIGHTS_MCP_PORT
 
-__all__ = ['DUFFEL_API_URL', 'DUFFEL_API_VERSION', 'get_api_token'] 
\ No newline at end of file
+__all__ = [
+    'DUFFEL_API_URL',
+    'DUFFEL_API_VERSION',
+    'DUFFEL_OFFER_RETRIEVAL',
+    'FLIGHTS_JSON_PRETTY',
+    'get_api_token',
+    'DUFFEL_HTTP_TIMEOUT',
+    'DUFFEL_HTTP_CONNECT_TIMEOUT',
+    'DUFFEL_OFFER_REQUEST_TIMEOUT',
+    'DUFFEL_HTTP_MAX_CONNECTIONS',
+    'DUFFEL_HTTP_MAX_KEEPALIVE',
+    'DUFFEL_HTTP_KEEPALIVE_EXPIRY',
+    'DUFFEL_HTTP2',
+    'DUFFEL_STREAM_OFFERS',
+    'DUFFEL_RATE_LIMIT_PER_SECOND',
+    'DUFFEL_RATE_LIMIT_BURST',
+    'DUFFEL_RATE_LIMIT_MAX_QUEUE',
+    'DUFFEL_FAN_OUT_CONCURRENCY',
+    'DUFFEL_RETRY_MAX_ATTEMPTS',
+    'DUFFEL_RETRY_BASE_DELAY',
+    'DUFFEL_RETRY_MAX_DELAY',
+    'DUFFEL_RETRY_MAX_RETRY_AFTER',
+    'DUFFEL_RETRY_BUDGET_RATIO',
+    'DUFFEL_CIRCUIT_FAILURE_THRESHOLD',
+    'DUFFEL_CIRCUIT_RESET_TIMEOUT',
+    'OFFER_REQUEST_CACHE_TTL',
+    'OFFER_REQUEST_CACHE_MAX_ENTRIES',
+    'OFFER_REQUEST_CACHE_MAX_BYTES',
+    'OFFER_DETAILS_CACHE_TTL',
+    'OFFER_DETAILS_CACHE_MAX_ENTRIES',
+    'OFFER_DETAILS_CACHE_MAX_BYTES',
+    'RESULT_SET_TTL',
+    'RESULT_SET_MAX_ENTRIES',
+    'RESULT_SET_MAX_BYTES',
+    'METRO_AIRPORTS',
+    'FLIGHTS_METRO_MAX_PAIRS',
+    'FLIGHTS_MCP_TRANSPORT',
+    'FLIGHTS_MCP_HOST',
+    'FLIGHTS_MCP_PORT',
+]
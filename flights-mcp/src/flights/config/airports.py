@@ -0,0 +1,29 @@
+"""Metropolitan area (city) codes and the airports they cover."""
+
+import os
+from typing import Dict, Final, List
+
+# IATA city codes, with airports in rough order of traffic so the busiest
+# are kept when a search has to be trimmed to FLIGHTS_METRO_MAX_PAIRS
+METRO_AIRPORTS: Final[Dict[str, List[str]]] = {
+    "BJS": ["PEK", "PKX"],
+    "BUE": ["EZE", "AEP"],
+    "CHI": ["ORD", "MDW"],
+    "LON": ["LHR", "LGW", "STN", "LTN", "LCY"],
+    "MIL": ["MXP", "LIN", "BGY"],
+    "MOW": ["SVO", "DME", "VKO"],
+    "NYC": ["JFK", "EWR", "LGA"],
+    "OSA": ["KIX", "ITM"],
+    "PAR": ["CDG", "ORY"],
+    "RIO": ["GIG", "SDU"],
+    "ROM": ["FCO", "CIA"],
+    "SAO": ["GRU", "CGH", "VCP"],
+    "SEL": ["ICN", "GMP"],
+    "STO": ["ARN", "BMA"],
+    "TYO": ["HND", "NRT"],
+    "WAS": ["IAD", "DCA", "BWI"],
+    "YTO": ["YYZ", "YTZ"],
+}
+
+# Most origin x destination airport pairs searched for one request
+FLIGHTS_METRO_MAX_PAIRS: Final = int(os.getenv("FLIGHTS_METRO_MAX_PAIRS", "9"))
@@ -11,6 +11,13 @@ DUFFEL_API_URL: Final = "https://api.duffel.com"
 DUFFEL_API_VERSION: Final = "v2"
 DUFFEL_API_KEY: Final = os.getenv("DUFFEL_API_KEY_LIVE")
 
+# How searches retrieve offers: "inline" (return_offers=true) or "paginated"
+# (return_offers=false, then server-sorted pages from the list offers endpoint)
+DUFFEL_OFFER_RETRIEVAL: Final = os.getenv("DUFFEL_OFFER_RETRIEVAL", "inline").lower()
+
+# Indent tool output JSON (useful when debugging; compact output costs fewer tokens)
+FLIGHTS_JSON_PRETTY: Final = os.getenv("FLIGHTS_JSON_PRETTY", "false").lower() in ("1", "true", "yes")
+
 def get_api_token() -> str:
     """Get Duffel API token from environment."""
     # Try both possible environment variable names
@@ -0,0 +1,19 @@
+"""In-process cache configuration."""
+
+import os
+from typing import Final
+
+# Offer request (search results) cache
+OFFER_REQUEST_CACHE_TTL: Final = float(os.getenv("FLIGHTS_OFFER_REQUEST_CACHE_TTL", "600"))
+OFFER_REQUEST_CACHE_MAX_ENTRIES: Final = int(os.getenv("FLIGHTS_OFFER_REQUEST_CACHE_MAX_ENTRIES", "256"))
+OFFER_REQUEST_CACHE_MAX_BYTES: Final = int(os.getenv("FLIGHTS_OFFER_REQUEST_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Offer details cache (entries also expire at the offer's expires_at)
+OFFER_DETAILS_CACHE_TTL: Final = float(os.getenv("FLIGHTS_OFFER_DETAILS_CACHE_TTL", "1800"))
+OFFER_DETAILS_CACHE_MAX_ENTRIES: Final = int(os.getenv("FLIGHTS_OFFER_DETAILS_CACHE_MAX_ENTRIES", "512"))
+OFFER_DETAILS_CACHE_MAX_BYTES: Final = int(os.getenv("FLIGHTS_OFFER_DETAILS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Stored search result sets, queried by result_id without calling Duffel again
+RESULT_SET_TTL: Final = float(os.getenv("FLIGHTS_RESULT_SET_TTL", "1800"))
+RESULT_SET_MAX_ENTRIES: Final = int(os.getenv("FLIGHTS_RESULT_SET_MAX_ENTRIES", "128"))
+RESULT_SET_MAX_BYTES: Final = int(os.getenv("FLIGHTS_RESULT_SET_MAX_BYTES", str(64 * 1024 * 1024)))
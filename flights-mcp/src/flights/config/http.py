@@ -0,0 +1,28 @@
+"""HTTP connection pool configuration."""
+
+import os
+from typing import Final
+
+# Timeouts (seconds)
+DUFFEL_HTTP_TIMEOUT: Final = float(os.getenv("DUFFEL_HTTP_TIMEOUT", "30"))
+DUFFEL_HTTP_CONNECT_TIMEOUT: Final = float(os.getenv("DUFFEL_HTTP_CONNECT_TIMEOUT", "10"))
+DUFFEL_OFFER_REQUEST_TIMEOUT: Final = float(os.getenv("DUFFEL_OFFER_REQUEST_TIMEOUT", "90"))
+
+# Connection pool limits
+DUFFEL_HTTP_MAX_CONNECTIONS: Final = int(os.getenv("DUFFEL_HTTP_MAX_CONNECTIONS", "20"))
+DUFFEL_HTTP_MAX_KEEPALIVE: Final = int(os.getenv("DUFFEL_HTTP_MAX_KEEPALIVE", "10"))
+DUFFEL_HTTP_KEEPALIVE_EXPIRY: Final = float(os.getenv("DUFFEL_HTTP_KEEPALIVE_EXPIRY", "120"))
+
+# HTTP/2: "auto" enables it when the optional h2 package is installed
+DUFFEL_HTTP2: Final = os.getenv("DUFFEL_HTTP2", "auto").lower()
+
+# Parse offer request responses incrementally, keeping only the fields the tools use
+DUFFEL_STREAM_OFFERS: Final = os.getenv("DUFFEL_STREAM_OFFERS", "true").lower() in ("1", "true", "yes")
+
+# Client-side rate limit shared by all tool calls (0 disables it)
+DUFFEL_RATE_LIMIT_PER_SECOND: Final = float(os.getenv("DUFFEL_RATE_LIMIT_PER_SECOND", "2"))
+DUFFEL_RATE_LIMIT_BURST: Final = int(os.getenv("DUFFEL_RATE_LIMIT_BURST", "5"))
+DUFFEL_RATE_LIMIT_MAX_QUEUE: Final = int(os.getenv("DUFFEL_RATE_LIMIT_MAX_QUEUE", "100"))
+
+# Offer requests in flight at once across fan-out tools (price calendar, date grid)
+DUFFEL_FAN_OUT_CONCURRENCY: Final = int(os.getenv("DUFFEL_FAN_OUT_CONCURRENCY", "4"))
@@ -0,0 +1,17 @@
+"""Retry and circuit breaker configuration for Duffel calls."""
+
+import os
+from typing import Final
+
+# Retries with exponential backoff and jitter (seconds)
+DUFFEL_RETRY_MAX_ATTEMPTS: Final = int(os.getenv("DUFFEL_RETRY_MAX_ATTEMPTS", "3"))
+DUFFEL_RETRY_BASE_DELAY: Final = float(os.getenv("DUFFEL_RETRY_BASE_DELAY", "0.5"))
+DUFFEL_RETRY_MAX_DELAY: Final = float(os.getenv("DUFFEL_RETRY_MAX_DELAY", "8"))
+# Fail fast instead of honouring a Retry-After longer than this
+DUFFEL_RETRY_MAX_RETRY_AFTER: Final = float(os.getenv("DUFFEL_RETRY_MAX_RETRY_AFTER", "20"))
+# Share of each endpoint's traffic that may be retries
+DUFFEL_RETRY_BUDGET_RATIO: Final = float(os.getenv("DUFFEL_RETRY_BUDGET_RATIO", "0.2"))
+
+# Circuit breaker
+DUFFEL_CIRCUIT_FAILURE_THRESHOLD: Final = int(os.getenv("DUFFEL_CIRCUIT_FAILURE_THRESHOLD", "5"))
+DUFFEL_CIRCUIT_RESET_TIMEOUT: Final = float(os.getenv("DUFFEL_CIRCUIT_RESET_TIMEOUT", "30"))
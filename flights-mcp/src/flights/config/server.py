@@ -0,0 +1,10 @@
+"""MCP transport configuration (overridable with command-line flags)."""
+
+import os
+from typing import Final
+
+# "stdio" for one server per client process; "streamable-http" or "sse" for a
+# long-running server that several clients share over the network
+FLIGHTS_MCP_TRANSPORT: Final = os.getenv("FLIGHTS_MCP_TRANSPORT", "stdio").lower()
+FLIGHTS_MCP_HOST: Final = os.getenv("FLIGHTS_MCP_HOST", "127.0.0.1")
+FLIGHTS_MCP_PORT: Final = int(os.getenv("FLIGHTS_MCP_PORT", "8000"))
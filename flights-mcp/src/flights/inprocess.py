@@ -0,0 +1,74 @@
+"""Calling the flight tools in-process, without an MCP transport.
+
+An agent running in the same Python process can register ``LOCAL_TOOLS`` as
+native function tools instead of talking to an MCP server: arguments are
+validated against the same schemas the MCP server publishes and the tools
+share this process's Duffel client and caches. Hold ``client_pool()`` open
+around a run so all of its tool calls reuse one connection pool.
+"""
+
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Type, Union
+
+from pydantic import BaseModel, ValidationError, create_model
+
+from .serialization import dumps
+from .services import (
+    search_flights,
+    get_offer_details,
+    search_multi_city,
+    get_more_offers,
+    get_offers_details_batch,
+    get_price_calendar,
+    get_date_grid,
+    query_results,
+    aggregate_results,
+    score_results,
+)
+from .services.search import client_pool
+
+
+class LocalTool:
+    """One flight tool, callable with the JSON arguments an MCP client would send."""
+
+    def __init__(self, fn: Callable[..., Awaitable[str]]):
+        self.fn = fn
+        self.name = fn.__name__
+        self.description = inspect.getdoc(fn) or ""
+        params = inspect.signature(fn).parameters["params"].annotation
+        # Same shape as the MCP tool's input: {"params": {...}}
+        self.arguments: Type[BaseModel] = create_model(f"{self.name}Arguments", params=(params, ...))
+
+    @property
+    def parameters_schema(self) -> Dict[str, Any]:
+        """JSON schema of the tool's arguments."""
+        return self.arguments.model_json_schema()
+
+    async def call(self, arguments: Union[str, Dict[str, Any]]) -> str:
+        """Validate the arguments and run the tool; invalid arguments return an error payload."""
+        try:
+            if isinstance(arguments, str):
+                parsed = self.arguments.model_validate_json(arguments or "{}")
+            else:
+                parsed = self.arguments.model_validate(arguments)
+        except ValidationError as e:
+            return dumps({"error": "Invalid arguments", "message": str(e)})
+        return await self.fn(parsed.params)
+
+
+LOCAL_TOOLS = [
+    LocalTool(fn) for fn in (
+        search_flights,
+        get_offer_details,
+        get_offers_details_batch,
+        search_multi_city,
+        get_more_offers,
+        get_price_calendar,
+        get_date_grid,
+        query_results,
+        aggregate_results,
+        score_results,
+    )
+]
+
+__all__ = ['LocalTool', 'LOCAL_TOOLS', 'client_pool']
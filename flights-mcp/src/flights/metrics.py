@@ -0,0 +1,43 @@
+"""Lightweight in-process metrics."""
+
+from typing import Any, Dict
+
+
+class Metrics:
+    """Named counters, gauges and timing summaries for one component."""
+
+    def __init__(self):
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its current value."""
+        self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one observation (e.g. a duration in seconds)."""
+        summary = self._timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        summary["count"] += 1
+        summary["total"] += value
+        summary["max"] = max(summary["max"], value)
+
+    def counter(self, name: str) -> int:
+        """Get the current value of a counter."""
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a JSON-serializable copy of all metrics."""
+        timings = {
+            name: {**summary, "avg": summary["total"] / summary["count"] if summary["count"] else 0.0}
+            for name, summary in self._timings.items()
+        }
+        return {
+            "counters": dict(self._counters),
+            "gauges": dict(self._gauges),
+            "timings": timings,
+        }
@@ -0,0 +1,29 @@
+"""Flexible-date search models."""
+
+from typing import List, Literal
+from pydantic import BaseModel, Field
+
+class PriceCalendar(BaseModel):
+    """Model for finding the cheapest day to fly around a date."""
+    origin: str = Field(..., description="Origin airport code")
+    destination: str = Field(..., description="Destination airport code")
+    departure_date: str = Field(..., description="Center of the date window (YYYY-MM-DD)")
+    flex_days: int = Field(3, ge=0, le=7, description="Days before and after departure_date to search")
+    cabin_class: str = Field("economy", description="Cabin class (economy, business, first)")
+    adults: int = Field(1, description="Number of adult passengers")
+    max_connections: int = Field(None, description="Maximum number of connections (0 for non-stop)")
+
+class DateGrid(BaseModel):
+    """Model for comparing round-trip prices across departure and return dates."""
+    origin: str = Field(..., description="Origin airport code")
+    destination: str = Field(..., description="Destination airport code")
+    departure_dates: List[str] = Field(..., min_length=1, max_length=7, description="Candidate departure dates (YYYY-MM-DD)")
+    return_dates: List[str] = Field(..., min_length=1, max_length=7, description="Candidate return dates (YYYY-MM-DD)")
+    cabin_class: str = Field("economy", description="Cabin class (economy, business, first)")
+    adults: int = Field(1, description="Number of adult passengers")
+    max_connections: int = Field(None, description="Maximum number of connections (0 for non-stop)")
+    mode: Literal["round_trip", "one_way_legs"] = Field(
+        "round_trip",
+        description="'round_trip' prices each date pair as one round-trip search; 'one_way_legs' combines the "
+                    "cheapest one-way outbound and return legs (fewer searches, shared with get_price_calendar)"
+    )
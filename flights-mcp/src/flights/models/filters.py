@@ -0,0 +1,36 @@
+"""Server-side filter and ranking options shared by the search models."""
+
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from .time_specs import TimeSpec
+from .scoring import ScoreWeights
+
+class OfferFilters(BaseModel):
+    """Mixin for narrowing and ordering offers before they are returned."""
+    sort_by: Optional[Literal["price", "duration", "departure_time", "stops"]] = Field(
+        None, description="Order offers by total price, total duration, first departure time or number of stops"
+    )
+    top_k: Optional[int] = Field(None, ge=1, le=50, description="Return only the best k offers after filtering and sorting")
+    include_carriers: Optional[List[str]] = Field(None, description="Only offers flown entirely on these marketing carriers (IATA codes, e.g. ['UA', 'LH'])")
+    exclude_carriers: Optional[List[str]] = Field(None, description="Drop offers with any segment on these marketing carriers (IATA codes)")
+    max_stops: Optional[int] = Field(None, ge=0, description="Maximum stops on each slice (0 for non-stop)")
+    departure_window: TimeSpec | None = Field(None, description="Local time range the first flight must depart in")
+    arrival_window: TimeSpec | None = Field(None, description="Local time range the first slice must arrive in")
+    max_layover_minutes: Optional[int] = Field(None, ge=0, description="Longest allowed connection, in minutes")
+    max_price: Optional[float] = Field(None, gt=0, description="Maximum total price")
+    score_weights: Optional[ScoreWeights] = Field(
+        None, description="Rank offers by a weighted score of price, duration, stops and departure time (used unless sort_by is set)"
+    )
+    collapse_fares: bool = Field(
+        True, description="Merge offers for the same flights into their cheapest fare, listing the other fare brands as fare_variants"
+    )
+    pareto_only: bool = Field(
+        False, description="Keep only Pareto-optimal offers: those no other offer beats on price, duration and stops at once"
+    )
+
+    def has_filters(self) -> bool:
+        """Whether any filter (as opposed to sort or top_k) is set."""
+        return any(value is not None for value in (
+            self.include_carriers, self.exclude_carriers, self.max_stops, self.departure_window,
+            self.arrival_window, self.max_layover_minutes, self.max_price
+        )) or self.pareto_only
@@ -3,11 +3,24 @@
 from .search import FlightSearch
 from .multi_city import MultiCityRequest
 from .segments import FlightSegment
-from .offers import OfferDetails
+from .offers import OfferDetails, OfferDetailsBatch, OfferPage
+from .calendar import PriceCalendar, DateGrid
+from .filters import OfferFilters
+from .results import ResultQuery, ResultAggregate, ResultScore
+from .scoring import ScoreWeights
 
 __all__ = [
     'FlightSearch',
     'MultiCityRequest',
     'FlightSegment',
     'OfferDetails',
+    'OfferDetailsBatch',
+    'OfferPage',
+    'PriceCalendar',
+    'DateGrid',
+    'OfferFilters',
+    'ResultQuery',
+    'ResultAggregate',
+    'ResultScore',
+    'ScoreWeights',
 ] 
\ No newline at end of file
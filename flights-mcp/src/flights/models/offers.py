@@ -1,7 +1,23 @@
 """Offer-related models."""
 
+from typing import List, Optional, Literal
 from pydantic import BaseModel, Field
 
 class OfferDetails(BaseModel):
     """Model for getting detailed offer information."""
-    offer_id: str = Field(..., description="The ID of the offer to get details for") 
\ No newline at end of file
+    offer_id: str = Field(..., description="The ID of the offer to get details for")
+    refresh: bool = Field(False, description="Fetch fresh details from Duffel instead of using a cached copy") 
+
+class OfferDetailsBatch(BaseModel):
+    """Model for getting details of several offers in one call."""
+    offer_ids: List[str] = Field(..., min_length=1, max_length=20, description="IDs of the offers to get details for")
+    max_concurrency: int = Field(4, ge=1, le=10, description="Maximum number of offers fetched at the same time")
+    refresh: bool = Field(False, description="Fetch fresh details from Duffel instead of using cached copies")
+
+class OfferPage(BaseModel):
+    """Model for fetching the next page of offers from an earlier search."""
+    request_id: str = Field(..., description="The request_id returned by the search")
+    cursor: str = Field(..., description="The next_cursor returned with the previous page")
+    sort_by: Optional[Literal["price", "duration"]] = Field(None, description="Order offers by total price or total duration (use the same value as the search)")
+    limit: int = Field(20, ge=1, le=200, description="Number of offers to return")
+    max_connections: int | None = Field(None, description="Maximum number of connections (0 for non-stop)")
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""Models for querying stored search result sets."""
+
+from typing import Literal
+from pydantic import Field
+from .filters import OfferFilters
+
+class ResultQuery(OfferFilters):
+    """Model for paging, filtering and sorting a stored search result set."""
+    result_id: str = Field(..., description="The result_id returned by a search")
+    offset: int = Field(0, ge=0, description="Number of matching offers to skip")
+    limit: int = Field(10, ge=1, le=50, description="Maximum offers to return")
+
+class ResultAggregate(OfferFilters):
+    """Model for summarizing a stored search result set by group."""
+    result_id: str = Field(..., description="The result_id returned by a search")
+    group_by: Literal["carrier", "stops", "departure_hour", "route"] = Field(
+        ..., description="Group offers by marketing carrier, number of stops, departure hour or origin-destination airports"
+    )
+
+class ResultScore(OfferFilters):
+    """Model for scoring the offers of a stored search result set."""
+    result_id: str = Field(..., description="The result_id returned by a search")
+    limit: int = Field(10, ge=1, le=50, description="Maximum offers to return, best score first")
@@ -0,0 +1,15 @@
+"""Weights for multi-criteria offer scoring."""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class ScoreWeights(BaseModel):
+    """Relative importance of each criterion when scoring offers (0 ignores it)."""
+    price: float = Field(1.0, ge=0, description="Weight of total price")
+    duration: float = Field(0.0, ge=0, description="Weight of total travel time")
+    stops: float = Field(0.0, ge=0, description="Weight of the number of stops")
+    departure_time: float = Field(0.0, ge=0, description="Weight of departing close to preferred_departure")
+    preferred_departure: Optional[str] = Field(
+        None, description="Preferred local departure time of the first flight (HH:MM)",
+        pattern="^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$"
+    )
@@ -1,14 +1,15 @@
 """Flight search models."""
 
-from typing import Optional, List
+from typing import Optional, List, Literal
 from pydantic import BaseModel, Field
 from .time_specs import TimeSpec
+from .filters import OfferFilters
 
-class FlightSearch(BaseModel):
+class FlightSearch(OfferFilters):
     """Model for flight search parameters."""
     type: str = Field(..., description="Type of flight: 'one_way', 'round_trip', or 'multi_city'")
-    origin: str = Field(..., description="Origin airport code")
-    destination: str = Field(..., description="Destination airport code")
+    origin: str | List[str] = Field(..., description="Origin airport code, city code covering several airports (e.g. NYC), or list of airport codes")
+    destination: str | List[str] = Field(..., description="Destination airport code, city code covering several airports (e.g. LON), or list of airport codes")
     departure_date: str = Field(..., description="Departure date (YYYY-MM-DD)")
     return_date: str | None = Field(None, description="Return date for round trips (YYYY-MM-DD)")
     departure_time: TimeSpec | None = Field(None, description="Preferred departure time range")
@@ -16,4 +17,4 @@ class FlightSearch(BaseModel):
     cabin_class: str = Field("economy", description="Cabin class (economy, business, first)")
     adults: int = Field(1, description="Number of adult passengers")
     max_connections: int = Field(None, description="Maximum number of connections (0 for non-stop)")
-    additional_stops: Optional[List[dict]] = Field(None, description="Additional stops for multi-city trips") 
\ No newline at end of file
+    additional_stops: Optional[List[dict]] = Field(None, description="Additional stops for multi-city trips")
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""JSON encoding and decoding for Duffel responses and tool payloads.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Output is compact (no indentation or padding) unless ``pretty``
+is requested, since every byte of a tool result is read by the model.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+from .config import FLIGHTS_JSON_PRETTY
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    """Encode values neither backend handles natively (e.g. Decimal, sets)."""
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps(value: Any, pretty: bool = FLIGHTS_JSON_PRETTY) -> str:
+    """Encode a value as a JSON string."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(value, default=_default, option=option).decode()
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False, default=_default)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decode JSON, preferably straight from response bytes (``response.content``)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
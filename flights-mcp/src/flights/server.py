@@ -1,20 +1,59 @@
 """Server initialization for find-flights MCP."""
 
+import argparse
 import logging
-from .services.search import mcp
+from typing import List, Optional
+
+import anyio
+
+from .config import FLIGHTS_MCP_TRANSPORT, FLIGHTS_MCP_HOST, FLIGHTS_MCP_PORT
+from .services.search import client_pool, mcp
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-def main():
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options; defaults come from the FLIGHTS_MCP_* environment variables."""
+    parser = argparse.ArgumentParser(prog="flights-mcp", description="Flight search MCP server using the Duffel API")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=FLIGHTS_MCP_TRANSPORT,
+                        help="stdio (one server per client process) or an HTTP transport for a shared, long-running server")
+    parser.add_argument("--host", default=FLIGHTS_MCP_HOST, help="Interface to listen on for HTTP transports")
+    parser.add_argument("--port", type=int, default=FLIGHTS_MCP_PORT, help="Port to listen on for HTTP transports")
+    args = parser.parse_args(argv)
+    if args.transport not in TRANSPORTS:
+        parser.error(f"invalid transport {args.transport!r} (choose from {', '.join(TRANSPORTS)})")
+    return args
+
+
+async def _serve_http(transport: str) -> None:
+    """Serve over HTTP, keeping the Duffel pool (and its connections) open between client sessions."""
+    async with client_pool():
+        if transport == "sse":
+            await mcp.run_sse_async()
+        else:
+            await mcp.run_streamable_http_async()
+
+
+def main(argv: Optional[List[str]] = None):
     """Entry point for the find-flights-mcp application."""
-    logger.info("Starting Find Flights MCP server")
+    args = parse_args(argv)
+    logger.info(f"Starting Find Flights MCP server ({args.transport})")
     try:
-        mcp.run(transport='stdio')
-        logger.info("Server initialized successfully")
+        if args.transport == "stdio":
+            mcp.run(transport='stdio')
+        else:
+            mcp.settings.host = args.host
+            mcp.settings.port = args.port
+            logger.info(f"Listening on http://{args.host}:{args.port}"
+                        f"{mcp.settings.sse_path if args.transport == 'sse' else mcp.settings.streamable_http_path}")
+            anyio.run(_serve_http, args.transport)
+        logger.info("Server stopped")
     except Exception as e:
         logger.error(f"Server error occurred: {str(e)}", exc_info=True)
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,5 +1,27 @@
 """Flight search services."""
 
-from .search import search_flights, get_offer_details, search_multi_city
+from .search import (
+    search_flights,
+    get_offer_details,
+    search_multi_city,
+    get_more_offers,
+    get_offers_details_batch,
+    get_price_calendar,
+    get_date_grid,
+    query_results,
+    aggregate_results,
+    score_results,
+)
 
-__all__ = ['search_flights', 'get_offer_details', 'search_multi_city'] 
\ No newline at end of file
+__all__ = [
+    'search_flights',
+    'get_offer_details',
+    'search_multi_city',
+    'get_more_offers',
+    'get_offers_details_batch',
+    'get_price_calendar',
+    'get_date_grid',
+    'query_results',
+    'aggregate_results',
+    'score_results',
+]
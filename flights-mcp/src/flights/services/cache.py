@@ -0,0 +1,128 @@
+"""In-process caches for Duffel responses."""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from ..metrics import Metrics
+from ..serialization import dumps
+
+
+def _json_size(value: Any) -> int:
+    """Approximate the memory footprint of a value by its JSON size."""
+    return len(dumps(value, pretty=False))
+
+
+def parse_expires_at(value: Optional[str]) -> Optional[float]:
+    """Parse a Duffel ``expires_at`` timestamp into epoch seconds."""
+    if not value:
+        return None
+    try:
+        # fromisoformat only accepts a trailing "Z" from Python 3.11
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def earliest_expiry(offers: Iterable[Dict]) -> Optional[float]:
+    """Get the earliest ``expires_at`` of a set of offers, in epoch seconds."""
+    expiries = [parse_expires_at(offer.get("expires_at")) for offer in offers]
+    expiries = [e for e in expiries if e is not None]
+    return min(expiries) if expiries else None
+
+
+class TTLCache:
+    """LRU cache bounded by entry count and bytes, with per-entry expiry.
+
+    Every entry expires after ``ttl`` seconds, or earlier if an explicit
+    ``expires_at`` (epoch seconds) is given when it is stored.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        sizeof: Callable[[Any], int] = _json_size,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self.metrics = Metrics()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a live entry, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.metrics.incr("cache.misses")
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.metrics.incr("cache.expirations")
+            self.metrics.incr("cache.misses")
+            return None
+
+        self._entries.move_to_end(key)
+        self.metrics.incr("cache.hits")
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """Store an entry, evicting least recently used entries to stay in budget."""
+        now = self._clock()
+        deadline = now + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        if deadline <= now:
+            return  # Already dead; caching it would only serve stale data
+
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            self.metrics.incr("cache.rejected")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, deadline, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.metrics.incr("cache.evictions")
+        self._update_gauges()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        if key in self._entries:
+            self._remove(key)
+            self._update_gauges()
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._bytes = 0
+        self._update_gauges()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and current size."""
+        snapshot = self.metrics.snapshot()
+        return {**snapshot["counters"], "entries": len(self._entries), "bytes": self._bytes}
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _update_gauges(self) -> None:
+        self.metrics.gauge("cache.entries", len(self._entries))
+        self.metrics.gauge("cache.bytes", self._bytes)
@@ -0,0 +1,302 @@
+"""Compact, typed representation of Duffel offers.
+
+Offers are wrapped in ``__slots__`` objects with price, minutes and
+stops read once and other ranking numbers on first use, so search results can
+be filtered, sorted and stored without re-reading ISO 8601 strings. Segments
+are parsed into objects only for the offers a search returns. Times are
+local wall-clock minutes since 1970-01-01, matching Duffel's local
+``departing_at``/``arriving_at``; they compare correctly within one airport.
+"""
+
+import re
+import sys
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_EMPTY: Dict[str, Any] = {}
+# Price of an offer without a total amount: sorts last and is left out of ranking
+UNPRICED = float("inf")
+
+
+# Offers in one response repeat the same few durations and departure times,
+# so both parsers are memoized
+@lru_cache(maxsize=4096)
+def duration_minutes(duration: Optional[str]) -> int:
+    """Convert an ISO 8601 duration such as PT5H30M into minutes."""
+    match = _ISO_DURATION.fullmatch(duration or "")
+    if not match:
+        return 0
+    days, hours, minutes = (int(part or 0) for part in match.groups())
+    return days * 1440 + hours * 60 + minutes
+
+
+@lru_cache(maxsize=8192)
+def epoch_minutes(timestamp: Optional[str]) -> Optional[int]:
+    """Convert a local ISO timestamp into wall-clock minutes since the epoch."""
+    if not timestamp:
+        return None
+    try:
+        day = date.fromisoformat(timestamp[:10]).toordinal() - _EPOCH_ORDINAL
+        return day * 1440 + int(timestamp[11:13]) * 60 + int(timestamp[14:16])
+    except ValueError:
+        return None
+
+
+class CompactSegment:
+    """One flight of a slice."""
+    __slots__ = ("origin", "destination", "departing_at", "arriving_at", "departs", "arrives",
+                 "duration", "carrier_code", "carrier_name", "flight_number")
+
+    def __init__(self, segment: Dict[str, Any]):
+        get = segment.get
+        carrier = get("marketing_carrier") or _EMPTY
+        self.origin = (get("origin") or _EMPTY).get("iata_code")
+        self.destination = (get("destination") or _EMPTY).get("iata_code")
+        self.departing_at = departing_at = get("departing_at")
+        self.arriving_at = arriving_at = get("arriving_at")
+        self.departs = epoch_minutes(departing_at)
+        self.arrives = epoch_minutes(arriving_at)
+        self.duration = get("duration")
+        self.carrier_code = carrier.get("iata_code")
+        self.carrier_name = carrier.get("name")
+        self.flight_number = get("marketing_carrier_flight_number")
+
+
+class CompactSlice:
+    """One direction of an offer, with its segments and layovers."""
+    __slots__ = ("origin", "destination", "duration", "duration_minutes", "fare_brand",
+                 "segments", "layover_minutes")
+
+    def __init__(self, slice_data: Dict[str, Any]):
+        get = slice_data.get
+        self.origin = (get("origin") or _EMPTY).get("iata_code")
+        self.destination = (get("destination") or _EMPTY).get("iata_code")
+        self.duration = duration = get("duration")
+        self.duration_minutes = duration_minutes(duration)
+        self.fare_brand = get("fare_brand_name")
+        self.segments = segments = tuple([CompactSegment(segment) for segment in get("segments") or ()])
+        self.layover_minutes: Tuple[int, ...] = tuple([
+            departing.departs - arriving.arrives
+            for arriving, departing in zip(segments, segments[1:])
+            if departing.departs is not None and arriving.arrives is not None
+        ]) if len(segments) > 1 else ()
+
+    @property
+    def stops(self) -> int:
+        return max(len(self.segments) - 1, 0)
+
+    def to_summary(self) -> Dict[str, Any]:
+        """The slice as search tools present it."""
+        segments = self.segments
+        stops = len(segments) - 1
+        return {
+            'origin': self.origin,
+            'destination': self.destination,
+            'departure': segments[0].departing_at,  # First segment departure
+            'arrival': segments[-1].arriving_at,    # Last segment arrival
+            'duration': self.duration,
+            'carrier': segments[0].carrier_name,
+            'stops': stops,
+            'stops_description': 'Non-stop' if stops == 0 else f'{stops} stop{"s" if stops > 1 else ""}',
+            'connections': [
+                {
+                    'airport': arriving.destination,
+                    'arrival': arriving.arriving_at,
+                    'departure': departing.departing_at,
+                    'duration': departing.duration
+                }
+                for arriving, departing in zip(segments, segments[1:])
+            ]
+        }
+
+
+class CompactOffer:
+    """An offer reduced to what search, ranking and result sets need.
+
+    Price, minutes and stops are read when the offer is parsed; departure
+    times, the carrier set and the longest layover on first use, and the
+    ``CompactSlice``/``CompactSegment`` objects only when the offer is shown.
+    """
+    __slots__ = ("id", "amount", "price", "currency", "slice_data",
+                 "duration_minutes", "stops", "max_slice_stops", "fare_variants",
+                 "_times", "_slices", "_carriers", "_longest_layover")
+
+    def __init__(self, offer: Dict[str, Any]):
+        get = offer.get
+        self.id = get("id")
+        self.amount = amount = get("total_amount")
+        self.price = float(amount) if amount else UNPRICED
+        self.currency = get("total_currency")
+        slice_data = get("slices") or ()
+        minutes = stops = max_slice_stops = 0
+        for slice_ in slice_data:
+            segments = slice_.get("segments")
+            if not segments:
+                # Slices without segments carry nothing to show or rank on
+                slice_data = [slice_ for slice_ in slice_data if slice_.get("segments")]
+                continue
+            minutes += duration_minutes(slice_.get("duration"))
+            slice_stops = len(segments) - 1
+            stops += slice_stops
+            if slice_stops > max_slice_stops:
+                max_slice_stops = slice_stops
+        self.slice_data: List[Dict[str, Any]] = slice_data
+        self.duration_minutes = minutes
+        self.stops = stops
+        self.max_slice_stops = max_slice_stops
+        # Pricier offers for the same flights, set by collapse_fare_variants
+        self.fare_variants: Tuple["CompactOffer", ...] = ()
+        # Filled on first use by the properties below
+        self._times: Optional[Tuple[Optional[int], Optional[int]]] = None
+        self._slices: Optional[Tuple[CompactSlice, ...]] = None
+        self._carriers: Optional[FrozenSet[str]] = None
+        self._longest_layover: Optional[int] = None
+
+    @property
+    def slices(self) -> Tuple[CompactSlice, ...]:
+        """The parsed slices, built on first use."""
+        if self._slices is None:
+            self._slices = tuple([CompactSlice(slice_) for slice_ in self.slice_data])
+        return self._slices
+
+    def _first_slice_times(self) -> Tuple[Optional[int], Optional[int]]:
+        if self._times is None:
+            first = self.slice_data[0]["segments"] if self.slice_data else None
+            self._times = ((epoch_minutes(first[0].get("departing_at")),
+                            epoch_minutes(first[-1].get("arriving_at"))) if first else (None, None))
+        return self._times
+
+    @property
+    def departs(self) -> Optional[int]:
+        """Departure of the first flight, in epoch minutes."""
+        return self._first_slice_times()[0]
+
+    @property
+    def arrives(self) -> Optional[int]:
+        """Arrival of the first slice's last flight, in epoch minutes."""
+        return self._first_slice_times()[1]
+
+    @property
+    def carriers(self) -> FrozenSet[str]:
+        """Marketing carrier codes of every flight."""
+        if self._carriers is None:
+            self._carriers = frozenset([
+                (segment.get("marketing_carrier") or _EMPTY).get("iata_code")
+                for slice_ in self.slice_data for segment in slice_["segments"]
+            ])
+        return self._carriers
+
+    @property
+    def longest_layover(self) -> int:
+        """Longest connection of any slice, in minutes (0 without connections)."""
+        if self._longest_layover is None:
+            longest = 0
+            for slice_ in self.slice_data:
+                segments = slice_["segments"]
+                for arriving, departing in zip(segments, segments[1:]):
+                    departs = epoch_minutes(departing.get("departing_at"))
+                    arrives = epoch_minutes(arriving.get("arriving_at"))
+                    if departs is not None and arrives is not None and departs - arrives > longest:
+                        longest = departs - arrives
+            self._longest_layover = longest
+        return self._longest_layover
+
+    @property
+    def carrier(self) -> Optional[str]:
+        """Marketing carrier name of the first flight."""
+        if not self.slice_data:
+            return None
+        return (self.slice_data[0]["segments"][0].get("marketing_carrier") or _EMPTY).get("name")
+
+    @property
+    def route(self) -> str:
+        """Origin and destination airports of the first slice."""
+        if not self.slice_data:
+            return "-"
+        first = self.slice_data[0]
+        return (f"{(first.get('origin') or _EMPTY).get('iata_code')}-"
+                f"{(first.get('destination') or _EMPTY).get('iata_code')}")
+
+    @property
+    def fare_brand(self) -> Optional[str]:
+        """Fare brand names of the slices, e.g. "Basic / Main"."""
+        brands = list(dict.fromkeys(slice_.get("fare_brand_name") for slice_ in self.slice_data
+                                    if slice_.get("fare_brand_name")))
+        return " / ".join(brands) or None
+
+    def itinerary_key(self) -> Tuple[Tuple[Tuple[Any, ...], ...], ...]:
+        """The physical flights of the offer: carrier, flight number and departure of each segment."""
+        return tuple(
+            tuple(((segment.get("marketing_carrier") or _EMPTY).get("iata_code"),
+                   segment.get("marketing_carrier_flight_number"), segment.get("departing_at"))
+                  for segment in slice_["segments"])
+            for slice_ in self.slice_data
+        )
+
+    def to_summary(self) -> Dict[str, Any]:
+        """The offer as search tools present it."""
+        summary = {
+            'offer_id': self.id,
+            'price': {
+                'amount': self.amount,
+                'currency': self.currency
+            },
+            'slices': [slice_.to_summary() for slice_ in self.slices]
+        }
+        if self.fare_variants:
+            summary['fare_brand'] = self.fare_brand
+            summary['fare_variants'] = [
+                {'offer_id': variant.id, 'amount': variant.amount, 'fare_brand': variant.fare_brand}
+                for variant in self.fare_variants
+            ]
+        return summary
+
+    def footprint(self) -> int:
+        """Approximate memory held by the offer, in bytes.
+
+        A slim segment dict holds three small dicts (airports and carrier)
+        about its own size, plus its timestamp strings.
+        """
+        size = sys.getsizeof(self) + sum(sys.getsizeof(getattr(self, name)) for name in ("id", "amount"))
+        for slice_ in self.slice_data:
+            segments = slice_["segments"]
+            size += sys.getsizeof(slice_) + sys.getsizeof(segments)
+            size += sum(4 * sys.getsizeof(segment) + 3 * sys.getsizeof(segment.get("departing_at") or "")
+                        for segment in segments)
+        if self._slices is not None:
+            size += sum(sys.getsizeof(slice_) + sys.getsizeof(segment)
+                        for slice_ in self._slices for segment in slice_.segments)
+        return size + sum(variant.footprint() for variant in self.fare_variants)
+
+
+def compact_offers(offers: Iterable[Dict[str, Any]]) -> List[CompactOffer]:
+    """Parse Duffel offers into compact offers."""
+    return [CompactOffer(offer) for offer in offers]
+
+
+def collapse_fare_variants(offers: Iterable[CompactOffer]) -> List[CompactOffer]:
+    """Merge offers for the same flights into their cheapest fare.
+
+    Duffel often returns one offer per fare brand or set of conditions for
+    the same physical flights. Each group keeps its cheapest offer, with the
+    others (cheapest first) in ``fare_variants``, in order of first appearance.
+    """
+    groups: Dict[Tuple[Any, ...], List[CompactOffer]] = {}
+    for offer in offers:
+        groups.setdefault(offer.itinerary_key(), []).append(offer)
+
+    collapsed = []
+    for members in groups.values():
+        if len(members) > 1:
+            members.sort(key=lambda offer: offer.price)
+            members[0].fare_variants = tuple(members[1:])
+        collapsed.append(members[0])
+    return collapsed
+
+
+def expand_fare_variants(offers: Iterable[CompactOffer]) -> List[CompactOffer]:
+    """Undo ``collapse_fare_variants``, listing every fare as its own offer."""
+    return [fare for offer in offers for fare in (offer, *offer.fare_variants)]
@@ -0,0 +1,37 @@
+"""MCP progress notifications for long-running tool calls."""
+
+import logging
+from typing import Optional
+
+from mcp.server.fastmcp import Context
+
+logger = logging.getLogger(__name__)
+
+
+class ToolProgress:
+    """Reports the progress of one tool call to the client.
+
+    Each ``advance`` moves progress forward by one step; ``total`` is the
+    number of steps when it is known up front (e.g. one per searched day).
+    Notifications are only sent when the client asked for them with a
+    progress token, and a failure to send one never fails the tool call.
+    """
+
+    def __init__(self, ctx: Optional[Context], total: Optional[int] = None):
+        self.ctx = ctx
+        self.total = total
+        self.progress = 0
+
+    async def advance(self, message: str) -> None:
+        """Complete one step and report it with a short message."""
+        self.progress += 1
+        if self.ctx is None:
+            return
+        try:
+            await self.ctx.report_progress(self.progress, self.total, message)
+        except Exception as e:
+            logger.debug(f"Could not report progress: {str(e)}")
+
+    async def offers_received(self, count: int) -> None:
+        """Streaming callback for ``DuffelClient.create_offer_request``."""
+        await self.advance(f"{count} offers received" if count else "Duffel is responding; reading offers")
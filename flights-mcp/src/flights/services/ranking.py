@@ -0,0 +1,161 @@
+"""Server-side filtering and ranking of compact offers."""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .compact import UNPRICED, CompactOffer, expand_fare_variants
+from .scoring import pareto_front, sort_by_score
+
+
+def _time_of_day(time_spec: str) -> int:
+    """Minutes past midnight of an HH:MM string."""
+    hours, minutes = time_spec.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+# Sort keys; ties are broken by price
+_SORT_KEYS: Dict[str, Callable[[CompactOffer], Any]] = {
+    "price": lambda offer: offer.price,
+    "duration": lambda offer: (offer.duration_minutes, offer.price),
+    "departure_time": lambda offer: (offer.departs if offer.departs is not None else float("inf"), offer.price),
+    "stops": lambda offer: (offer.stops, offer.price),
+}
+
+
+def sort_offers(offers: List[CompactOffer], sort_by: Optional[str]) -> List[CompactOffer]:
+    """Order offers by one of the supported sort keys (unchanged if none)."""
+    key = _SORT_KEYS.get(sort_by or "")
+    return sorted(offers, key=key) if key else offers
+
+
+def _window(time_spec) -> Optional[Tuple[int, int]]:
+    """Start and end minutes of a TimeSpec, if one is set."""
+    if time_spec is None:
+        return None
+    return _time_of_day(time_spec.from_time), _time_of_day(time_spec.to_time)
+
+
+def _in_window(minutes: Optional[int], window: Optional[Tuple[int, int]]) -> bool:
+    """Whether a wall-clock time falls within a (start, end) window."""
+    if window is None:
+        return True
+    if minutes is None:
+        return False
+    time_of_day = minutes % 1440
+    start, end = window
+    if start <= end:
+        return start <= time_of_day <= end
+    return time_of_day >= start or time_of_day <= end  # Window wraps past midnight
+
+
+def compile_filters(filters) -> Callable[[CompactOffer], bool]:
+    """Build a predicate for the filters of an ``OfferFilters`` model.
+
+    Carrier sets and time windows are resolved once per query rather than
+    once per offer.
+    """
+    max_price = filters.max_price
+    include = frozenset(code.upper() for code in filters.include_carriers) if filters.include_carriers else None
+    exclude = frozenset(code.upper() for code in filters.exclude_carriers) if filters.exclude_carriers else None
+    max_stops = filters.max_stops
+    max_layover = filters.max_layover_minutes
+    departure_window = _window(filters.departure_window)
+    arrival_window = _window(filters.arrival_window)
+
+    def matches(offer: CompactOffer) -> bool:
+        if max_price is not None and offer.price > max_price:
+            return False
+        if include is not None and not offer.carriers <= include:
+            return False
+        if exclude is not None and offer.carriers & exclude:
+            return False
+        if max_stops is not None and offer.max_slice_stops > max_stops:
+            return False
+        if max_layover is not None and offer.longest_layover > max_layover:
+            return False
+        return _in_window(offer.departs, departure_window) and _in_window(offer.arrives, arrival_window)
+
+    return matches
+
+
+def matches(offer: CompactOffer, filters) -> bool:
+    """Whether an offer passes the filters of an ``OfferFilters`` model."""
+    return compile_filters(filters)(offer)
+
+
+def select_offers(offers: List[CompactOffer], params, default_sort: Optional[str] = None) -> List[CompactOffer]:
+    """Filter and sort offers, keeping every match.
+
+    ``pareto_only`` narrows the matches to their Pareto frontier, and
+    ``score_weights`` orders them by score unless ``sort_by`` is given.
+    Offers are expected with fare variants collapsed; ``collapse_fares=False``
+    lists each variant as its own offer again. Offers without a price are
+    never selected.
+    """
+    if not params.collapse_fares:
+        offers = expand_fare_variants(offers)
+    offers = [offer for offer in offers if offer.price != UNPRICED]
+    if params.has_filters():
+        offers = list(filter(compile_filters(params), offers))
+    weights = params.score_weights
+    if params.pareto_only:
+        offers = pareto_front(offers, weights.preferred_departure if weights else None)
+    if weights is not None and not params.sort_by:
+        return sort_by_score(offers, weights)
+    return sort_offers(offers, params.sort_by or default_sort)
+
+
+def rank_offers(offers: List[CompactOffer], params, limit: int,
+                default_sort: Optional[str] = None) -> List[CompactOffer]:
+    """Filter, sort and truncate offers to ``top_k`` (at most ``limit``)."""
+    return select_offers(offers, params, default_sort)[:min(params.top_k or limit, limit)]
+
+
+# Grouping keys for aggregate queries over a result set
+_GROUP_KEYS: Dict[str, Callable[[CompactOffer], Any]] = {
+    "carrier": lambda offer: offer.carrier,
+    "stops": lambda offer: offer.stops,
+    "departure_hour": lambda offer: f"{offer.departs % 1440 // 60:02d}" if offer.departs is not None else None,
+    "route": lambda offer: offer.route,
+}
+
+
+def summarize_offers(offers: List[CompactOffer]) -> Dict[str, Any]:
+    """Short overview of a set of offers: counts and price/duration ranges."""
+    if not offers:
+        return {'offers': 0}
+    prices = [offer.price for offer in offers]
+    minutes = [offer.duration_minutes for offer in offers]
+    stops: Dict[int, int] = {}
+    carriers: Dict[str, int] = {}
+    for offer in offers:
+        stops[offer.stops] = stops.get(offer.stops, 0) + 1
+        if offer.carrier:
+            carriers[offer.carrier] = carriers.get(offer.carrier, 0) + 1
+    return {
+        'offers': len(offers),
+        'currency': offers[0].currency,
+        'price': {'min': min(prices), 'max': max(prices)},
+        'duration_minutes': {'min': min(minutes), 'max': max(minutes)},
+        'stops': {str(count): total for count, total in sorted(stops.items())},
+        'carriers': sorted(carriers, key=carriers.get, reverse=True)[:5],
+    }
+
+
+def aggregate_offers(offers: List[CompactOffer], group_by: str) -> List[Dict[str, Any]]:
+    """Group offers and report each group's size and best price and duration."""
+    key = _GROUP_KEYS[group_by]
+    groups: Dict[Any, List[CompactOffer]] = {}
+    for offer in offers:
+        groups.setdefault(key(offer), []).append(offer)
+
+    rows = []
+    for value, members in groups.items():
+        cheapest = min(members, key=lambda offer: offer.price)
+        rows.append({
+            group_by: value,
+            'offers': len(members),
+            'min_price': cheapest.price,
+            'cheapest_offer_id': cheapest.id,
+            'shortest_duration_minutes': min(offer.duration_minutes for offer in members),
+        })
+    return sorted(rows, key=lambda row: row['min_price'])
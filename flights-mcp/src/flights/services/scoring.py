@@ -0,0 +1,130 @@
+"""Multi-criteria scoring and Pareto frontiers over compact offers.
+
+Each criterion (price, duration, stops and distance from a preferred
+departure time) is min-max normalized across the offers being compared, so
+weights are relative importances rather than unit conversions. Scores run
+from 0 (worst on every weighted criterion) to 1 (best on all of them).
+
+Uses NumPy when it is installed and falls back to pure Python otherwise;
+both produce the same scores and frontier.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+from .compact import CompactOffer
+
+BACKEND = "numpy" if numpy is not None else "python"
+
+CRITERIA = ("price", "duration", "stops", "departure_time")
+
+
+def _parse_time(time_spec: Optional[str]) -> Optional[int]:
+    if not time_spec:
+        return None
+    hours, minutes = time_spec.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _departure_gap(offer: CompactOffer, preferred: Optional[int]) -> int:
+    """Minutes between the first departure and the preferred time of day."""
+    if preferred is None:
+        return 0
+    if offer.departs is None:
+        return 720  # As far from the preference as a time of day can be
+    gap = abs(offer.departs % 1440 - preferred)
+    return min(gap, 1440 - gap)
+
+
+def criteria_rows(offers: Sequence[CompactOffer], preferred_departure: Optional[str] = None) -> List[List[float]]:
+    """One row per offer of the raw criteria, in ``CRITERIA`` order (lower is better)."""
+    preferred = _parse_time(preferred_departure)
+    return [[offer.price, offer.duration_minutes, offer.stops, _departure_gap(offer, preferred)]
+            for offer in offers]
+
+
+def _weight_vector(weights) -> List[float]:
+    vector = [weights.price, weights.duration, weights.stops,
+              weights.departure_time if weights.preferred_departure else 0.0]
+    return vector if any(vector) else [1.0, 0.0, 0.0, 0.0]  # Nothing weighted: rank by price
+
+
+def _normalized_python(rows: List[List[float]]) -> List[List[float]]:
+    columns = list(zip(*rows))
+    lows = [min(column) for column in columns]
+    spans = [(max(column) - low) or 1.0 for column, low in zip(columns, lows)]
+    return [[(value - low) / span for value, low, span in zip(row, lows, spans)] for row in rows]
+
+
+def score_offers(offers: Sequence[CompactOffer], weights) -> List[float]:
+    """Score offers against a ``ScoreWeights`` model, in one pass over all of them."""
+    if not offers:
+        return []
+    rows = criteria_rows(offers, weights.preferred_departure)
+    vector = _weight_vector(weights)
+    total = sum(vector)
+    if numpy is not None:
+        matrix = numpy.asarray(rows, dtype=float)
+        lows = matrix.min(axis=0)
+        spans = matrix.max(axis=0) - lows
+        spans[spans == 0] = 1.0
+        costs = ((matrix - lows) / spans) @ numpy.asarray(vector) / total
+        return [round(1.0 - cost, 4) for cost in costs.tolist()]
+    return [round(1.0 - sum(value * weight for value, weight in zip(row, vector)) / total, 4)
+            for row in _normalized_python(rows)]
+
+
+def score_breakdown(offer: CompactOffer, preferred_departure: Optional[str] = None) -> Dict[str, int]:
+    """The raw criteria behind an offer's score."""
+    breakdown = {'duration_minutes': offer.duration_minutes, 'stops': offer.stops}
+    if preferred_departure:
+        breakdown['departure_gap_minutes'] = _departure_gap(offer, _parse_time(preferred_departure))
+    return breakdown
+
+
+def pareto_mask(offers: Sequence[CompactOffer], preferred_departure: Optional[str] = None) -> List[bool]:
+    """Whether each offer is Pareto-optimal on price, duration and stops.
+
+    An offer is dominated when another is no worse on every criterion and
+    strictly better on at least one; departure-time distance joins the
+    criteria when a preferred departure is given. Identical offers do not
+    dominate each other.
+    """
+    if not offers:
+        return []
+    rows = criteria_rows(offers, preferred_departure)
+    if not preferred_departure:
+        rows = [row[:3] for row in rows]
+    if numpy is not None:
+        matrix = numpy.asarray(rows, dtype=float)
+        # dominates[j, i]: offer j is no worse than i everywhere and better somewhere
+        no_worse = (matrix[:, None, :] <= matrix[None, :, :]).all(axis=2)
+        better = (matrix[:, None, :] < matrix[None, :, :]).any(axis=2)
+        return (~(no_worse & better).any(axis=0)).tolist()
+
+    # In lexicographic order every dominator of an offer comes before it, and
+    # checking the frontier found so far suffices since domination is transitive
+    frontier: List[List[float]] = []
+    optimal = [False] * len(rows)
+    for index in sorted(range(len(rows)), key=rows.__getitem__):
+        row = rows[index]
+        if not any(all(a <= b for a, b in zip(other, row)) and other != row for other in frontier):
+            frontier.append(row)
+            optimal[index] = True
+    return optimal
+
+
+def pareto_front(offers: Sequence[CompactOffer], preferred_departure: Optional[str] = None) -> List[CompactOffer]:
+    """The Pareto-optimal offers, in their original order."""
+    return [offer for offer, optimal in zip(offers, pareto_mask(offers, preferred_departure)) if optimal]
+
+
+def sort_by_score(offers: Sequence[CompactOffer], weights) -> List[CompactOffer]:
+    """Order offers best score first, breaking ties by price."""
+    scores = score_offers(offers, weights)
+    order = sorted(range(len(offers)), key=lambda index: (-scores[index], offers[index].price))
+    return [offers[index] for index in order]
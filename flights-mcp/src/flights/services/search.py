@@ -1,26 +1,106 @@
 """Flight search tools using Duffel API."""
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict
+import weakref
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import AsyncIterator, Dict, List, Optional
 import json
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 # Import all models through flight_search
 from ..models.flight_search import (
     FlightSearch,
     MultiCityRequest,
-    OfferDetails
+    OfferDetails,
+    OfferDetailsBatch,
+    OfferPage,
+    PriceCalendar,
+    DateGrid,
+    OfferFilters,
+    ResultQuery,
+    ResultAggregate,
+    ResultScore,
+    ScoreWeights
 )
 from ..models.time_specs import TimeSpec
-from ..api import DuffelClient
+from ..api import DuffelClient, Priority
+from ..serialization import dumps
+from ..config import (
+    DUFFEL_OFFER_RETRIEVAL,
+    DUFFEL_STREAM_OFFERS,
+    DUFFEL_FAN_OUT_CONCURRENCY,
+    METRO_AIRPORTS,
+    FLIGHTS_METRO_MAX_PAIRS,
+    OFFER_REQUEST_CACHE_TTL,
+    OFFER_REQUEST_CACHE_MAX_ENTRIES,
+    OFFER_REQUEST_CACHE_MAX_BYTES,
+    OFFER_DETAILS_CACHE_TTL,
+    OFFER_DETAILS_CACHE_MAX_ENTRIES,
+    OFFER_DETAILS_CACHE_MAX_BYTES,
+    RESULT_SET_TTL,
+    RESULT_SET_MAX_ENTRIES,
+    RESULT_SET_MAX_BYTES,
+)
+from .cache import TTLCache, earliest_expiry, parse_expires_at
+from .compact import UNPRICED, CompactOffer, collapse_fare_variants, compact_offers
+from .ranking import aggregate_offers, select_offers, summarize_offers
+from .scoring import pareto_mask, score_breakdown, score_offers
+from .progress import ToolProgress
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Initialize FastMCP server 
-mcp = FastMCP("find-flights-mcp")
 flight_client = None  # Initialize lazily when needed
 
+# Offers returned per search, to manage response size
+SEARCH_MAX_OFFERS = 50
+MULTI_CITY_MAX_OFFERS = 10
+# Offers shown per page of a stored result set unless top_k asks for more
+RESULT_PAGE_SIZE = 10
+# Offers retrieved when filters are set, so filtering has enough to choose from
+SEARCH_SCAN_MAX_OFFERS = 200
+
+# Duffel's server-side sort keys for the list offers endpoint
+_DUFFEL_SORT = {"price": "total_amount", "duration": "total_duration"}
+
+# Search results keyed by canonical request parameters
+offer_request_cache = TTLCache(
+    ttl=OFFER_REQUEST_CACHE_TTL,
+    max_entries=OFFER_REQUEST_CACHE_MAX_ENTRIES,
+    max_bytes=OFFER_REQUEST_CACHE_MAX_BYTES,
+)
+
+# Full offer sets of recent searches, queried by result_id
+result_sets = TTLCache(
+    ttl=RESULT_SET_TTL,
+    max_entries=RESULT_SET_MAX_ENTRIES,
+    max_bytes=RESULT_SET_MAX_BYTES,
+    sizeof=lambda result_set: sum(offer.footprint() for offer in result_set['offers']),
+)
+
+# Offer details keyed by offer ID, evicted no later than the offer expires
+offer_details_cache = TTLCache(
+    ttl=OFFER_DETAILS_CACHE_TTL,
+    max_entries=OFFER_DETAILS_CACHE_MAX_ENTRIES,
+    max_bytes=OFFER_DETAILS_CACHE_MAX_BYTES,
+)
+
+# Fan-out searches share one concurrency limit per event loop
+_fan_out_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _fan_out_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent fan-out offer requests."""
+    loop = asyncio.get_running_loop()
+    semaphore = _fan_out_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _fan_out_semaphores[loop] = asyncio.Semaphore(DUFFEL_FAN_OUT_CONCURRENCY)
+    return semaphore
+
 def _get_flight_client():
     """Get or initialize the flight client."""
     global flight_client
@@ -28,6 +108,45 @@ def _get_flight_client():
         flight_client = DuffelClient(logger)
     return flight_client
 
+@asynccontextmanager
+async def client_pool() -> AsyncIterator[None]:
+    """Hold the Duffel connection pool open for the duration of the block."""
+    try:
+        client = _get_flight_client()
+    except ValueError as e:
+        # Let the server start (e.g. for tool listing) without an API key
+        logger.warning(f"Duffel client not available: {str(e)}")
+        yield
+        return
+    async with client:
+        yield
+
+@asynccontextmanager
+async def _server_lifespan(server: FastMCP) -> AsyncIterator[Dict]:
+    """Hold the Duffel connection pool open for the life of the server.
+
+    Over HTTP transports this runs once per client session; ``server.main``
+    also holds the pool for the life of the process so that it survives
+    between sessions.
+    """
+    async with client_pool():
+        yield {}
+
+# Initialize FastMCP server 
+mcp = FastMCP("find-flights-mcp", lifespan=_server_lifespan)
+
+@mcp.resource("flights://stats")
+def server_stats() -> str:
+    """Runtime metrics for the Duffel client (connection reuse, etc.)."""
+    stats = {
+        "client": flight_client.metrics.snapshot() if flight_client else None,
+        "circuits": flight_client.resilience.states() if flight_client else None,
+        "offer_request_cache": offer_request_cache.stats(),
+        "offer_details_cache": offer_details_cache.stats(),
+        "result_sets": result_sets.stats(),
+    }
+    return dumps(stats, pretty=True)
+
 def _create_slice(origin: str, destination: str, date: str, 
                  departure_time: TimeSpec | None = None,
                  arrival_time: TimeSpec | None = None) -> Dict:
@@ -60,44 +179,284 @@ def _create_slice(origin: str, destination: str, date: str,
     
     return slice_data
 
+def _offer_request_key(slices: List[Dict], cabin_class: str, adult_count: int,
+                       max_connections: Optional[int], max_offers: int,
+                       sort_by: Optional[str]) -> str:
+    """Build a canonical cache key for an offer request.
+
+    Inline offer requests are keyed on the request body alone: Duffel
+    returns the same offers whatever the limit or sort, which are applied
+    locally. Paginated retrieval fetches one page sorted by Duffel, so
+    there the page size and sort are part of the key.
+    """
+    canonical_slices = [
+        {
+            "origin": slice_data["origin"].upper(),
+            "destination": slice_data["destination"].upper(),
+            "departure_date": slice_data["departure_date"],
+            "departure_time": slice_data.get("departure_time"),
+            "arrival_time": slice_data.get("arrival_time"),
+        }
+        for slice_data in slices
+    ]
+    key = [canonical_slices, cabin_class.lower(), adult_count, max_connections]
+    if DUFFEL_OFFER_RETRIEVAL == "paginated":
+        key += [max_offers, _DUFFEL_SORT.get(sort_by, "total_amount")]
+    return json.dumps(key, sort_keys=True)
+
+def _cached_offer_request(key: str, max_offers: int) -> Optional[Dict]:
+    """Get a cached offer request response if it holds the first ``max_offers`` offers."""
+    entry = offer_request_cache.get(key)
+    if entry is None:
+        return None
+    response, fetched = entry['response'], entry['max_offers']
+    # A response shorter than its limit already holds every offer Duffel returned
+    if fetched < max_offers and len(response.get('offers', [])) >= fetched:
+        return None
+    logger.info(f"Offer request cache hit for request {response['request_id']}")
+    if len(response.get('offers', [])) > max_offers:
+        return {**response, 'offers': response['offers'][:max_offers]}
+    return response
+
+async def _create_offer_request(client: DuffelClient, slices: List[Dict], cabin_class: str,
+                                adult_count: int, max_connections: Optional[int],
+                                supplier_timeout: int, max_offers: int,
+                                sort_by: Optional[str] = None,
+                                priority: Priority = Priority.INTERACTIVE,
+                                progress: Optional[ToolProgress] = None) -> Dict:
+    """Create an offer request, serving repeated searches from the cache.
+
+    In paginated retrieval mode the offer request is created without inline
+    offers and only the first ``max_offers`` offers, sorted by Duffel, are
+    fetched; ``next_cursor`` in the result points at the next page.
+    ``progress`` is advanced as streamed offers arrive.
+    """
+    key = _offer_request_key(slices, cabin_class, adult_count, max_connections, max_offers, sort_by)
+    cached = _cached_offer_request(key, max_offers)
+    if cached is not None:
+        return cached
+
+    if DUFFEL_OFFER_RETRIEVAL == "paginated":
+        created = await client.create_offer_request(
+            slices=slices,
+            cabin_class=cabin_class,
+            adult_count=adult_count,
+            max_connections=max_connections,
+            return_offers=False,
+            supplier_timeout=supplier_timeout,
+            priority=priority
+        )
+        response = await client.list_offers(
+            offer_request_id=created['request_id'],
+            sort=_DUFFEL_SORT.get(sort_by, "total_amount"),  # Other keys are sorted locally
+            limit=max_offers,
+            max_connections=max_connections,
+            priority=priority
+        )
+    else:
+        response = await client.create_offer_request(
+            slices=slices,
+            cabin_class=cabin_class,
+            adult_count=adult_count,
+            max_connections=max_connections,
+            return_offers=True,
+            supplier_timeout=supplier_timeout,
+            max_offers=max_offers,
+            stream=DUFFEL_STREAM_OFFERS,
+            priority=priority,
+            on_offers=progress.offers_received if progress is not None else None
+        )
+
+    # Empty results are often a supplier timeout; don't pin them in the cache
+    offers = response.get("offers", [])
+    if offers:
+        offer_request_cache.set(key, {'response': response, 'max_offers': max_offers},
+                                expires_at=earliest_expiry(offers))
+    return response
+
+async def _get_offer(client: DuffelClient, offer_id: str, refresh: bool = False) -> Dict:
+    """Get offer details, reusing a cached copy until the offer expires."""
+    if not refresh:
+        cached = offer_details_cache.get(offer_id)
+        if cached is not None:
+            logger.info(f"Offer details cache hit for {offer_id}")
+            return cached
+    else:
+        offer_details_cache.invalidate(offer_id)
+
+    response = await client.get_offer(offer_id=offer_id)
+    expires_at = parse_expires_at(response.get('data', {}).get('expires_at'))
+    offer_details_cache.set(offer_id, response, expires_at=expires_at)
+    return response
+
+def _cheapest_offer(offers: List[Dict]) -> Optional[Dict]:
+    """Pick the lowest priced offer."""
+    priced = [offer for offer in offers if offer.get('total_amount') is not None]
+    return min(priced, key=lambda offer: float(offer['total_amount']), default=None)
+
+async def _fan_out_search(client: DuffelClient, slices: List[Dict], cabin_class: str,
+                          adult_count: int, max_connections: Optional[int]) -> List[Dict]:
+    """Search for fan-out tools, sharing search_flights' cache entries."""
+    async with _fan_out_semaphore():
+        response = await _create_offer_request(
+            client,
+            slices=slices,
+            cabin_class=cabin_class,
+            adult_count=adult_count,
+            max_connections=max_connections,
+            supplier_timeout=20000,  # Keep one slow search from holding up the whole result
+            max_offers=SEARCH_MAX_OFFERS,
+            priority=Priority.BACKGROUND
+        )
+    return response.get('offers', [])
+
+def _format_offer(offer: Dict) -> Dict:
+    """Reduce a Duffel offer to the essentials the model needs."""
+    return CompactOffer(offer).to_summary()
+
+def _store_result_set(request_ids: List[str], offers: List[CompactOffer], expires_at: Optional[float]) -> str:
+    """Keep a search's full offer set for later queries and return its result_id."""
+    result_id = "rs_" + hashlib.sha1("|".join(request_ids).encode()).hexdigest()[:16]
+    result_sets.set(result_id, {'request_ids': request_ids, 'offers': offers}, expires_at=expires_at)
+    return result_id
+
+def _present_results(request_ids: List[str], offers: List[Dict], params: OfferFilters,
+                     limit: int, default_sort: Optional[str] = None) -> Dict:
+    """Store the full result set; return its result_id, a summary and the best offers."""
+    compact = collapse_fare_variants(compact_offers(offers))
+    selected = select_offers(compact, params, default_sort)
+    summary = summarize_offers(selected)
+    if len(selected) != len(offers):
+        summary['retrieved'] = len(offers)
+    return {
+        'result_id': _store_result_set(request_ids, compact, earliest_expiry(offers)),
+        'summary': summary,
+        'offers': [offer.to_summary() for offer in selected[:min(params.top_k or RESULT_PAGE_SIZE, limit)]]
+    }
+
+def _retrieval_limit(params: OfferFilters, limit: int) -> int:
+    """Offers to retrieve: more than are shown when filters will discard some.
+
+    With inline retrieval a larger entry already cached for the same request
+    serves smaller limits, so a search repeated without its filters costs no
+    Duffel call.
+    """
+    return SEARCH_SCAN_MAX_OFFERS if params.has_filters() or params.score_weights else limit
+
+def _expand_airports(code: str | List[str]) -> List[str]:
+    """Turn an airport code, city code or list of airport codes into airport codes."""
+    if isinstance(code, list):
+        return list(dict.fromkeys(airport.strip().upper() for airport in code)) or [""]
+    code = code.strip().upper()
+    return list(METRO_AIRPORTS.get(code, [code]))
+
+def _trip_slices(params: FlightSearch, origin: str, destination: str) -> List[Dict]:
+    """Slices for a one-way or round-trip search between two airports."""
+    slices = [_create_slice(origin, destination, params.departure_date,
+                            params.departure_time, params.arrival_time)]
+    if params.type == "round_trip":
+        if not params.return_date:
+            raise ValueError("Return date required for round-trip flights")
+        slices.append(_create_slice(destination, origin, params.return_date,
+                                    params.departure_time, params.arrival_time))
+    return slices
+
+async def _search_airport_pairs(params: FlightSearch, origins: List[str], destinations: List[str],
+                                ctx: Optional[Context] = None) -> str:
+    """Search every origin x destination airport pair concurrently and merge the offers.
+
+    Progress is reported as each pair completes, with the cheapest offer found
+    so far as an early partial result.
+    """
+    # Trim the longer side, dropping its least busy airports, to stay within budget
+    while len(origins) * len(destinations) > FLIGHTS_METRO_MAX_PAIRS:
+        if len(origins) >= len(destinations):
+            origins = origins[:-1]
+        else:
+            destinations = destinations[:-1]
+    pairs = [(origin, destination) for origin in origins for destination in destinations]
+    logger.info(f"Searching {len(pairs)} airport pairs: {pairs}")
+    progress = ToolProgress(ctx, total=len(pairs))
+    cheapest: Optional[Dict] = None
+
+    async def search_pair(client: DuffelClient, origin: str, destination: str) -> Dict:
+        route = f"{origin}-{destination}"
+        try:
+            async with _fan_out_semaphore():
+                response = await _create_offer_request(
+                    client,
+                    slices=_trip_slices(params, origin, destination),
+                    cabin_class=params.cabin_class,
+                    adult_count=params.adults,
+                    max_connections=params.max_connections,
+                    supplier_timeout=30000,
+                    max_offers=_retrieval_limit(params, SEARCH_MAX_OFFERS),
+                    sort_by=params.sort_by
+                )
+        except Exception:
+            await progress.advance(f"{route}: search failed")
+            raise
+        nonlocal cheapest
+        offers = response.get('offers', [])
+        cheapest = _cheapest_offer(offers + ([cheapest] if cheapest else []))
+        so_far = (f"; cheapest so far {cheapest.get('total_amount')} {cheapest.get('total_currency')} "
+                  f"({cheapest.get('id')})" if cheapest else "")
+        await progress.advance(f"{route}: {len(offers)} offers{so_far}")
+        return response
+
+    async with _get_flight_client() as client:
+        results = await asyncio.gather(
+            *(search_pair(client, origin, destination) for origin, destination in pairs),
+            return_exceptions=True
+        )
+
+    request_ids, offers, errors = [], {}, []
+    for (origin, destination), result in zip(pairs, results):
+        if isinstance(result, Exception):
+            logger.error(f"Duffel API error searching {origin}-{destination}: {str(result)}")
+            errors.append({'route': f"{origin}-{destination}", 'message': str(result)})
+            continue
+        request_ids.append(result['request_id'])
+        for offer in result.get('offers', []):
+            offers.setdefault(offer.get('id'), offer)
+
+    if not request_ids:
+        return dumps({
+            "error": "Flight search failed",
+            "message": "; ".join(f"{error['route']}: {error['message']}" for error in errors),
+            "offers": []
+        })
+
+    formatted_response = {
+        'request_ids': request_ids,
+        'airports_searched': {'origins': origins, 'destinations': destinations},
+        **_present_results(request_ids, list(offers.values()), params, SEARCH_MAX_OFFERS, default_sort="price")
+    }
+    if errors:
+        formatted_response['errors'] = errors
+    return dumps(formatted_response)
+
 @mcp.tool()
-async def search_flights(params: FlightSearch) -> str:
+async def search_flights(params: FlightSearch, ctx: Context = None) -> str:
     """Search for flights based on parameters."""
     try:
         slices = []
+        progress = ToolProgress(ctx)
         
         # Build slices based on flight type
-        if params.type == "one_way":
-            slices = [_create_slice(
-                params.origin, 
-                params.destination, 
-                params.departure_date,
-                params.departure_time,
-                params.arrival_time
-            )]
-        elif params.type == "round_trip":
-            if not params.return_date:
-                raise ValueError("Return date required for round-trip flights")
-            slices = [
-                _create_slice(
-                    params.origin,
-                    params.destination,
-                    params.departure_date,
-                    params.departure_time,
-                    params.arrival_time
-                ),
-                _create_slice(
-                    params.destination,
-                    params.origin,
-                    params.return_date,
-                    params.departure_time,
-                    params.arrival_time
-                )
-            ]
+        if params.type in ("one_way", "round_trip"):
+            origins = _expand_airports(params.origin)
+            destinations = _expand_airports(params.destination)
+            if len(origins) * len(destinations) > 1:
+                return await _search_airport_pairs(params, origins, destinations, ctx)
+            slices = _trip_slices(params, origins[0], destinations[0])
         elif params.type == "multi_city":
             if not params.additional_stops:
                 raise ValueError("Additional stops required for multi-city flights")
             
+            if isinstance(params.origin, list) or isinstance(params.destination, list):
+                raise ValueError("Airport lists are only supported for one-way and round-trip flights")
+
             # First leg
             slices.append({
                 "origin": params.origin,
@@ -132,72 +491,39 @@ async def search_flights(params: FlightSearch) -> str:
         # Use async context manager with better error handling
         async with _get_flight_client() as client:
             try:
-                response = await client.create_offer_request(
+                await progress.advance("Searching; airlines have up to 30 s to respond")
+                response = await _create_offer_request(
+                    client,
                     slices=slices,
                     cabin_class=params.cabin_class,
                     adult_count=params.adults,
                     max_connections=params.max_connections,
-                    return_offers=True,
-                    supplier_timeout=30000  # Increased timeout
+                    supplier_timeout=30000,  # Increased timeout
+                    max_offers=_retrieval_limit(params, SEARCH_MAX_OFFERS),
+                    sort_by=params.sort_by,
+                    progress=progress
                 )
             except Exception as api_error:
                 logger.error(f"Duffel API error: {str(api_error)}")
                 # Return a structured error response instead of raising
-                return json.dumps({
+                return dumps({
                     "error": "Flight search failed",
                     "message": str(api_error),
                     "offers": []
-                }, indent=2)
+                })
         
-        # Format the response
+        # Store the full result set and return only a summary and the best offers
+        await progress.advance(f"{len(response.get('offers', []))} offers received; ranking")
         formatted_response = {
             'request_id': response['request_id'],
-            'offers': []
+            **_present_results([response['request_id']], response.get('offers', []), params, SEARCH_MAX_OFFERS)
         }
         
-        # Get all offers (limit to 10 to manage response size)
-        for offer in response.get('offers', [])[:50]:  # Keep the slice to limit offers
-            offer_details = {
-                'offer_id': offer.get('id'),
-                'price': {
-                    'amount': offer.get('total_amount'),
-                    'currency': offer.get('total_currency')
-                },
-                'slices': []
-            }
-            
-            # Only include essential slice details
-            for slice in offer.get('slices', []):
-                segments = slice.get('segments', [])
-                if segments:  # Check if there are any segments
-                    slice_details = {
-                        'origin': slice['origin']['iata_code'],
-                        'destination': slice['destination']['iata_code'],
-                        'departure': segments[0].get('departing_at'),  # First segment departure
-                        'arrival': segments[-1].get('arriving_at'),    # Last segment arrival
-                        'duration': slice.get('duration'),
-                        'carrier': segments[0].get('marketing_carrier', {}).get('name'),
-                        'stops': len(segments) - 1,
-                        'stops_description': 'Non-stop' if len(segments) == 1 else f'{len(segments) - 1} stop{"s" if len(segments) - 1 > 1 else ""}',
-                        'connections': []
-                    }
-                    
-                    # Add connection information if there are multiple segments
-                    if len(segments) > 1:
-                        for i in range(len(segments)-1):
-                            connection = {
-                                'airport': segments[i].get('destination', {}).get('iata_code'),
-                                'arrival': segments[i].get('arriving_at'),
-                                'departure': segments[i+1].get('departing_at'),
-                                'duration': segments[i+1].get('duration')
-                            }
-                            slice_details['connections'].append(connection)
-                    
-                    offer_details['slices'].append(slice_details)
-            
-            formatted_response['offers'].append(offer_details)
+        # More offers can be fetched with get_more_offers
+        if response.get('next_cursor'):
+            formatted_response['next_cursor'] = response['next_cursor']
         
-        return json.dumps(formatted_response, indent=2)
+        return dumps(formatted_response)
             
     except Exception as e:
         logger.error(f"Error searching flights: {str(e)}", exc_info=True)
@@ -209,31 +535,131 @@ async def get_offer_details(params: OfferDetails) -> str:
     try:
         async with _get_flight_client() as client:
             try:
-                response = await client.get_offer(
-                    offer_id=params.offer_id
-                )
-                return json.dumps(response, indent=2)
+                response = await _get_offer(client, params.offer_id, refresh=params.refresh)
+                return dumps(response)
             except Exception as api_error:
                 logger.error(f"Duffel API error getting offer details: {str(api_error)}")
-                return json.dumps({
+                return dumps({
                     "error": "Failed to get offer details",
                     "message": str(api_error),
                     "offer_id": params.offer_id
-                }, indent=2)
+                })
             
     except Exception as e:
         logger.error(f"Error getting offer details: {str(e)}", exc_info=True)
-        return json.dumps({
+        return dumps({
             "error": "System error getting offer details",
             "message": str(e),
             "offer_id": params.offer_id
-        }, indent=2)
+        })
+
+def _summarize_offer_details(offer: Dict) -> Dict:
+    """Reduce a full Duffel offer to what matters when comparing top picks."""
+    summary = _format_offer(offer)
+    summary['expires_at'] = offer.get('expires_at')
+    summary['airline'] = (offer.get('owner') or {}).get('name')
+
+    conditions = offer.get('conditions') or {}
+    summary['conditions'] = {
+        name: {
+            'allowed': (conditions.get(name) or {}).get('allowed'),
+            'penalty': (conditions.get(name) or {}).get('penalty_amount'),
+        }
+        for name in ('refund_before_departure', 'change_before_departure')
+        if conditions.get(name) is not None
+    }
+
+    for slice_summary, slice_data in zip(summary['slices'], [
+        slice_data for slice_data in offer.get('slices', []) if slice_data.get('segments')
+    ]):
+        segments = slice_data['segments']
+        slice_summary['fare_brand'] = slice_data.get('fare_brand_name')
+        slice_summary['flights'] = [
+            f"{(segment.get('marketing_carrier') or {}).get('iata_code', '')}"
+            f"{segment.get('marketing_carrier_flight_number', '')}"
+            for segment in segments
+        ]
+        # Baggage allowance of the first passenger on the first segment
+        passengers = segments[0].get('passengers') or [{}]
+        slice_summary['baggage'] = {
+            baggage.get('type'): baggage.get('quantity')
+            for baggage in passengers[0].get('baggages', [])
+        }
+        slice_summary['cabin'] = passengers[0].get('cabin_class_marketing_name')
+
+    return summary
+
+@mcp.tool()
+async def get_offers_details_batch(params: OfferDetailsBatch) -> str:
+    """Get compact details (conditions, baggage, fare brand, flights) for several offers at once."""
+    offer_ids = list(dict.fromkeys(params.offer_ids))  # Drop duplicates, keep order
+    semaphore = asyncio.Semaphore(params.max_concurrency)
+
+    async def fetch(client: DuffelClient, offer_id: str) -> Dict:
+        async with semaphore:
+            try:
+                response = await _get_offer(client, offer_id, refresh=params.refresh)
+                return {'offer': _summarize_offer_details(response.get('data', {}))}
+            except Exception as api_error:
+                logger.error(f"Duffel API error getting offer {offer_id}: {str(api_error)}")
+                return {'error': {'offer_id': offer_id, 'message': str(api_error)}}
+
+    try:
+        async with _get_flight_client() as client:
+            results = await asyncio.gather(*(fetch(client, offer_id) for offer_id in offer_ids))
+    except Exception as e:
+        logger.error(f"Error getting offer details batch: {str(e)}", exc_info=True)
+        return dumps({
+            "error": "System error getting offer details",
+            "message": str(e),
+            "offer_ids": offer_ids
+        })
+
+    return dumps({
+        'offers': [result['offer'] for result in results if 'offer' in result],
+        'errors': [result['error'] for result in results if 'error' in result]
+    })
+
+@mcp.tool()
+async def get_more_offers(params: OfferPage) -> str:
+    """Get the next page of offers for a search that returned a next_cursor."""
+    try:
+        async with _get_flight_client() as client:
+            try:
+                response = await client.list_offers(
+                    offer_request_id=params.request_id,
+                    sort=_DUFFEL_SORT.get(params.sort_by or "price"),
+                    limit=params.limit,
+                    after=params.cursor,
+                    max_connections=params.max_connections
+                )
+            except Exception as api_error:
+                logger.error(f"Duffel API error listing offers: {str(api_error)}")
+                return dumps({
+                    "error": "Failed to get more offers",
+                    "message": str(api_error),
+                    "offers": []
+                })
+
+        formatted_response = {
+            'request_id': response['request_id'],
+            'offers': [_format_offer(offer) for offer in response.get('offers', [])]
+        }
+        if response.get('next_cursor'):
+            formatted_response['next_cursor'] = response['next_cursor']
+
+        return dumps(formatted_response)
+
+    except Exception as e:
+        logger.error(f"Error getting more offers: {str(e)}", exc_info=True)
+        raise
 
 @mcp.tool(name="search_multi_city")
-async def search_multi_city(params: MultiCityRequest) -> str:
+async def search_multi_city(params: MultiCityRequest, ctx: Context = None) -> str:
     """Search for multi-city flights."""
     try:
         slices = []
+        progress = ToolProgress(ctx)
         for segment in params.segments:
             slices.append(_create_slice(
                 segment.origin,
@@ -246,70 +672,276 @@ async def search_multi_city(params: MultiCityRequest) -> str:
         # Use async context manager with better error handling
         async with _get_flight_client() as client:
             try:
-                response = await client.create_offer_request(
+                await progress.advance(f"Searching {len(slices)} legs; airlines have up to 45 s to respond")
+                response = await _create_offer_request(
+                    client,
                     slices=slices,
                     cabin_class=params.cabin_class,
                     adult_count=params.adults,
                     max_connections=params.max_connections,
-                    return_offers=True,
-                    supplier_timeout=45000  # Increased timeout for multi-city
+                    supplier_timeout=45000,  # Increased timeout for multi-city
+                    max_offers=_retrieval_limit(params, MULTI_CITY_MAX_OFFERS),
+                    sort_by=params.sort_by,
+                    progress=progress
                 )
             except Exception as api_error:
                 logger.error(f"Duffel API error in multi-city search: {str(api_error)}")
-                return json.dumps({
+                return dumps({
                     "error": "Multi-city flight search failed",
                     "message": str(api_error),
                     "offers": []
-                }, indent=2)
+                })
         
             # Format response inside the context
+            await progress.advance(f"{len(response.get('offers', []))} offers received; ranking")
             formatted_response = {
                 'request_id': response['request_id'],
-                'offers': []
+                **_present_results([response['request_id']], response.get('offers', []), params,
+                                   MULTI_CITY_MAX_OFFERS)
             }
             
-            # Process offers inside the context
-            for offer in response.get('offers', [])[:10]:
-                offer_details = {
-                    'offer_id': offer.get('id'),
-                    'price': {
-                        'amount': offer.get('total_amount'),
-                        'currency': offer.get('total_currency')
-                    },
-                    'slices': []
-                }
-                
-                for slice in offer.get('slices', []):
-                    segments = slice.get('segments', [])
-                    if segments:
-                        slice_details = {
-                            'origin': slice['origin']['iata_code'],
-                            'destination': slice['destination']['iata_code'],
-                            'departure': segments[0].get('departing_at'),
-                            'arrival': segments[-1].get('arriving_at'),
-                            'duration': slice.get('duration'),
-                            'carrier': segments[0].get('marketing_carrier', {}).get('name'),
-                            'stops': len(segments) - 1,
-                            'stops_description': 'Non-stop' if len(segments) == 1 else f'{len(segments) - 1} stop{"s" if len(segments) - 1 > 1 else ""}',
-                            'connections': []
-                        }
-                        
-                        if len(segments) > 1:
-                            for i in range(len(segments)-1):
-                                connection = {
-                                    'airport': segments[i].get('destination', {}).get('iata_code'),
-                                    'arrival': segments[i].get('arriving_at'),
-                                    'departure': segments[i+1].get('departing_at'),
-                                    'duration': segments[i+1].get('duration')
-                                }
-                                slice_details['connections'].append(connection)
-                        
-                        offer_details['slices'].append(slice_details)
-                
-                formatted_response['offers'].append(offer_details)
+            if response.get('next_cursor'):
+                formatted_response['next_cursor'] = response['next_cursor']
             
-            return json.dumps(formatted_response, indent=2)
+            return dumps(formatted_response)
             
     except Exception as e:
         logger.error(f"Error searching flights: {str(e)}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
+
+@mcp.tool()
+async def get_price_calendar(params: PriceCalendar, ctx: Context = None) -> str:
+    """Find the cheapest day to fly one way within a window of days around a date."""
+    try:
+        center = date.fromisoformat(params.departure_date)
+    except ValueError as e:
+        return dumps({"error": "Invalid departure date", "message": str(e), "calendar": []})
+
+    today = date.today()
+    days = [
+        center + timedelta(days=offset)
+        for offset in range(-params.flex_days, params.flex_days + 1)
+        if center + timedelta(days=offset) >= today
+    ]
+    progress = ToolProgress(ctx, total=len(days))
+
+    async def search_day(client: DuffelClient, day: date) -> Dict:
+        try:
+            offers = await _fan_out_search(
+                client, [_create_slice(params.origin, params.destination, day.isoformat())],
+                params.cabin_class, params.adults, params.max_connections
+            )
+        except Exception as api_error:
+            logger.error(f"Duffel API error searching {day}: {str(api_error)}")
+            await progress.advance(f"{day}: search failed")
+            return {'date': day.isoformat(), 'error': str(api_error)}
+
+        cheapest = _cheapest_offer(offers)
+        if cheapest is None:
+            await progress.advance(f"{day}: no offers")
+            return {'date': day.isoformat(), 'offers': 0}
+        await progress.advance(f"{day}: from {cheapest.get('total_amount')} {cheapest.get('total_currency')}")
+        # Unpriced offers are never ranked, and a missing duration parses as 0 minutes
+        durations = [offer.duration_minutes for offer in compact_offers(offers)
+                     if offer.price != UNPRICED and offer.duration_minutes]
+        return {
+            'date': day.isoformat(),
+            'price': cheapest.get('total_amount'),
+            'currency': cheapest.get('total_currency'),
+            'offer_id': cheapest.get('id'),
+            'duration': (cheapest.get('slices') or [{}])[0].get('duration'),
+            'shortest_duration_minutes': min(durations, default=None),
+            'offers': len(offers)
+        }
+
+    try:
+        async with _get_flight_client() as client:
+            calendar = await asyncio.gather(*(search_day(client, day) for day in days))
+    except Exception as e:
+        logger.error(f"Error building price calendar: {str(e)}", exc_info=True)
+        return dumps({
+            "error": "System error building price calendar",
+            "message": str(e),
+            "calendar": []
+        })
+
+    priced = [day for day in calendar if 'price' in day]
+    cheapest_day = min(priced, key=lambda day: float(day['price']), default=None)
+    return dumps({
+        'origin': params.origin.upper(),
+        'destination': params.destination.upper(),
+        'cheapest_date': cheapest_day['date'] if cheapest_day else None,
+        'calendar': calendar
+    })
+
+
+@mcp.tool()
+async def get_date_grid(params: DateGrid, ctx: Context = None) -> str:
+    """Compare the cheapest round-trip price for every departure date x return date pair."""
+    try:
+        departures = sorted({date.fromisoformat(day) for day in params.departure_dates})
+        returns = sorted({date.fromisoformat(day) for day in params.return_dates})
+    except ValueError as e:
+        return dumps({"error": "Invalid date", "message": str(e), "prices": []})
+
+    cells = [(out, back) for out in departures for back in returns if back >= out]
+    errors: List[Dict] = []
+    searches = len(departures) + len(returns) if params.mode == "one_way_legs" else len(cells)
+    progress = ToolProgress(ctx, total=searches)
+
+    async def search(client: DuffelClient, label: str, slices: List[Dict]) -> Optional[Dict]:
+        try:
+            offers = await _fan_out_search(
+                client, slices, params.cabin_class, params.adults, params.max_connections
+            )
+        except Exception as api_error:
+            logger.error(f"Duffel API error searching {label}: {str(api_error)}")
+            errors.append({'search': label, 'message': str(api_error)})
+            await progress.advance(f"{label}: search failed")
+            return None
+        cheapest = _cheapest_offer(offers)
+        await progress.advance(f"{label}: from {cheapest.get('total_amount')} {cheapest.get('total_currency')}"
+                               if cheapest else f"{label}: no offers")
+        return cheapest
+
+    def leg(origin: str, destination: str, day: date) -> List[Dict]:
+        return [_create_slice(origin, destination, day.isoformat())]
+
+    try:
+        async with _get_flight_client() as client:
+            if params.mode == "one_way_legs":
+                # N + M one-way searches instead of N x M round trips
+                outbound, inbound = await asyncio.gather(
+                    asyncio.gather(*(search(client, f"{day} outbound", leg(params.origin, params.destination, day))
+                                     for day in departures)),
+                    asyncio.gather(*(search(client, f"{day} return", leg(params.destination, params.origin, day))
+                                     for day in returns)),
+                )
+                outbound = dict(zip(departures, outbound))
+                inbound = dict(zip(returns, inbound))
+                found = {
+                    (out, back): [outbound[out], inbound[back]]
+                    for out, back in cells if outbound[out] and inbound[back]
+                }
+            else:
+                cheapest = await asyncio.gather(*(
+                    search(client, f"{out}/{back}",
+                           leg(params.origin, params.destination, out) + leg(params.destination, params.origin, back))
+                    for out, back in cells
+                ))
+                found = {cell: [offer] for cell, offer in zip(cells, cheapest) if offer}
+    except Exception as e:
+        logger.error(f"Error building date grid: {str(e)}", exc_info=True)
+        return dumps({
+            "error": "System error building date grid",
+            "message": str(e),
+            "prices": []
+        })
+
+    def price(offers: List[Dict]) -> float:
+        return round(sum(float(offer['total_amount']) for offer in offers), 2)
+
+    best = min(found, key=lambda cell: price(found[cell]), default=None)
+    result = {
+        'mode': params.mode,
+        'currency': found[best][0].get('total_currency') if best else None,
+        'departure_dates': [day.isoformat() for day in departures],
+        'return_dates': [day.isoformat() for day in returns],
+        # Rows are departure dates, columns return dates; null where nothing was found
+        'prices': [[price(found[(out, back)]) if (out, back) in found else None for back in returns]
+                   for out in departures],
+        'offer_ids': [[[offer['id'] for offer in found[(out, back)]] if (out, back) in found else None
+                       for back in returns] for out in departures],
+        'cheapest': {
+            'departure_date': best[0].isoformat(),
+            'return_date': best[1].isoformat(),
+            'price': price(found[best]),
+            'offer_ids': [offer['id'] for offer in found[best]]
+        } if best else None
+    }
+    if errors:
+        result['errors'] = errors
+    return dumps(result)
+
+
+def _stored_offers(result_id: str) -> Optional[List[CompactOffer]]:
+    """Offers of a stored result set, or None if it is unknown or has expired."""
+    stored = result_sets.get(result_id)
+    return stored['offers'] if stored is not None else None
+
+@mcp.tool()
+async def query_results(params: ResultQuery) -> str:
+    """Page, filter and sort the offers of an earlier search by its result_id, without searching again."""
+    offers = _stored_offers(params.result_id)
+    if offers is None:
+        return dumps({
+            "error": "Result set not found",
+            "message": "The result_id is unknown or has expired; run the search again",
+            "result_id": params.result_id
+        })
+
+    selected = select_offers(offers, params)
+    if params.top_k:
+        selected = selected[:params.top_k]
+    page = selected[params.offset:params.offset + params.limit]
+    response = {
+        'result_id': params.result_id,
+        'matching': len(selected),
+        'offset': params.offset,
+        'offers': [offer.to_summary() for offer in page]
+    }
+    if params.offset + params.limit < len(selected):
+        response['next_offset'] = params.offset + params.limit
+    return dumps(response)
+
+@mcp.tool()
+async def aggregate_results(params: ResultAggregate) -> str:
+    """Summarize the offers of an earlier search by carrier, stops, departure hour or route."""
+    offers = _stored_offers(params.result_id)
+    if offers is None:
+        return dumps({
+            "error": "Result set not found",
+            "message": "The result_id is unknown or has expired; run the search again",
+            "result_id": params.result_id
+        })
+
+    return dumps({
+        'result_id': params.result_id,
+        'group_by': params.group_by,
+        'groups': aggregate_offers(select_offers(offers, params), params.group_by)
+    })
+
+@mcp.tool()
+async def score_results(params: ResultScore) -> str:
+    """Score the offers of an earlier search by weighted price, duration, stops and departure time, and mark the Pareto-optimal ones."""
+    offers = _stored_offers(params.result_id)
+    if offers is None:
+        return dumps({
+            "error": "Result set not found",
+            "message": "The result_id is unknown or has expired; run the search again",
+            "result_id": params.result_id
+        })
+
+    weights = params.score_weights or ScoreWeights()
+    # Best score first unless sort_by asks otherwise
+    selected = select_offers(offers, params.model_copy(update={'score_weights': weights}))
+    # Scores and the frontier are relative to every matching offer, not just the page
+    scores = score_offers(selected, weights)
+    pareto = pareto_mask(selected, weights.preferred_departure)
+    count = min(params.top_k or params.limit, params.limit)
+
+    return dumps({
+        'result_id': params.result_id,
+        'weights': weights.model_dump(exclude_none=True),
+        'matching': len(selected),
+        'pareto_optimal': sum(pareto),
+        'offers': [
+            {
+                **offer.to_summary(),
+                'score': score,
+                'pareto_optimal': optimal,
+                **score_breakdown(offer, weights.preferred_departure)
+            }
+            for offer, score, optimal in list(zip(selected, scores, pareto))[:count]
+        ]
+    })
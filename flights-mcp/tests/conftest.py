@@ -0,0 +1,47 @@
+"""Shared fixtures for offline tests."""
+
+import logging
+import httpx
+import pytest
+from flights.api import client as client_module
+from flights.api import DuffelClient
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Build a DuffelClient whose HTTP traffic goes to an in-memory handler."""
+    monkeypatch.setattr(client_module, "get_api_token", lambda: "duffel_test_offline")
+
+    def _make(handler, **kwargs):
+        return DuffelClient(logger, transport=httpx.MockTransport(handler), **kwargs)
+
+    return _make
+
+
+def make_offer(index: int, amount: str = "100.00", departing_at: str = "2030-01-10T08:00:00",
+               arriving_at: str = "2030-01-10T11:30:00", duration: str = "PT3H30M",
+               expires_at: str = "2030-01-01T00:00:00Z") -> dict:
+    """Build a minimal Duffel-shaped offer."""
+    return {
+        "id": f"off_{index:04d}",
+        "total_amount": amount,
+        "total_currency": "USD",
+        "expires_at": expires_at,
+        "slices": [{
+            "origin": {"iata_code": "SFO"},
+            "destination": {"iata_code": "JFK"},
+            "duration": duration,
+            "fare_brand_name": "Basic",
+            "segments": [{
+                "origin": {"iata_code": "SFO"},
+                "destination": {"iata_code": "JFK"},
+                "departing_at": departing_at,
+                "arriving_at": arriving_at,
+                "duration": duration,
+                "marketing_carrier": {"name": "Example Air", "iata_code": "EX"},
+                "marketing_carrier_flight_number": str(100 + index),
+            }],
+        }],
+    }
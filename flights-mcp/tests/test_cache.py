@@ -0,0 +1,67 @@
+"""Tests for the in-process TTL/LRU cache."""
+
+from flights.services.cache import TTLCache, earliest_expiry, parse_expires_at
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, max_entries=10, max_bytes=10_000, clock=clock)
+    cache.set("a", {"x": 1})
+    assert cache.get("a") == {"x": 1}
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.stats()["cache.expirations"] == 1
+
+
+def test_explicit_expiry_caps_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=600, max_entries=10, max_bytes=10_000, clock=clock)
+    cache.set("a", [1], expires_at=clock.now + 5)
+    clock.now += 6
+    assert cache.get("a") is None
+
+
+def test_already_expired_values_are_not_stored():
+    clock = FakeClock()
+    cache = TTLCache(ttl=600, max_entries=10, max_bytes=10_000, clock=clock)
+    cache.set("a", [1], expires_at=clock.now - 1)
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entry_count():
+    cache = TTLCache(ttl=60, max_entries=2, max_bytes=10_000)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["cache.evictions"] == 1
+
+
+def test_lru_eviction_by_bytes():
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=25)
+    cache.set("a", "x" * 10)  # 12 bytes as JSON
+    cache.set("b", "y" * 10)
+    cache.set("c", "z" * 10)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] <= 25
+
+
+def test_earliest_expiry_of_offers():
+    offers = [
+        {"expires_at": "2030-01-01T12:00:00Z"},
+        {"expires_at": "2030-01-01T10:00:00.123456Z"},
+        {},
+    ]
+    assert earliest_expiry(offers) == parse_expires_at("2030-01-01T10:00:00.123456Z")
+    assert earliest_expiry([{}]) is None
@@ -0,0 +1,84 @@
+"""Tests for the pooled HTTP client lifecycle."""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from flights.api import client as client_module
+from flights.api import DuffelClient
+
+
+def _offer_request_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(201, json={"data": {"id": "orq_1", "offers": []}})
+
+
+@pytest.mark.asyncio
+async def test_pool_is_shared_across_calls(make_client):
+    """All calls inside the context share one HTTP client."""
+    client = make_client(_offer_request_handler)
+    async with client:
+        first = client._get_http()
+        await client.create_offer_request(slices=[], adult_count=1)
+        await client.create_offer_request(slices=[], adult_count=1)
+        assert client._get_http() is first
+    assert client.metrics.counter("http.requests") == 2
+    assert client.metrics.counter("http.pools_opened") == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_closes_when_outermost_context_exits(make_client):
+    """Nested contexts keep the pool open until the outermost one exits."""
+    client = make_client(_offer_request_handler)
+    async with client:
+        http = client._get_http()
+        async with client:
+            pass
+        assert not http.is_closed
+    assert http.is_closed
+
+
+class _OfferRequestServer(BaseHTTPRequestHandler):
+    """Minimal keep-alive Duffel stand-in."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"data": {"id": "orq_1", "offers": []}}).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """A real HTTP/1.1 server on 127.0.0.1, so connections are actually opened."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OfferRequestServer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_one_real_connection(monkeypatch, local_server):
+    """Sequential calls over a real socket open one connection and reuse it."""
+    monkeypatch.setattr(client_module, "get_api_token", lambda: "duffel_test_offline")
+    client = DuffelClient(logging.getLogger(__name__), http2=False)
+    client.offers.base_url = local_server
+    calls = 5
+    async with client:
+        for _ in range(calls):
+            await client.create_offer_request(slices=[], adult_count=1)
+    assert client.metrics.counter("http.requests") == calls
+    assert client.metrics.counter("http.connections_opened") == 1
+    assert client.metrics.counter("http.connections_reused") == calls - 1
@@ -0,0 +1,72 @@
+"""Tests for the compact offer representation."""
+
+from flights.services.compact import (CompactOffer, collapse_fare_variants, duration_minutes, epoch_minutes,
+                                      expand_fare_variants)
+from .conftest import make_offer
+
+
+def test_durations_and_timestamps_parse_to_minutes():
+    assert duration_minutes("PT5H30M") == 330
+    assert duration_minutes("P1DT2H") == 1560
+    assert duration_minutes(None) == 0
+    assert epoch_minutes("1970-01-02T01:30:00") == 1440 + 90
+    assert epoch_minutes("2030-01-10T08:00:00+01:00") == epoch_minutes("2030-01-10T08:00:00")
+    assert epoch_minutes("not a time") is None
+
+
+def test_offer_fields_are_precomputed_and_summary_matches_the_tool_format():
+    raw = make_offer(7, amount="123.45")
+    first = dict(raw["slices"][0]["segments"][0], destination={"iata_code": "DEN"},
+                 arriving_at="2030-01-10T09:30:00")
+    second = dict(first, origin={"iata_code": "DEN"}, destination={"iata_code": "JFK"},
+                  departing_at="2030-01-10T10:45:00", arriving_at="2030-01-10T11:30:00", duration="PT45M",
+                  marketing_carrier={"name": "Other Air", "iata_code": "OT"})
+    raw["slices"][0]["segments"] = [first, second]
+    raw["slices"].append({"segments": []})  # Slices without flights are ignored
+
+    offer = CompactOffer(raw)
+
+    assert (offer.price, offer.stops, offer.duration_minutes) == (123.45, 1, 210)
+    assert offer.carriers == {"EX", "OT"}
+    assert offer.slices[0].layover_minutes == (75,)
+    assert (offer.max_slice_stops, offer.longest_layover) == (1, 75)
+    assert offer.departs == epoch_minutes("2030-01-10T08:00:00")
+    assert offer.to_summary() == {
+        'offer_id': 'off_0007',
+        'price': {'amount': '123.45', 'currency': 'USD'},
+        'slices': [{
+            'origin': 'SFO',
+            'destination': 'JFK',
+            'departure': '2030-01-10T08:00:00',
+            'arrival': '2030-01-10T11:30:00',
+            'duration': 'PT3H30M',
+            'carrier': 'Example Air',
+            'stops': 1,
+            'stops_description': '1 stop',
+            'connections': [{'airport': 'DEN', 'arrival': '2030-01-10T09:30:00',
+                             'departure': '2030-01-10T10:45:00', 'duration': 'PT45M'}],
+        }],
+    }
+
+
+def _fare(index: int, amount: str, brand: str, flight_number: int = 100) -> CompactOffer:
+    offer = make_offer(index, amount=amount)
+    offer["slices"][0]["fare_brand_name"] = brand
+    offer["slices"][0]["segments"][0]["marketing_carrier_flight_number"] = str(flight_number)
+    return CompactOffer(offer)
+
+
+def test_fares_for_the_same_flights_collapse_into_the_cheapest():
+    main, basic, other, flex = (_fare(1, "180.00", "Main"), _fare(2, "120.00", "Basic"),
+                                _fare(3, "90.00", "Basic", flight_number=200), _fare(4, "260.00", "Flex"))
+
+    collapsed = collapse_fare_variants([main, basic, other, flex])
+
+    assert collapsed == [basic, other]
+    assert basic.fare_variants == (main, flex)
+    summary = basic.to_summary()
+    assert summary["fare_brand"] == "Basic"
+    assert summary["fare_variants"] == [{"offer_id": "off_0001", "amount": "180.00", "fare_brand": "Main"},
+                                        {"offer_id": "off_0004", "amount": "260.00", "fare_brand": "Flex"}]
+    assert "fare_variants" not in other.to_summary()
+    assert expand_fare_variants(collapsed) == [basic, main, flex, other]
@@ -0,0 +1,44 @@
+"""Tests for calling the flight tools without an MCP transport."""
+
+import json
+import httpx
+import pytest
+from flights.inprocess import LOCAL_TOOLS
+from flights.services import search
+from .conftest import make_offer
+
+
+@pytest.fixture
+def duffel(make_client, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        offers = [make_offer(i, amount=f"{200 - i}.00") for i in range(3)]
+        return httpx.Response(201, json={"data": {"id": "orq_local", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_request_cache.clear()
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_local_tools_publish_the_mcp_schemas():
+    published = {tool.name: tool.inputSchema for tool in await search.mcp.list_tools()}
+    assert {tool.name: tool.parameters_schema for tool in LOCAL_TOOLS} == published
+
+
+@pytest.mark.asyncio
+async def test_local_tool_calls_validate_and_run_in_process(duffel):
+    tools = {tool.name: tool for tool in LOCAL_TOOLS}
+    arguments = {"params": {"type": "one_way", "origin": "SFO", "destination": "JFK", "departure_date": "2030-01-10"}}
+
+    result = json.loads(await tools["search_flights"].call(json.dumps(arguments)))
+    assert len(result["offers"]) == 3
+    # Shares the process's caches: the stored result set is queried directly
+    queried = json.loads(await tools["query_results"].call({"params": {"result_id": result["result_id"]}}))
+    assert queried["matching"] == 3
+    assert len(duffel) == 1
+
+    invalid = json.loads(await tools["search_flights"].call({"params": {"type": "one_way"}}))
+    assert invalid["error"] == "Invalid arguments"
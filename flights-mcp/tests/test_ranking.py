@@ -0,0 +1,74 @@
+"""Tests for server-side offer filtering and ranking."""
+
+from flights.models.search import FlightSearch
+from flights.models.time_specs import TimeSpec
+from flights.services.compact import CompactOffer
+from flights.services.ranking import matches, rank_offers
+from .conftest import make_offer
+
+
+def _connecting(index: int, amount: str, layover_minutes: int, carrier: str = "EX") -> CompactOffer:
+    """An offer with one stop in DEN and a layover of the given length."""
+    offer = make_offer(index, amount=amount, departing_at="2030-01-10T18:00:00",
+                       arriving_at="2030-01-11T01:00:00", duration="PT7H")
+    first = dict(offer["slices"][0]["segments"][0], arriving_at="2030-01-10T20:00:00",
+                 destination={"iata_code": "DEN"})
+    departs = 20 * 60 + layover_minutes
+    second = dict(first, origin={"iata_code": "DEN"}, destination={"iata_code": "JFK"},
+                  departing_at=f"2030-01-10T{departs // 60:02d}:{departs % 60:02d}:00",
+                  arriving_at="2030-01-11T01:00:00",
+                  marketing_carrier={"name": "Other", "iata_code": carrier})
+    offer["slices"][0]["segments"] = [first, second]
+    return CompactOffer(offer)
+
+
+def _search(**filters) -> FlightSearch:
+    return FlightSearch(type="one_way", origin="SFO", destination="JFK", departure_date="2030-01-10", **filters)
+
+
+def test_filters_on_stops_carriers_layovers_price_and_windows():
+    nonstop = CompactOffer(make_offer(1, amount="300.00"))
+    short_layover = _connecting(2, "150.00", layover_minutes=45)
+    long_layover = _connecting(3, "120.00", layover_minutes=180, carrier="ZZ")
+
+    assert [matches(o, _search(max_stops=0)) for o in (nonstop, short_layover)] == [True, False]
+    assert not matches(long_layover, _search(max_layover_minutes=120))
+    assert matches(short_layover, _search(max_layover_minutes=120))
+    assert not matches(long_layover, _search(exclude_carriers=["zz"]))
+    assert not matches(long_layover, _search(include_carriers=["EX"]))
+    assert matches(short_layover, _search(include_carriers=["EX"]))
+    assert not matches(nonstop, _search(max_price=200))
+    evening = TimeSpec(from_time="17:00", to_time="23:00")
+    assert [matches(o, _search(departure_window=evening)) for o in (nonstop, short_layover)] == [False, True]
+    overnight = TimeSpec(from_time="22:00", to_time="02:00")
+    assert matches(short_layover, _search(arrival_window=overnight))
+
+
+def test_rank_offers_sorts_then_keeps_top_k():
+    offers = [CompactOffer(make_offer(1, amount="300.00")), _connecting(2, "150.00", 45), _connecting(3, "120.00", 180)]
+
+    by_stops = rank_offers(offers, _search(sort_by="stops"), limit=50)
+    assert [offer.id for offer in by_stops] == ["off_0001", "off_0003", "off_0002"]
+
+    cheapest = rank_offers(offers, _search(sort_by="price", top_k=1, max_layover_minutes=120), limit=50)
+    assert [offer.id for offer in cheapest] == ["off_0002"]
+
+    assert len(rank_offers(offers, _search(top_k=10), limit=2)) == 2
+
+
+def test_offers_without_a_price_are_never_ranked():
+    from flights.services.compact import collapse_fare_variants
+
+    unpriced = CompactOffer(make_offer(1, amount=None))
+    priced = CompactOffer(dict(make_offer(1, amount="300.00"), id="off_0002"))
+    assert unpriced.price == float("inf")
+
+    # Same flights: the priced fare wins the collapse
+    collapsed = collapse_fare_variants([unpriced, priced])
+    assert [offer.id for offer in collapsed] == ["off_0002"]
+
+    other = _connecting(3, "150.00", 45)
+    for params in (_search(sort_by="price"), _search(pareto_only=True),
+                   _search(score_weights={"price": 1.0}), _search(collapse_fares=False)):
+        ranked = rank_offers([unpriced, other], params, limit=50)
+        assert [offer.id for offer in ranked] == ["off_0003"]
@@ -0,0 +1,54 @@
+"""Tests for the shared token-bucket rate limiter."""
+
+import asyncio
+import pytest
+from flights.api.ratelimit import Priority, RateLimitQueueFull, TokenBucketLimiter
+from flights.metrics import Metrics
+
+
+@pytest.mark.asyncio
+async def test_burst_is_served_without_waiting():
+    limiter = TokenBucketLimiter(rate=1, burst=3, max_queue=10, metrics=Metrics())
+    await asyncio.wait_for(asyncio.gather(*(limiter.acquire() for _ in range(3))), timeout=0.1)
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_go_ahead_of_background():
+    limiter = TokenBucketLimiter(rate=50, burst=1, max_queue=10, metrics=Metrics())
+    await limiter.acquire()  # Drain the bucket
+    order = []
+
+    async def call(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    tasks = [asyncio.create_task(call(f"bg{i}", Priority.BACKGROUND)) for i in range(2)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(call("interactive", Priority.INTERACTIVE)))
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+
+    assert order == ["interactive", "bg0", "bg1"]
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded():
+    metrics = Metrics()
+    limiter = TokenBucketLimiter(rate=0.01, burst=1, max_queue=1, metrics=metrics)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(RateLimitQueueFull):
+        await limiter.acquire()
+    assert metrics.snapshot()["gauges"]["ratelimit.queue_depth"] == 1
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert limiter.queue_depth == 0
+    assert metrics.counter("ratelimit.rejected") == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_rate_disables_limiting():
+    limiter = TokenBucketLimiter(rate=0, burst=0, max_queue=0, metrics=Metrics())
+    await asyncio.wait_for(asyncio.gather(*(limiter.acquire() for _ in range(50))), timeout=0.1)
@@ -0,0 +1,160 @@
+"""Tests for retries, retry budgets and circuit breaking."""
+
+import logging
+from datetime import datetime, timezone
+import httpx
+import pytest
+from flights.api.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+    RetryBudget,
+    RetryPolicy,
+    retry_after_seconds,
+)
+from flights.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _resilience(sleeps, **kwargs):
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    return Resilience(logger, Metrics(), sleep=sleep, **kwargs)
+
+
+def _sender(*statuses, headers=None):
+    remaining = list(statuses)
+    calls = []
+
+    async def send():
+        calls.append(1)
+        status = remaining.pop(0)
+        if isinstance(status, Exception):
+            raise status
+        return httpx.Response(status, headers=headers or {})
+
+    return send, calls
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_failures_until_success():
+    sleeps = []
+    resilience = _resilience(sleeps)
+    send, calls = _sender(503, httpx.ConnectError("boom"), 200)
+    response = await resilience.call("get_offer", send)
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    assert resilience.metrics.counter("retry.attempts.get_offer") == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    resilience = _resilience([])
+    send, calls = _sender(422)
+    response = await resilience.call("offer_requests", send)
+    assert response.status_code == 422
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after():
+    sleeps = []
+    resilience = _resilience(sleeps)
+    send, _ = _sender(429, 200, headers={"retry-after": "3"})
+    await resilience.call("list_offers", send)
+    assert sleeps[0] >= 3
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_fails_fast():
+    sleeps = []
+    resilience = _resilience(sleeps, default_policy=RetryPolicy(max_retry_after=5))
+    send, calls = _sender(429, 200, headers={"retry-after": "60"})
+    response = await resilience.call("list_offers", send)
+    assert response.status_code == 429
+    assert len(calls) == 1 and not sleeps
+
+
+@pytest.mark.asyncio
+async def test_read_timeouts_can_be_excluded_from_retries():
+    resilience = _resilience([], policies={"offer_requests": RetryPolicy(retry_read_timeouts=False)})
+    send, calls = _sender(httpx.ReadTimeout("slow"), 200)
+    with pytest.raises(httpx.ReadTimeout):
+        await resilience.call("offer_requests", send)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_limits_retries():
+    resilience = _resilience([], budget_factory=lambda: RetryBudget(max_tokens=1, min_per_second=0))
+    send, calls = _sender(503, 503, 503)
+    response = await resilience.call("get_offer", send)
+    assert response.status_code == 503
+    assert len(calls) == 2
+    assert resilience.metrics.counter("retry.budget_exhausted.get_offer") == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast_then_probes():
+    clock = FakeClock()
+    resilience = _resilience(
+        [],
+        default_policy=RetryPolicy(max_attempts=1),
+        breaker_factory=lambda: CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock),
+    )
+    for _ in range(2):
+        send, _ = _sender(503)
+        await resilience.call("offer_requests", send)
+    assert resilience.states() == {"offer_requests": "open"}
+
+    send, calls = _sender(200)
+    with pytest.raises(CircuitOpenError):
+        await resilience.call("offer_requests", send)
+    assert not calls
+
+    clock.now += 30
+    response = await resilience.call("offer_requests", send)
+    assert response.status_code == 200
+    assert resilience.states() == {"offer_requests": "closed"}
+
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_probe_is_released_for_the_retry():
+    clock = FakeClock()
+    sleeps = []
+    resilience = _resilience(
+        sleeps,
+        default_policy=RetryPolicy(max_attempts=2),
+        breaker_factory=lambda: CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock),
+    )
+    resilience.breaker("list_offers").record_failure()
+    assert resilience.states() == {"list_offers": "open"}
+
+    clock.now += 30
+    send, calls = _sender(429, 200, headers={"retry-after": "1"})
+    response = await resilience.call("list_offers", send)
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert resilience.states() == {"list_offers": "closed"}
+
+def test_retry_after_formats():
+    now = datetime(2030, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert retry_after_seconds(httpx.Response(429, headers={"retry-after": "7"}), now) == 7
+    date = httpx.Response(429, headers={"retry-after": "Tue, 01 Jan 2030 12:00:10 GMT"})
+    assert retry_after_seconds(date, now) == 10
+    duffel = httpx.Response(429, headers={"ratelimit-remaining": "0",
+                                          "ratelimit-reset": "Tue, 01 Jan 2030 12:00:05 GMT"})
+    assert retry_after_seconds(duffel, now) == 5
+    assert retry_after_seconds(httpx.Response(503), now) is None
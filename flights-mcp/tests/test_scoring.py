@@ -0,0 +1,69 @@
+"""Tests for multi-criteria offer scoring and Pareto frontiers."""
+
+import random
+
+import pytest
+from flights.models.scoring import ScoreWeights
+from flights.services import scoring
+from flights.services.compact import CompactOffer
+from .conftest import make_offer
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(scoring, "numpy", None)
+    elif scoring.numpy is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+def _offer(index: int, amount: str, hours: int, departs: str = "08:00") -> CompactOffer:
+    return CompactOffer(make_offer(index, amount=amount, duration=f"PT{hours}H",
+                                   departing_at=f"2030-01-10T{departs}:00"))
+
+
+def test_weights_trade_price_against_duration(backend):
+    cheap_slow, mid, fast_dear = _offer(1, "100.00", 9), _offer(2, "150.00", 5), _offer(3, "300.00", 4)
+    offers = [cheap_slow, mid, fast_dear]
+
+    assert scoring.score_offers(offers, ScoreWeights()) == [1.0, 0.75, 0.0]
+    assert scoring.score_offers(offers, ScoreWeights(price=0, duration=1)) == [0.0, 0.8, 1.0]
+    balanced = scoring.sort_by_score(offers, ScoreWeights(price=1, duration=1))
+    assert balanced[0] is mid
+
+
+def test_departure_preference_wraps_past_midnight(backend):
+    late, early, noon = _offer(1, "100.00", 5, "23:30"), _offer(2, "100.00", 5, "00:30"), _offer(3, "100.00", 5, "12:00")
+    weights = ScoreWeights(price=0, departure_time=1, preferred_departure="00:00")
+
+    scores = scoring.score_offers([late, early, noon], weights)
+    assert scores[0] == scores[1] > scores[2]
+    assert scoring.score_breakdown(late, "00:00")["departure_gap_minutes"] == 30
+    # Without a preferred time the departure weight is ignored
+    assert scoring.score_offers([late, noon], ScoreWeights(price=0, departure_time=1)) == [1.0, 1.0]
+
+
+def test_pareto_front_drops_offers_beaten_on_every_criterion(backend):
+    offers = [_offer(1, "100.00", 9), _offer(2, "150.00", 5), _offer(3, "160.00", 6),
+              _offer(4, "300.00", 4), _offer(5, "150.00", 5)]
+    assert scoring.pareto_mask(offers) == [True, True, False, True, True]  # Duplicates both stay
+
+
+def test_backends_agree_on_random_offers(monkeypatch):
+    generator = random.Random(7)
+    offers = [_offer(i, f"{generator.randint(80, 400)}.00", generator.randint(3, 12),
+                     f"{generator.randint(0, 23):02d}:{generator.choice(['00', '30'])}")
+              for i in range(60)]
+    weights = ScoreWeights(price=2, duration=1, stops=1, departure_time=0.5, preferred_departure="09:00")
+
+    rows = scoring.criteria_rows(offers, "09:00")
+    expected = [not any(all(a <= b for a, b in zip(other, row)) and other != row for other in rows)
+                for row in rows]
+    monkeypatch.setattr(scoring, "numpy", None)
+    assert scoring.pareto_mask(offers, "09:00") == expected
+    python_scores = scoring.score_offers(offers, weights)
+    monkeypatch.undo()
+    if scoring.numpy is not None:
+        assert scoring.pareto_mask(offers, "09:00") == expected
+        assert scoring.score_offers(offers, weights) == python_scores
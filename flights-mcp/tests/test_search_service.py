@@ -0,0 +1,448 @@
+"""Tests for the MCP search tools against an in-memory Duffel."""
+
+import json
+import httpx
+import pytest
+from flights.services import search
+from flights.models.search import FlightSearch
+from flights.models.offers import OfferDetails, OfferPage
+from .conftest import make_offer
+
+
+@pytest.fixture
+def duffel(make_client, monkeypatch):
+    """Point the search tools at an in-memory Duffel and record requests."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        offers = [make_offer(i, amount=f"{200 - i}.00") for i in range(3)]
+        return httpx.Response(201, json={"data": {"id": f"orq_{len(calls)}", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_request_cache.clear()
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_is_served_from_cache(duffel):
+    params = FlightSearch(type="one_way", origin="SFO", destination="JFK", departure_date="2030-01-10")
+    first = json.loads(await search.search_flights(params))
+    lowercase = params.model_copy(update={"origin": "sfo", "destination": "jfk"})
+    second = json.loads(await search.search_flights(lowercase))
+
+    assert len(duffel) == 1
+    assert first == second
+    assert search.offer_request_cache.stats()["cache.hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_paginated_retrieval_fetches_sorted_pages(make_client, monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "POST":
+            assert request.url.params["return_offers"] == "false"
+            return httpx.Response(201, json={"data": {"id": "orq_9", "offers": []}})
+        after = request.url.params.get("after")
+        offers = [make_offer(3), make_offer(4)] if after else [make_offer(1), make_offer(2)]
+        return httpx.Response(200, json={"data": offers, "meta": {"after": None if after else "cur_2", "limit": 2}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    monkeypatch.setattr(search, "DUFFEL_OFFER_RETRIEVAL", "paginated")
+    search.offer_request_cache.clear()
+
+    params = FlightSearch(type="one_way", origin="SFO", destination="JFK",
+                          departure_date="2030-01-10", sort_by="duration")
+    first = json.loads(await search.search_flights(params))
+    assert [offer["offer_id"] for offer in first["offers"]] == ["off_0001", "off_0002"]
+    assert first["next_cursor"] == "cur_2"
+    listed = requests[1].url.params
+    assert listed["sort"] == "total_duration"
+    assert listed["limit"] == str(search.SEARCH_MAX_OFFERS)
+
+    more = json.loads(await search.get_more_offers(OfferPage(request_id="orq_9", cursor="cur_2", limit=2)))
+    assert [offer["offer_id"] for offer in more["offers"]] == ["off_0003", "off_0004"]
+    assert "next_cursor" not in more
+
+
+@pytest.mark.asyncio
+async def test_inline_retrieval_sorts_locally(duffel):
+    params = FlightSearch(type="one_way", origin="SFO", destination="JFK",
+                          departure_date="2030-01-10", sort_by="price")
+    result = json.loads(await search.search_flights(params))
+    amounts = [float(offer["price"]["amount"]) for offer in result["offers"]]
+    assert amounts == sorted(amounts)
+
+
+@pytest.mark.asyncio
+async def test_inline_cache_key_ignores_sort_and_limit(make_client, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        offers = [make_offer(i, amount=f"{200 - i}.00") for i in range(5)]
+        return httpx.Response(201, json={"data": {"id": f"orq_{len(calls)}", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_request_cache.clear()
+    slices = [{"origin": "SFO", "destination": "JFK", "departure_date": "2030-01-10"}]
+
+    def create(max_offers, sort_by=None):
+        return search._create_offer_request(search.flight_client, slices, "economy", 1, None, 15000,
+                                            max_offers, sort_by=sort_by)
+
+    assert len((await create(4))["offers"]) == 4
+    # Fewer offers, or another sort, are served from the same entry
+    assert len((await create(2, sort_by="duration"))["offers"]) == 2
+    assert len(calls) == 1
+    # The entry was cut at four offers, so a request for more goes back to Duffel
+    assert len((await create(10))["offers"]) == 5
+    assert len((await create(4, sort_by="price"))["offers"]) == 4
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_dropping_a_filter_reuses_the_filtered_search(duffel):
+    params = FlightSearch(type="one_way", origin="SFO", destination="JFK", departure_date="2030-01-10")
+    filtered = json.loads(await search.search_flights(params.model_copy(update={"max_price": 198.5})))
+    unfiltered = json.loads(await search.search_flights(params))
+
+    assert len(duffel) == 1
+    assert [offer["price"]["amount"] for offer in filtered["offers"]] == ["198.00"]
+    assert len(unfiltered["offers"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_offer_details_batch_is_concurrent_and_reports_errors(make_client, monkeypatch):
+    import asyncio
+    from flights.models.offers import OfferDetailsBatch
+
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        offer_id = request.url.path.rsplit("/", 1)[-1]
+        if offer_id == "off_missing":
+            return httpx.Response(404, json={"errors": [{"message": "Not found"}]})
+        offer = make_offer(int(offer_id[-1]))
+        offer["conditions"] = {"refund_before_departure": {"allowed": False, "penalty_amount": None}}
+        return httpx.Response(200, json={"data": offer})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_details_cache.clear()
+    params = OfferDetailsBatch(
+        offer_ids=["off_0001", "off_0002", "off_0003", "off_missing", "bad_id", "off_0001"],
+        max_concurrency=2,
+    )
+    result = json.loads(await search.get_offers_details_batch(params))
+
+    assert [offer["offer_id"] for offer in result["offers"]] == ["off_0001", "off_0002", "off_0003"]
+    assert {error["offer_id"] for error in result["errors"]} == {"off_missing", "bad_id"}
+    assert result["offers"][0]["conditions"] == {"refund_before_departure": {"allowed": False, "penalty": None}}
+    assert result["offers"][0]["slices"][0]["flights"] == ["EX101"]
+    assert peak <= 2
+
+
+@pytest.mark.asyncio
+async def test_offer_details_are_cached_until_expiry_or_refresh(make_client, monkeypatch):
+    fetched = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offer_id = request.url.path.rsplit("/", 1)[-1]
+        fetched.append(offer_id)
+        expires_at = "2000-01-01T00:00:00Z" if offer_id == "off_0002" else "2099-01-01T00:00:00Z"
+        return httpx.Response(200, json={"data": make_offer(int(offer_id[-1]), expires_at=expires_at)})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_details_cache.clear()
+
+    first = await search.get_offer_details(OfferDetails(offer_id="off_0001"))
+    assert await search.get_offer_details(OfferDetails(offer_id="off_0001")) == first
+    await search.get_offer_details(OfferDetails(offer_id="off_0001", refresh=True))
+    # An offer that has already expired is never served from the cache
+    await search.get_offer_details(OfferDetails(offer_id="off_0002"))
+    await search.get_offer_details(OfferDetails(offer_id="off_0002"))
+
+    assert fetched == ["off_0001", "off_0001", "off_0002", "off_0002"]
+    assert search.offer_details_cache.stats()["cache.hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_price_calendar_fans_out_under_a_limit_and_shares_the_cache(make_client, monkeypatch):
+    import asyncio
+    from flights.models.calendar import PriceCalendar
+
+    searched = []
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        day = json.loads(request.content)["data"]["slices"][0]["departure_date"]
+        searched.append(day)
+        if day == "2030-01-12":
+            return httpx.Response(201, json={"data": {"id": "orq_empty", "offers": []}})
+        cheap = 80 if day == "2030-01-09" else 150
+        offers = [make_offer(1, amount=f"{cheap}.00", duration="PT5H"), make_offer(2, amount="300.00")]
+        return httpx.Response(201, json={"data": {"id": f"orq_{day}", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    monkeypatch.setattr(search, "DUFFEL_FAN_OUT_CONCURRENCY", 2)
+    search.offer_request_cache.clear()
+
+    params = PriceCalendar(origin="sfo", destination="jfk", departure_date="2030-01-10", flex_days=2)
+    result = json.loads(await search.get_price_calendar(params))
+
+    assert [day["date"] for day in result["calendar"]] == [
+        "2030-01-08", "2030-01-09", "2030-01-10", "2030-01-11", "2030-01-12"
+    ]
+    assert result["cheapest_date"] == "2030-01-09"
+    assert result["calendar"][1] == {
+        "date": "2030-01-09", "price": "80.00", "currency": "USD", "offer_id": "off_0001",
+        "duration": "PT5H", "shortest_duration_minutes": 210, "offers": 2
+    }
+    assert result["calendar"][4] == {"date": "2030-01-12", "offers": 0}
+    assert peak <= 2
+
+    # A follow-up search for one of the days is served from the calendar's cache entry
+    await search.search_flights(FlightSearch(type="one_way", origin="SFO", destination="JFK",
+                                             departure_date="2030-01-09"))
+    assert len(searched) == 5
+
+
+@pytest.mark.asyncio
+async def test_price_calendar_shortest_duration_skips_unpriced_and_unknown_durations(make_client, monkeypatch):
+    from flights.models.calendar import PriceCalendar
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        unpriced = make_offer(1, amount=None, duration="PT1H")
+        no_duration = make_offer(2, amount="90.00")
+        no_duration["slices"][0]["duration"] = None
+        offers = [unpriced, no_duration, make_offer(3, amount="150.00", duration="PT5H")]
+        return httpx.Response(201, json={"data": {"id": "orq_day", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_request_cache.clear()
+
+    params = PriceCalendar(origin="SFO", destination="JFK", departure_date="2030-01-10", flex_days=0)
+    day = json.loads(await search.get_price_calendar(params))["calendar"][0]
+
+    assert day["price"] == "90.00"
+    assert day["shortest_duration_minutes"] == 300
+
+
+@pytest.mark.asyncio
+async def test_date_grid_prices_each_pair_and_shares_one_way_legs(make_client, monkeypatch):
+    from flights.models.calendar import DateGrid
+
+    searched = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        slices = json.loads(request.content)["data"]["slices"]
+        searched.append(tuple((s["origin"], s["departure_date"]) for s in slices))
+        amount = sum(int(s["departure_date"][-2:]) for s in slices) * 10
+        offer = make_offer(len(searched), amount=f"{amount}.00")
+        return httpx.Response(201, json={"data": {"id": f"orq_{len(searched)}", "offers": [offer]}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_request_cache.clear()
+
+    params = DateGrid(origin="SFO", destination="JFK",
+                      departure_dates=["2030-01-11", "2030-01-10"], return_dates=["2030-01-10", "2030-01-15"])
+    grid = json.loads(await search.get_date_grid(params))
+
+    assert len(searched) == 3  # Returning on 01-10 after leaving on 01-11 is skipped
+    assert grid["departure_dates"] == ["2030-01-10", "2030-01-11"]
+    assert grid["prices"] == [[200.0, 250.0], [None, 260.0]]
+    assert grid["cheapest"]["departure_date"] == "2030-01-10"
+    assert grid["cheapest"]["return_date"] == "2030-01-10"
+    assert len(grid["offer_ids"][0][0]) == 1
+
+    searched.clear()
+    legs = json.loads(await search.get_date_grid(params.model_copy(update={"mode": "one_way_legs"})))
+    assert len(searched) == 4  # Two outbound and two return legs
+    assert legs["prices"] == [[200.0, 250.0], [None, 260.0]]
+    assert len(legs["cheapest"]["offer_ids"]) == 2
+
+    searched.clear()
+    await search.get_date_grid(params.model_copy(update={"mode": "one_way_legs"}))
+    assert searched == []
+
+
+@pytest.mark.asyncio
+async def test_metro_codes_expand_into_merged_airport_pair_searches(make_client, monkeypatch):
+    routes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        slices = json.loads(request.content)["data"]["slices"]
+        route = f"{slices[0]['origin']}-{slices[0]['destination']}"
+        routes.append(route)
+        if route == "EWR-LGW":
+            return httpx.Response(400, json={"errors": [{"message": "No route"}]})
+        offers = [make_offer(len(routes) * 10 + i, amount=f"{100 + len(route) * i + len(routes)}.00") for i in range(2)]
+        return httpx.Response(201, json={"data": {"id": f"orq_{route}", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    monkeypatch.setattr(search, "FLIGHTS_METRO_MAX_PAIRS", 4)
+    search.offer_request_cache.clear()
+
+    params = FlightSearch(type="one_way", origin="nyc", destination=["LHR", "LGW", "LHR"],
+                          departure_date="2030-01-10")
+    result = json.loads(await search.search_flights(params))
+
+    # NYC is trimmed to its two busiest airports to stay within four pairs
+    assert sorted(routes) == ["EWR-LGW", "EWR-LHR", "JFK-LGW", "JFK-LHR"]
+    assert result["airports_searched"] == {"origins": ["JFK", "EWR"], "destinations": ["LHR", "LGW"]}
+    assert len(result["request_ids"]) == 3
+    assert result["errors"][0]["route"] == "EWR-LGW"
+    amounts = [float(offer["price"]["amount"]) for offer in result["offers"]]
+    assert len(amounts) == 6 and amounts == sorted(amounts)
+
+
+@pytest.mark.asyncio
+async def test_search_filters_and_ranks_before_formatting(duffel):
+    params = FlightSearch(type="one_way", origin="SFO", destination="JFK", departure_date="2030-01-10",
+                          sort_by="price", max_price=199.5, top_k=1)
+    result = json.loads(await search.search_flights(params))
+    assert [offer["offer_id"] for offer in result["offers"]] == ["off_0002"]
+
+
+@pytest.mark.asyncio
+async def test_result_sets_are_queried_without_searching_again(make_client, monkeypatch):
+    from flights.models.results import ResultAggregate, ResultQuery
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        offers = [make_offer(i, amount=f"{100 + i}.00", departing_at=f"2030-01-10T{6 + i:02d}:00:00")
+                  for i in range(15)]
+        return httpx.Response(201, json={"data": {"id": "orq_sets", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_request_cache.clear()
+    search.result_sets.clear()
+
+    result = json.loads(await search.search_flights(
+        FlightSearch(type="one_way", origin="SFO", destination="JFK", departure_date="2030-01-10")
+    ))
+    assert len(result["offers"]) == search.RESULT_PAGE_SIZE
+    assert result["summary"]["offers"] == 15
+    assert result["summary"]["price"] == {"min": 100.0, "max": 114.0}
+
+    evening = json.loads(await search.query_results(ResultQuery(
+        result_id=result["result_id"], departure_window={"from_time": "17:00", "to_time": "23:59"},
+        sort_by="price", limit=2
+    )))
+    assert evening["matching"] == 4
+    assert [offer["offer_id"] for offer in evening["offers"]] == ["off_0011", "off_0012"]
+    assert evening["next_offset"] == 2
+
+    hours = json.loads(await search.aggregate_results(ResultAggregate(result_id=result["result_id"],
+                                                                      group_by="departure_hour")))
+    assert hours["groups"][0] == {"departure_hour": "06", "offers": 1, "min_price": 100.0,
+                                  "cheapest_offer_id": "off_0000", "shortest_duration_minutes": 210}
+    assert len(calls) == 1
+
+    missing = json.loads(await search.query_results(ResultQuery(result_id="rs_unknown")))
+    assert missing["error"] == "Result set not found"
+
+
+@pytest.mark.asyncio
+async def test_scoring_ranks_searches_and_stored_result_sets(make_client, monkeypatch):
+    from flights.models.results import ResultScore
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offers = [make_offer(1, amount="100.00", duration="PT9H"), make_offer(2, amount="150.00", duration="PT5H"),
+                  make_offer(3, amount="160.00", duration="PT6H"), make_offer(4, amount="300.00", duration="PT4H")]
+        return httpx.Response(201, json={"data": {"id": "orq_scored", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_request_cache.clear()
+    search.result_sets.clear()
+
+    result = json.loads(await search.search_flights(FlightSearch(
+        type="one_way", origin="SFO", destination="JFK", departure_date="2030-01-10",
+        score_weights={"price": 1, "duration": 1}, pareto_only=True
+    )))
+    assert [offer["offer_id"] for offer in result["offers"]] == ["off_0002", "off_0001", "off_0004"]
+    assert result["summary"]["retrieved"] == 4
+
+    scored = json.loads(await search.score_results(ResultScore(result_id=result["result_id"], limit=2)))
+    assert scored["matching"] == 4 and scored["pareto_optimal"] == 3
+    assert [(offer["offer_id"], offer["score"], offer["pareto_optimal"]) for offer in scored["offers"]] == [
+        ("off_0001", 1.0, True), ("off_0002", 0.75, True)
+    ]
+    assert scored["offers"][0]["duration_minutes"] == 540
+
+
+@pytest.mark.asyncio
+async def test_fare_variants_collapse_before_truncation(make_client, monkeypatch):
+    from flights.models.results import ResultQuery
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offers = []
+        for index in range(24):
+            offer = make_offer(index, amount=f"{100 + index}.00")
+            # Three fare brands for each of eight flights
+            offer["slices"][0]["segments"][0]["marketing_carrier_flight_number"] = str(index % 8)
+            offer["slices"][0]["fare_brand_name"] = ["Basic", "Main", "Flex"][index // 8]
+            offers.append(offer)
+        return httpx.Response(201, json={"data": {"id": "orq_fares", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    search.offer_request_cache.clear()
+    search.result_sets.clear()
+
+    result = json.loads(await search.search_flights(FlightSearch(
+        type="one_way", origin="SFO", destination="JFK", departure_date="2030-01-10", sort_by="price"
+    )))
+    assert [offer["offer_id"] for offer in result["offers"]] == [f"off_{i:04d}" for i in range(8)]
+    assert result["summary"] == {**result["summary"], "offers": 8, "retrieved": 24}
+    assert [variant["fare_brand"] for variant in result["offers"][0]["fare_variants"]] == ["Main", "Flex"]
+
+    every_fare = json.loads(await search.query_results(ResultQuery(result_id=result["result_id"],
+                                                                   collapse_fares=False, limit=50)))
+    assert every_fare["matching"] == 24
+
+
+@pytest.mark.asyncio
+async def test_long_searches_report_progress_to_mcp_clients(make_client, monkeypatch):
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offers = [make_offer(i, amount=f"{100 + i}.00") for i in range(60)]
+        return httpx.Response(201, json={"data": {"id": "orq_progress", "offers": offers}})
+
+    monkeypatch.setattr(search, "flight_client", make_client(handler))
+    monkeypatch.setattr(search, "DUFFEL_STREAM_OFFERS", True)
+    search.offer_request_cache.clear()
+
+    updates = []
+
+    async def on_progress(progress, total, message):
+        updates.append((progress, total, message))
+
+    params = {"type": "one_way", "origin": "SFO", "destination": "JFK", "departure_date": "2030-01-10"}
+    async with create_connected_server_and_client_session(search.mcp._mcp_server) as session:
+        result = await session.call_tool("search_flights", {"params": params}, progress_callback=on_progress)
+
+    assert not result.isError
+    # The whole body arrives in one chunk, so the parser jumps straight to its 50-offer limit
+    assert updates == [
+        (1, None, "Searching; airlines have up to 30 s to respond"),
+        (2, None, "Duffel is responding; reading offers"),
+        (3, None, "50 offers received"),
+        (4, None, "50 offers received; ranking"),
+    ]
@@ -0,0 +1,30 @@
+"""Tests for JSON encoding of tool payloads."""
+
+from decimal import Decimal
+
+import pytest
+from flights import serialization
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_dumps_is_compact_by_default(backend):
+    value = {"city": "Zürich", "price": Decimal("12.50"), "flights": ["LX38"]}
+    assert serialization.dumps(value, pretty=False) == '{"city":"Zürich","price":"12.50","flights":["LX38"]}'
+
+
+def test_pretty_output_is_indented(backend):
+    assert serialization.dumps({"a": [1]}, pretty=True) == '{\n  "a": [\n    1\n  ]\n}'
+
+
+def test_loads_accepts_response_bytes(backend):
+    assert serialization.loads('{"data": {"id": "off_1", "name": "Zürich"}}'.encode()) == {
+        "data": {"id": "off_1", "name": "Zürich"}
+    }
@@ -0,0 +1,20 @@
+"""Tests for the server command line."""
+
+import pytest
+from flights import server
+
+
+def test_transport_defaults_to_stdio():
+    args = server.parse_args([])
+    assert (args.transport, args.host, args.port) == ("stdio", "127.0.0.1", 8000)
+
+
+def test_http_transport_flags():
+    args = server.parse_args(["--transport", "streamable-http", "--host", "0.0.0.0", "--port", "9100"])
+    assert (args.transport, args.host, args.port) == ("streamable-http", "0.0.0.0", 9100)
+
+
+def test_invalid_transport_from_the_environment_is_rejected(monkeypatch):
+    monkeypatch.setattr(server, "FLIGHTS_MCP_TRANSPORT", "websocket")
+    with pytest.raises(SystemExit):
+        server.parse_args([])
@@ -0,0 +1,122 @@
+"""Tests for coalescing identical concurrent Duffel calls."""
+
+import asyncio
+import httpx
+import pytest
+from flights.api.singleflight import SingleFlight
+from flights.metrics import Metrics
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_call(make_client):
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await release.wait()
+        return httpx.Response(201, json={"data": {"id": "orq_1", "offers": []}})
+
+    client = make_client(handler)
+    async with client:
+        kwargs = {"slices": [{"origin": "SFO", "destination": "JFK"}], "adult_count": 1}
+        waiters = [asyncio.create_task(client.create_offer_request(**kwargs)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+    assert len(calls) == 1
+    assert all(result["request_id"] == "orq_1" for result in results)
+    assert client.metrics.counter("singleflight.coalesced") == 2
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_waiter():
+    flight = SingleFlight(Metrics())
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise RuntimeError("supplier down")
+
+    waiters = [asyncio.create_task(flight.do("k", failing)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight(Metrics())
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+        return "ok"
+
+    first = asyncio.create_task(flight.do("k", slow))
+    second = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "ok"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_shared_call_is_cancelled_when_all_waiters_leave():
+    metrics = Metrics()
+    flight = SingleFlight(metrics)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow():
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(flight.do("k", slow))
+    await started.wait()
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    assert metrics.counter("singleflight.abandoned") == 1
+
+
+@pytest.mark.asyncio
+async def test_caller_after_abandonment_starts_a_new_call():
+    flight = SingleFlight(Metrics())
+    started = asyncio.Event()
+    unwinding = asyncio.Event()
+    finish_cleanup = asyncio.Event()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        if len(calls) > 1:
+            return "fresh"
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            unwinding.set()
+            await finish_cleanup.wait()  # Cleanup that outlasts the cancellation
+            raise
+
+    waiter = asyncio.create_task(flight.do("k", slow))
+    await started.wait()
+    waiter.cancel()
+    await unwinding.wait()
+
+    assert flight.in_flight == 0
+    assert await flight.do("k", slow) == "fresh"
+    finish_cleanup.set()
+    assert len(calls) == 2
@@ -0,0 +1,98 @@
+"""Tests for incremental parsing of offer request responses."""
+
+import json
+import httpx
+import pytest
+from flights.api.streaming import OfferStreamParser, slim_offer
+from .conftest import make_offer
+
+
+def _body(offers, id_first: bool = True) -> bytes:
+    data = {"id": "orq_123", "offers": offers} if id_first else {"offers": offers, "id": "orq_123"}
+    data["passengers"] = [{"id": "pas_1", "type": "adult"}]
+    return json.dumps({"data": data}, indent=2).encode()
+
+
+def _feed(parser: OfferStreamParser, body: bytes, size: int) -> dict:
+    for start in range(0, len(body), size):
+        parser.feed(body[start:start + size])
+        if parser.done:
+            break
+    return parser.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+@pytest.mark.parametrize("id_first", [True, False])
+def test_parses_all_offers_across_chunk_boundaries(chunk_size, id_first):
+    offers = [make_offer(i) for i in range(5)]
+    result = _feed(OfferStreamParser(), _body(offers, id_first), chunk_size)
+    assert result["request_id"] == "orq_123"
+    assert result["offers"] == [slim_offer(offer) for offer in offers]
+
+
+def test_stops_decoding_past_limit():
+    offers = [make_offer(i) for i in range(20)]
+    body = _body(offers, id_first=True)
+    parser = OfferStreamParser(limit=3)
+    consumed = 0
+    for start in range(0, len(body), 256):
+        parser.feed(body[start:start + 256])
+        consumed = start + 256
+        if parser.done:
+            break
+    result = parser.close()
+    assert [offer["id"] for offer in result["offers"]] == ["off_0000", "off_0001", "off_0002"]
+    assert parser.truncated
+    assert consumed < len(body)
+
+
+def test_truncated_body_is_an_error():
+    body = _body([make_offer(0), make_offer(1)])
+    parser = OfferStreamParser()
+    parser.feed(body[:len(body) // 2])
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+@pytest.mark.asyncio
+async def test_streamed_request_matches_buffered_request(make_client):
+    offers = [make_offer(i) for i in range(8)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(201, content=_body(offers, id_first=False))
+
+    async with make_client(handler) as client:
+        buffered = await client.create_offer_request(slices=[], max_offers=4)
+        streamed = await client.create_offer_request(slices=[], max_offers=4, stream=True)
+
+    assert streamed["request_id"] == buffered["request_id"] == "orq_123"
+    assert streamed["offers"] == [slim_offer(offer) for offer in buffered["offers"]]
+
+
+class _ChunkedBody(httpx.AsyncByteStream):
+    def __init__(self, body: bytes, size: int):
+        self.chunks = [body[start:start + size] for start in range(0, len(body), size)]
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_streamed_request_reports_offers_as_they_arrive(make_client):
+    body = _body([make_offer(i) for i in range(60)])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(201, stream=_ChunkedBody(body, 2048))
+
+    counts = []
+
+    async def on_offers(count: int) -> None:
+        counts.append(count)
+
+    async with make_client(handler) as client:
+        result = await client.create_offer_request(slices=[], stream=True, on_offers=on_offers)
+
+    assert len(result["offers"]) == 60
+    assert counts[0] == 0
+    assert [count // 25 for count in counts[1:]] == [1, 2]
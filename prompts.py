@@ -77,6 +77,7 @@ Your output should be brief and concise - aim for 6-10 sentences.
 
 Respond in valid JSON format with these exact keys:
 "flight_search_brief": "<flight search brief>"
+"search": the same request as flight search parameters (trip type, legs with IATA airport or city codes and YYYY-MM-DD dates, return date, cabin class, adult count, maximum connections and maximum price), or null if it cannot be expressed as one search. Set "complete" to true only if every parameter comes from the user and they only want these flights found and compared; simple requests set this way are searched directly, without the flight agent.
 """
 
 conduct_flight_research_prompt ="""
@@ -99,10 +100,18 @@ CAPABILITIES:
 1. search_flights: Main tool for searching flights
    - Parameters: type, origin, destination, departure_date, return_date (for round-trip), adults, cabin_class, etc.
    - Supports one_way, round_trip, and multi_city flight types
+   - Optional server-side narrowing: sort_by (price, duration, departure_time, stops), top_k, max_stops, max_price, include_carriers/exclude_carriers, departure_window/arrival_window, max_layover_minutes
+   - Optional ranking: score_weights (price, duration, stops, departure_time with preferred_departure) and pareto_only
 2. get_offer_details: Get comprehensive details about a specific flight offer using offer_id
+   - get_offers_details_batch: Get compact details (conditions, baggage, fare brand, flight numbers) for several offer_ids in one call
 3. search_multi_city: Specialized tool for complex multi-city itineraries
-4. think_tool: For thinking and planning
-5. websearch_tool: For searching the web
+4. get_more_offers: Fetch the next page of offers when a search result includes a next_cursor
+5. get_price_calendar: Cheapest price per day for a one-way route within +/- flex_days of a date
+6. get_date_grid: Cheapest round-trip price for every departure date x return date pair
+7. query_results / aggregate_results: Re-filter, re-sort, page or group the offers of an earlier search by its result_id
+8. score_results: Score an earlier search's offers with weights and mark the Pareto-optimal ones (none cheaper AND faster AND with fewer stops)
+9. think_tool: For thinking and planning
+10. websearch_tool: For searching the web
 
 **CRITICAL: Use think_tool after each search to reflect on results and plan next steps**
 
@@ -111,11 +120,18 @@ CAPABILITIES:
 <Instructions>
 - ALWAYS start by using the think_tool to plan your approach
 - IMMEDIATELY use search_flights tool for flight searches - do not ask for permission or confirmation
+- Pass the user's constraints (non-stop, airlines, times, budget) as search_flights filters and set top_k instead of reading through every offer
+- Offers for the same flights are merged into the cheapest fare; other fare brands are listed under fare_variants with their own offer_ids, so mention them when the user asks about upgrades or flexible fares
+- To pick the "best" options, pass score_weights reflecting the user's priorities (e.g. price 2, duration 1) and present the top-scored offers instead of comparing offers yourself
 - Use 3-letter IATA airport codes (e.g., SFO, LAX, JFK, LHR)
+- For cities with several airports, pass the city code (e.g., NYC, LON) or a list of airports as origin/destination in ONE search_flights call instead of searching each airport
 - If you are not sure of airport codes, use websearch_tool to find them quickly
 - For dates, use YYYY-MM-DD format
-- AUTOMATICALLY use get_offer_details for the best flight options found
+- AUTOMATICALLY use get_offers_details_batch ONCE with the offer_ids of your top picks to enrich them (avoid one get_offer_details call per offer)
 - For multi-city trips, DIRECTLY use search_multi_city tool
+- For follow-ups on results you already have ("only nonstops", "anything cheaper in the evening?"), use query_results or aggregate_results with the search's result_id instead of searching again
+- When the user's dates are flexible ("cheapest day that week"), use get_price_calendar ONCE instead of searching each date
+- For round trips with flexible departure and return dates, use get_date_grid ONCE instead of searching each date pair
 - EXECUTE tools autonomously based on the user's request - minimize confirmation prompts
 - Your goal is to run comprehensive searches and present results efficiently
 </Instructions>
@@ -153,6 +169,23 @@ Be friendly, informative, and help users make informed travel decisions.
 
 """
 
+present_flight_results_prompt = """You are a helpful flight search assistant. For context, today's date is {date}.
+
+<Task>
+You will be given a user's flight search brief and the best flight offers already found for it, ranked best first. Present the top 3 to the user.
+Do not search, and do not invent flights, prices or details that are not in the offers.
+</Task>
+
+<Response Formatting>
+- Present flight options in an easy-to-read format, in the order given
+- Include departure/arrival times, duration, price, airline, and stop information
+- Mention any preference from the brief that none of the offers meets
+- Provide offer IDs for flights users might want to explore further
+</Response Formatting>
+
+Be friendly, informative, and brief.
+"""
+
 itinerary_planner_agent_prompt = """
 You are a helpful travel planner assistant. Once the user has decided a location and dates, you help plan the itinerary.
 
@@ -1,7 +1,7 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import List, Dict, Literal, Optional
 import os
 from agents import OpenAIChatCompletionsModel, AsyncOpenAI
 # Load env for local runs
@@ -24,6 +24,7 @@ from prompts import (
     clarify_with_user_instructions,
     transform_messages_into_flight_search_brief_prompt,
 )
+from slot_parser import FlightSlots, parse_flight_slots
 
 def _today_str() -> str:
     return datetime.now().strftime("%a %b %-d, %Y")
@@ -34,8 +35,27 @@ class ClarifyWithUser(BaseModel):
     questions: List[str] = Field(description="A list of questions to ask the user to clarify the report scope")
 
 
+class TripLeg(BaseModel):
+    origin: str = Field(description="Origin IATA airport or city code, e.g. SFO or NYC.")
+    destination: str = Field(description="Destination IATA airport or city code, e.g. JFK or LON.")
+    departure_date: str = Field(description="Departure date (YYYY-MM-DD).")
+
+
+# No field has a default, so the schema stays valid for strict structured outputs
+class StructuredFlightSearch(BaseModel):
+    type: Literal["one_way", "round_trip", "multi_city"] = Field(description="Type of trip.")
+    legs: List[TripLeg] = Field(description="The outbound leg for one-way and round trips, every leg in order for multi-city trips.")
+    return_date: Optional[str] = Field(description="Return date for round trips (YYYY-MM-DD), otherwise null.")
+    cabin_class: Literal["economy", "premium_economy", "business", "first"] = Field(description="Cabin class.")
+    adults: int = Field(description="Number of adult passengers.")
+    max_connections: Optional[int] = Field(description="Maximum connections per leg (0 for non-stop), or null if the user did not limit them.")
+    max_price: Optional[float] = Field(description="Maximum total price the user stated, or null.")
+    complete: bool = Field(description="True only if every field above comes from the user and the request is just to find and compare these flights (no flexible dates, itinerary planning or other open questions).")
+
+
 class FlightSearchBrief(BaseModel):
     flight_search_brief: str = Field(description="A flight search brief that will be used to guide the flight search.")
+    search: Optional[StructuredFlightSearch] = Field(description="The brief as flight search parameters, or null if the request cannot be expressed as one search.")
 
 def _format_messages(messages: List[Dict[str, str]]) -> str:
     lines: List[str] = []
@@ -57,7 +77,18 @@ clarify_agent = Agent(
 )
 
 
+def local_flight_slots(messages: List[Dict[str, str]]) -> FlightSlots:
+    """Flight search details the user has given so far, parsed without a model call."""
+    return parse_flight_slots("\n".join(m.get("content", "") for m in messages if m.get("role", "user") == "user"))
+
+
 async def clarify_with_user(messages: List[Dict[str, str]], session=None) -> ClarifyWithUser:
+    # Nothing to clarify when every slot the search needs is already there
+    slots = local_flight_slots(messages)
+    if slots.is_complete():
+        print(f"⚡ All flight details given ({slots.origin} → {slots.destination}); skipping the clarifier")
+        return ClarifyWithUser(need_clarification=False, questions=[])
+
     message_str=_format_messages(messages)
     result = await Runner.run(clarify_agent, message_str, session=session)
     return result.final_output_as(ClarifyWithUser)
@@ -1,10 +1,18 @@
 import os
+import sys
+import time
+import atexit
 import asyncio
+import threading
 import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
 from dotenv import load_dotenv
-from agents import Agent, Runner, ModelSettings, OpenAIChatCompletionsModel, AsyncOpenAI, function_tool, WebSearchTool, SQLiteSession
-from agents.mcp import MCPServerStdio
+from agents import Agent, Runner, ModelSettings, OpenAIChatCompletionsModel, AsyncOpenAI, function_tool, FunctionTool, WebSearchTool, SQLiteSession
+from agents.mcp import MCPServerStdio, MCPServerStreamableHttp
 from agents.run_context import RunContextWrapper
+from openai.types.responses import ResponseTextDeltaEvent
 from prompts import conduct_flight_research_prompt, itinerary_planner_agent_prompt, summarize_memory_prompt
 from datetime import datetime
 from db import save_session_to_db, load_session_from_db
@@ -17,11 +25,29 @@ from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
 load_dotenv('/Users/pdwivedi/Documents/Projects/flight_agent/.env')
 logfire.configure(token= os.getenv('LOGFIRE_TOKEN'), service_name='flight_search_agent')
 
+# URL of a long-running flights MCP server, started with
+# `flights-mcp --transport streamable-http` (e.g. http://127.0.0.1:8000/mcp).
+# Unset, each search spawns its own stdio server.
+FLIGHTS_MCP_URL = os.getenv('FLIGHTS_MCP_URL')
+
+# How the agent reaches the flight tools: "stdio" (spawn an MCP server per run),
+# "http" (the shared server at FLIGHTS_MCP_URL) or "inprocess" (call the flights
+# package directly as function tools, sharing this process's Duffel client and caches)
+FLIGHTS_TOOL_MODE = os.getenv('FLIGHTS_TOOL_MODE', 'http' if FLIGHTS_MCP_URL else 'stdio').lower()
+if FLIGHTS_TOOL_MODE == 'http' and not FLIGHTS_MCP_URL:
+    raise ValueError("FLIGHTS_TOOL_MODE=http needs FLIGHTS_MCP_URL, the URL of a running flights MCP server "
+                     "(e.g. http://127.0.0.1:8000/mcp); unset FLIGHTS_TOOL_MODE to spawn one over stdio")
+FLIGHTS_MCP_DIR = "/Users/pdwivedi/Documents/Projects/flight_agent/flights-mcp"
+
 # Memory management constants
 MAX_CONTEXT_TOKENS = 250000  # 250K token limit
 SUMMARIZATION_THRESHOLD = 200000  # Start summarizing at 200K tokens
 RECENT_MESSAGES_TO_KEEP = 5  # Keep last 5 messages after summarization
 
+# Agent runtime constants
+MCP_HEALTH_CHECK_INTERVAL = 30  # Ping the MCP connection before a run if it has been idle this many seconds
+MCP_PING_TIMEOUT = 5  # Seconds before a ping counts as failed and the connection is reopened
+
 # Initialize OpenAI model
 gpt_4_1 = OpenAIChatCompletionsModel( 
     model="gpt-4.1",
@@ -249,6 +275,412 @@ async def check_and_summarize_session_memory(session: SQLiteSession, last_result
         return False
 
 
+def flights_mcp_server():
+    """Connect to the shared flights MCP server in http mode, else spawn one over stdio."""
+    if FLIGHTS_TOOL_MODE == 'http':
+        # A long-running server keeps its imports, caches and Duffel connections across runs
+        return MCPServerStreamableHttp(
+            params={
+                "url": FLIGHTS_MCP_URL,
+                "timeout": 10,
+                "sse_read_timeout": 300,
+            },
+            client_session_timeout_seconds=120.0,
+            cache_tools_list=True
+        )
+
+    # The server will use DUFFEL_API_KEY from the current environment
+    return MCPServerStdio(
+        params={
+            "command": "uv",
+            "args": [
+                "--directory", 
+                FLIGHTS_MCP_DIR,
+                "run", 
+                "flights-mcp"
+            ],
+        },
+        # Increase timeout to handle slow Duffel API responses
+        client_session_timeout_seconds=120.0,  # 2 minutes timeout
+        # Cache tools list to reduce repeated MCP queries
+        cache_tools_list=True
+    )
+
+
+def use_flights_package():
+    """Make the flights package under FLIGHTS_MCP_DIR importable in this process."""
+    src = os.path.join(FLIGHTS_MCP_DIR, 'src')
+    if src not in sys.path:
+        sys.path.insert(0, src)
+
+
+def local_flight_tools() -> list:
+    """The flights package's tools as native function tools, for in-process mode."""
+    use_flights_package()
+    from flights.inprocess import LOCAL_TOOLS
+
+    return [
+        FunctionTool(
+            name=tool.name,
+            description=tool.description,
+            params_json_schema=tool.parameters_schema,
+            # Arguments arrive as the same JSON an MCP client would send
+            on_invoke_tool=lambda ctx, arguments, tool=tool: tool.call(arguments),
+            strict_json_schema=False,  # Same as MCP tools; the schemas have optional fields
+        )
+        for tool in LOCAL_TOOLS
+    ]
+
+
+@asynccontextmanager
+async def flight_tools():
+    """Yield the MCP servers and function tools that give the flight agent its flight tools."""
+    if FLIGHTS_TOOL_MODE == 'inprocess':
+        tools = local_flight_tools()
+        from flights.inprocess import client_pool
+
+        # One Duffel connection pool for every tool call of the run
+        async with client_pool():
+            yield [], tools
+    else:
+        async with flights_mcp_server() as flights_server:
+            yield [flights_server], []
+
+
+def build_flight_agent(mcp_servers: list, flights_function_tools: list) -> Agent:
+    """Build the flight agent and the itinerary planner it hands off to."""
+    # Create agents without handoffs first to avoid circular dependency
+    ## Itinerary Planner Agent
+    handoff_instructions_itinerary_planner = f"""{RECOMMENDED_PROMPT_PREFIX}
+    continue chatting with the user but if they want to redo the flight search, handoff to the flight agent.
+    """
+    itinerary_planner_agent = Agent(
+        name="Itinerary Planner Agent",
+        model='gpt-5',
+        model_settings=ModelSettings(reasoning_effort='medium'),
+        instructions=handoff_instructions_itinerary_planner,
+        tools=[think_tool, WebSearchTool()],
+        handoffs=[]  # Will be set after flight_agent is created
+    )
+
+    # Create a flight search agent
+    handoff_instructions_flight_agent = f"""{RECOMMENDED_PROMPT_PREFIX}
+    continue chatting with the user but if they want to plan the itinerary, handoff to the itinerary planner agent.
+    """
+    flight_agent = Agent(
+        name="Flight Search Agent with Duffel MCP",
+        model='gpt-5',
+        model_settings=ModelSettings(reasoning_effort='medium', tool_choice='auto'),
+        instructions=conduct_flight_research_prompt.format(date=_today_str())+handoff_instructions_flight_agent,
+        mcp_servers=mcp_servers,
+        tools=[WebSearchTool(), think_tool, *flights_function_tools],
+        handoffs=[itinerary_planner_agent],  # Can reference itinerary_planner_agent now
+    )
+    
+    # Now set the handoffs for itinerary_planner_agent after flight_agent is created
+    itinerary_planner_agent.handoffs = [flight_agent]
+    return flight_agent
+
+
+@dataclass
+class AgentEvent:
+    """
+    One step of a streamed agent run, in the form the UI renders.
+
+    kind is one of:
+        agent: `agent` started answering
+        tool_started / tool_finished: `text` is the tool name
+        handoff: `text` is the agent handing off, `agent` the one taking over
+        text: `text` is the next piece of the answer
+        final: `text` is the whole answer and `result` the SDK run result
+        error: `text` is the error message
+    """
+    kind: str
+    text: str = ""
+    agent: Optional[str] = None
+    result: Any = None
+
+
+def _agent_event(event, tool_names: dict) -> Optional[AgentEvent]:
+    """Convert an SDK stream event, or return None for the ones the UI does not show."""
+    if event.type == 'raw_response_event':
+        if isinstance(event.data, ResponseTextDeltaEvent):
+            return AgentEvent('text', event.data.delta)
+        return None
+    if event.type == 'agent_updated_stream_event':
+        return AgentEvent('agent', agent=event.new_agent.name)
+
+    item = event.item
+    if event.name == 'tool_called':
+        raw = item.raw_item
+        name = getattr(raw, 'name', None) or getattr(raw, 'type', 'tool')  # Hosted tools (web search) have no name
+        tool_names[getattr(raw, 'call_id', None)] = name
+        return AgentEvent('tool_started', name, agent=item.agent.name)
+    if event.name == 'tool_output':
+        raw = item.raw_item
+        call_id = raw.get('call_id') if isinstance(raw, dict) else getattr(raw, 'call_id', None)
+        return AgentEvent('tool_finished', tool_names.get(call_id, 'tool'), agent=item.agent.name)
+    if event.name == 'handoff_occured':  # Sic, the SDK's spelling
+        return AgentEvent('handoff', item.source_agent.name, agent=item.target_agent.name)
+    return None
+
+
+class FlightAgentRuntime:
+    """
+    Builds the flight agents and connects the flight tools once, then serves every run.
+
+    The connection lives on an event loop in a background thread, because MCP
+    connections belong to the loop that opened them and Streamlit starts a new
+    loop (asyncio.run) for every interaction. Callers on any thread or loop
+    submit runs to it with `run`, and concurrent runs share the connection.
+    An idle connection is pinged before the next run and reopened if the ping fails.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._connect_lock = None  # Created on the runtime's loop when it starts
+        self._connection = None  # Task that holds the flight tools open
+        self._stop = None  # Set to close the connection
+        self._runs = set()  # Runs in flight, cancelled on shutdown
+        self._client_pool = None  # Task that holds the flights package's Duffel pool open for `call`
+        self._client_pool_stop = None
+        self.mcp_servers = []
+        self.flight_agent = None
+        self.last_checked = 0.0
+        self.setup_timings = {}
+
+    def start(self):
+        """Start the background event loop; the connection opens with the first run."""
+        with self._start_lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self.loop.run_forever, name="flight-agent-runtime", daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self._on_loop_start(), self.loop).result()
+
+    async def _on_loop_start(self):
+        # A fresh lock for every loop, so a restarted runtime never shares one with a closed loop
+        self._connect_lock = asyncio.Lock()
+
+    async def _hold_connection(self, ready: asyncio.Future, stop: asyncio.Event):
+        """Keep the flight tools open until `stop` is set (MCP clients must close in the task that opened them)."""
+        try:
+            async with flight_tools() as (mcp_servers, flights_function_tools):
+                for server in mcp_servers:
+                    await server.list_tools()  # Fill the tools cache before the first run
+                ready.set_result((mcp_servers, flights_function_tools))
+                await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"⚠️ Warning: Flight tools connection closed with an error: {str(e)}")
+
+    async def _hold_client_pool(self, ready: asyncio.Future, stop: asyncio.Event):
+        """Keep the flights package's Duffel connection pool open until `stop` is set."""
+        try:
+            use_flights_package()
+            from flights.inprocess import client_pool
+
+            async with client_pool():
+                ready.set_result(None)
+                await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"⚠️ Warning: Duffel connection pool closed with an error: {str(e)}")
+
+    async def _ensure_client_pool(self):
+        async with self._connect_lock:
+            if self._client_pool is not None:
+                return
+            ready = self.loop.create_future()
+            self._client_pool_stop = asyncio.Event()
+            self._client_pool = asyncio.create_task(self._hold_client_pool(ready, self._client_pool_stop))
+            try:
+                await ready
+            except Exception:
+                self._client_pool = None
+                raise
+
+    async def _close_client_pool(self):
+        if self._client_pool is None:
+            return
+        self._client_pool_stop.set()
+        await self._client_pool
+        self._client_pool = None
+
+    async def _connect(self):
+        started = time.perf_counter()
+        ready = self.loop.create_future()
+        self._stop = asyncio.Event()
+        self._connection = asyncio.create_task(self._hold_connection(ready, self._stop))
+        try:
+            mcp_servers, flights_function_tools = await ready
+        except Exception:
+            self._connection = None
+            raise
+        connected = time.perf_counter()
+        self.mcp_servers = mcp_servers
+        self.flight_agent = build_flight_agent(mcp_servers, flights_function_tools)
+        self.last_checked = time.monotonic()
+        self.setup_timings = {
+            'connect': connected - started,
+            'build_agents': time.perf_counter() - connected,
+        }
+        print(f"⏱️ Flight agent runtime ready ({FLIGHTS_TOOL_MODE}): "
+              f"connect {self.setup_timings['connect'] * 1000:.0f} ms, "
+              f"agents {self.setup_timings['build_agents'] * 1000:.1f} ms")
+
+    async def _disconnect(self):
+        if self._connection is None:
+            return
+        self._stop.set()
+        await self._connection
+        self._connection = None
+        self.mcp_servers = []
+        self.flight_agent = None
+
+    async def _healthy(self) -> bool:
+        try:
+            for server in self.mcp_servers:
+                await asyncio.wait_for(server.session.send_ping(), MCP_PING_TIMEOUT)
+            return True
+        except Exception as e:
+            print(f"⚠️ Flight tools connection failed its health check: {str(e)}")
+            return False
+
+    async def _ensure_connected(self) -> float:
+        """Connect on first use, or reconnect after a failed health check; returns the seconds spent."""
+        started = time.perf_counter()
+        async with self._connect_lock:
+            if self.flight_agent is None:
+                await self._connect()
+            elif time.monotonic() - self.last_checked >= MCP_HEALTH_CHECK_INTERVAL:
+                if await self._healthy():
+                    self.last_checked = time.monotonic()
+                else:
+                    await self._disconnect()
+                    await self._connect()
+        return time.perf_counter() - started
+
+    async def _stream(self, query: str, session, max_turns: int, emit):
+        """Run the flight agent, passing each event to `emit`; ends with a 'final' event and `None`."""
+        task = asyncio.current_task()
+        self._runs.add(task)
+        try:
+            setup = await self._ensure_connected()
+            started = time.perf_counter()
+            first_output = None
+            tool_names = {}
+            try:
+                result = Runner.run_streamed(self.flight_agent, query, max_turns=max_turns, session=session)
+                async for sdk_event in result.stream_events():
+                    event = _agent_event(sdk_event, tool_names)
+                    if event is None:
+                        continue
+                    if first_output is None and event.kind != 'agent':
+                        first_output = time.perf_counter() - started
+                    emit(event)
+            except Exception:
+                self.last_checked = 0.0  # Check the connection before the next run
+                raise
+            # What every run used to pay before reaching the model: connecting and building the agents
+            per_run_setup = sum(self.setup_timings.values())
+            first = f"{first_output:.1f} s" if first_output is not None else "none"
+            print(f"⏱️ Latency: setup {setup * 1000:.1f} ms (was {per_run_setup * 1000:.0f} ms per run), "
+                  f"first output {first}, agent run {time.perf_counter() - started:.1f} s")
+            emit(AgentEvent('final', str(result.final_output), agent=result.last_agent.name, result=result))
+            return result
+        finally:
+            self._runs.discard(task)
+            emit(None)
+
+    async def run(self, query: str, session=None, max_turns: int = 30):
+        """Run the flight agent on the runtime's loop; safe to await from any thread or event loop."""
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(self._stream(query, session, max_turns, lambda event: None), self.loop)
+        return await asyncio.wrap_future(future)
+
+    async def run_streamed(self, query: str, session=None, max_turns: int = 30) -> AsyncIterator[AgentEvent]:
+        """Like `run`, but yield the run's events as they happen, ending with a 'final' event."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def emit(event):
+            try:
+                loop.call_soon_threadsafe(events.put_nowait, event)
+            except RuntimeError:
+                pass  # The caller's loop has closed
+
+        future = asyncio.run_coroutine_threadsafe(self._stream(query, session, max_turns, emit), self.loop)
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            await asyncio.wrap_future(future)  # Raise the run's error, if any
+        finally:
+            future.cancel()  # The caller stopped listening
+
+    async def call(self, fn, *args):
+        """
+        Await fn(*args) on the runtime's loop, where the flights package's Duffel client and caches live.
+
+        The call runs inside a Duffel connection pool the runtime keeps open
+        until shutdown, whichever mode the agent reaches its tools in, so
+        direct searches reuse warm connections.
+        """
+        self.start()
+
+        async def pooled():
+            await self._ensure_client_pool()
+            return await fn(*args)
+
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(pooled(), self.loop))
+
+    async def _shutdown(self):
+        for task in self._runs:
+            task.cancel()
+        await asyncio.gather(*self._runs, return_exceptions=True)
+        await self._disconnect()
+        await self._close_client_pool()
+
+    def shutdown(self, timeout: float = 10.0):
+        """Cancel runs in flight, close the flight tools connection and stop the loop thread."""
+        with self._start_lock:
+            if self.loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout)
+            except Exception as e:
+                print(f"⚠️ Warning: Flight agent runtime did not shut down cleanly: {str(e)}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            if not self.loop.is_running():
+                self.loop.close()
+            self.loop = None
+            self._thread = None
+            self._connect_lock = None
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> FlightAgentRuntime:
+    """The process-wide flight agent runtime, shut down when the interpreter exits."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = FlightAgentRuntime()
+            atexit.register(_runtime.shutdown)
+        return _runtime
+
+
 async def search_flights_agent(query: str, session=None):
     """Flight search agent using Duffel MCP server."""
     
@@ -257,74 +689,43 @@ async def search_flights_agent(query: str, session=None):
     print("=" * 60)
     
     try:
-        # Create Flights MCP server using local uv installation
-        # The server will use DUFFEL_API_KEY from the current environment
-        async with MCPServerStdio(
-            params={
-                "command": "uv",
-                "args": [
-                    "--directory", 
-                    "/Users/pdwivedi/Documents/Projects/flight_agent/flights-mcp",
-                    "run", 
-                    "flights-mcp"
-                ],
-            },
-            # Increase timeout to handle slow Duffel API responses
-            client_session_timeout_seconds=120.0,  # 2 minutes timeout
-            # Cache tools list to reduce repeated MCP queries
-            cache_tools_list=True
-        ) as flights_server:
+        # The runtime reuses its agents and flight tools connection across runs
+        print("🤖 Flight Agent initialized. Processing your request...")
+        print("=" * 40)
+        
+        # Run the flight search
+        result = await get_runtime().run(query, session=session, max_turns=30)
+        
+        # Check and manage memory after the run using SDK token tracking
+        if session:
+            await check_and_summarize_session_memory(session, result)
+        
+        print("\n✈️ === Flight Search Results ===")
+        print(result.final_output)
+        
+        return result.final_output
             
-            # Create agents without handoffs first to avoid circular dependency
-            ## Itinerary Planner Agent
-            handoff_instructions_itinerary_planner = f"""{RECOMMENDED_PROMPT_PREFIX}
-            continue chatting with the user but if they want to redo the flight search, handoff to the flight agent.
-            """
-            itinerary_planner_agent = Agent(
-                name="Itinerary Planner Agent",
-                model='gpt-5',
-                model_settings=ModelSettings(reasoning_effort='medium'),
-                instructions=handoff_instructions_itinerary_planner,
-                tools=[think_tool, WebSearchTool()],
-                handoffs=[]  # Will be set after flight_agent is created
-            )
+    except Exception as e:
+        error_msg = f"❌ Error during flight search: {str(e)}"
+        print(error_msg)
+        return error_msg
 
-            # Create a flight search agent
-            handoff_instructions_flight_agent = f"""{RECOMMENDED_PROMPT_PREFIX}
-            continue chatting with the user but if they want to plan the itinerary, handoff to the itinerary planner agent.
-            """
-            flight_agent = Agent(
-                name="Flight Search Agent with Duffel MCP",
-                model='gpt-5',
-                model_settings=ModelSettings(reasoning_effort='medium', tool_choice='auto'),
-                instructions=conduct_flight_research_prompt.format(date=_today_str())+handoff_instructions_flight_agent,
-                mcp_servers=[flights_server],
-                tools=[WebSearchTool(), think_tool],
-                handoffs=[itinerary_planner_agent],  # Can reference itinerary_planner_agent now
-            )
-            
-            # Now set the handoffs for itinerary_planner_agent after flight_agent is created
-            itinerary_planner_agent.handoffs = [flight_agent]
-            
-            print("🤖 Flight Agent initialized. Processing your request...")
-            print("=" * 40)
-            
-            # Run the flight search
-            result = await Runner.run(flight_agent, query, max_turns=30, session=session)
-            
-            # Check and manage memory after the run using SDK token tracking
-            if session:
-                await check_and_summarize_session_memory(session, result)
-            
-            print("\n✈️ === Flight Search Results ===")
-            print(result.final_output)
-            
-            return result.final_output
+async def stream_flights_agent(query: str, session=None) -> AsyncIterator[AgentEvent]:
+    """Flight search agent that yields tool calls, handoffs and answer text as they happen."""
+    print(f"🛫 Searching flights for: {query}")
+    print("=" * 60)
+    
+    try:
+        async for event in get_runtime().run_streamed(query, session=session, max_turns=30):
+            if event.kind == 'final' and session:
+                # Check and manage memory after the run using SDK token tracking
+                await check_and_summarize_session_memory(session, event.result)
+            yield event
             
     except Exception as e:
         error_msg = f"❌ Error during flight search: {str(e)}"
         print(error_msg)
-        return error_msg
+        yield AgentEvent('error', error_msg)
 
 async def main():
     """Main function to run the flight search agent with user input."""
@@ -376,6 +777,25 @@ async def find_flights(query: str, verbose: bool = True, session=None) -> str:
     
     return await search_flights_agent(query, session=session)
 
+# Streaming counterpart of find_flights
+def stream_flights(query: str, verbose: bool = True, session=None) -> AsyncIterator[AgentEvent]:
+    """
+    Programmatic interface for flight search that streams the agent's progress.
+    
+    Args:
+        query: Natural language flight search request
+        verbose: Whether to print progress information
+        session: SQLiteSession for persistent conversation memory
+        
+    Returns:
+        Async iterator of AgentEvents, ending with a 'final' event holding the
+        results (or an 'error' event)
+    """
+    if verbose:
+        print(f"🛫 Searching flights: {query}")
+    
+    return stream_flights_agent(query, session=session)
+
 if __name__ == "__main__":
     try:
         asyncio.run(main())
@@ -385,6 +805,6 @@ if __name__ == "__main__":
         print(f"\n❌ Unexpected error: {e}")
         print("\nTroubleshooting:")
         print("1. Ensure DUFFEL_API_KEY is set in your .env file")
-        print("2. Check that the flights-mcp directory path is correct")
+        print("2. Check that the flights-mcp directory path is correct (or that the server at FLIGHTS_MCP_URL is running)")
         print("3. Verify that 'uv' is installed and the flights-mcp dependencies are set up")
         print("4. Run 'cd flights-mcp && uv sync' to install dependencies")
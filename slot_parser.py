@@ -0,0 +1,339 @@
+"""
+Rule-based parsing of flight search details from user messages.
+
+Finds the slots a flight search needs (origin, destination, dates, trip
+type, passenger count and cabin) with precompiled regular expressions, so
+scoping_agents can skip the clarifier when the user already gave them all.
+The parser prefers leaving a slot empty to guessing: anything it is unsure
+about is left for the clarifier to ask.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+# City names and aliases mapped to IATA city (metro area) or airport codes
+CITY_CODES = {
+    "new york city": "NYC", "new york": "NYC", "nyc": "NYC", "manhattan": "NYC",
+    "san francisco": "SFO", "sf": "SFO", "los angeles": "LAX", "san diego": "SAN", "san jose": "SJC",
+    "seattle": "SEA", "portland": "PDX", "las vegas": "LAS", "phoenix": "PHX", "denver": "DEN",
+    "salt lake city": "SLC", "dallas": "DFW", "houston": "IAH", "austin": "AUS", "chicago": "CHI",
+    "minneapolis": "MSP", "detroit": "DTW", "atlanta": "ATL", "miami": "MIA", "orlando": "MCO",
+    "nashville": "BNA", "new orleans": "MSY", "charlotte": "CLT", "boston": "BOS", "philadelphia": "PHL",
+    "newark": "EWR", "washington dc": "WAS", "washington": "WAS", "honolulu": "HNL", "toronto": "YTO",
+    "vancouver": "YVR",
+    "montreal": "YUL", "mexico city": "MEX", "cancun": "CUN", "london": "LON", "manchester": "MAN",
+    "edinburgh": "EDI", "dublin": "DUB", "paris": "PAR", "amsterdam": "AMS", "brussels": "BRU",
+    "frankfurt": "FRA", "munich": "MUC", "berlin": "BER", "zurich": "ZRH", "vienna": "VIE",
+    "prague": "PRG", "copenhagen": "CPH", "stockholm": "STO", "oslo": "OSL", "madrid": "MAD",
+    "barcelona": "BCN", "lisbon": "LIS", "rome": "ROM", "milan": "MIL", "athens": "ATH",
+    "istanbul": "IST", "moscow": "MOW", "dubai": "DXB", "doha": "DOH", "new delhi": "DEL",
+    "delhi": "DEL", "mumbai": "BOM", "bangalore": "BLR", "bengaluru": "BLR", "singapore": "SIN",
+    "hong kong": "HKG", "bangkok": "BKK", "beijing": "BJS", "shanghai": "PVG", "seoul": "SEL",
+    "tokyo": "TYO", "osaka": "OSA", "sydney": "SYD", "melbourne": "MEL", "auckland": "AKL",
+    "sao paulo": "SAO", "são paulo": "SAO", "rio de janeiro": "RIO", "buenos aires": "BUE",
+}
+
+# Capitalized three-letter words that are not airport codes
+NOT_IATA = {
+    "THE", "AND", "FOR", "ONE", "TWO", "YES", "NOT", "ANY", "ALL", "BUT", "ARE", "CAN", "WHO", "HOW",
+    "USD", "EUR", "GBP", "CAD", "AUD", "JPY", "INR", "MAX", "MIN", "NON", "VIA", "OUT",
+    "FLY", "GET", "NEW", "OUR", "BUY", "SEE", "WAY", "DAY", "PER", "TOP", "LOW", "AIR",
+    "MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN",
+    "JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC",
+}
+
+MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3, "april": 4, "apr": 4,
+    "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7, "august": 8, "aug": 8,
+    "september": 9, "sept": 9, "sep": 9, "october": 10, "oct": 10, "november": 11, "nov": 11,
+    "december": 12, "dec": 12,
+}
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+_NUMBER = r"\d{1,2}|" + "|".join(NUMBER_WORDS)
+_ORDINAL = r"(?:st|nd|rd|th)?"
+
+CITY_PATTERN = re.compile(r"\b(" + "|".join(re.escape(name) for name in sorted(CITY_CODES, key=len, reverse=True)) + r")\b")
+IATA_PATTERN = re.compile(r"\b[A-Z]{3}\b")
+# "from" before a place makes it the origin; "to" (or an arrow or dash) the destination;
+# "in" says where the user will be, which may be where they are now
+ROLE_PATTERN = re.compile(r"(?:\b(from|to|into|in)|(->|→|-|–))\s*$")
+# Places offered as alternatives ("Newark or JFK") fill no slot
+ALTERNATIVE = re.compile(r"\s*(?:,?\s*or|/)\s*")
+
+ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+NUMERIC_DATE = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{4}|\d{2}))?\b")  # US month/day order
+MONTH_DAY = re.compile(
+    r"\b(" + _MONTH + r")\.?\s+(\d{1,2})" + _ORDINAL
+    + r"(?:\s*(?:-|–|to|until|through|thru)\s*(\d{1,2})" + _ORDINAL + r"(?!\s*(?:" + _MONTH + r")\b))?"
+    + r"(?:,?\s+(\d{4}))?\b"
+)
+DAY_MONTH = re.compile(r"\b(\d{1,2})" + _ORDINAL + r"\s+(?:of\s+)?(" + _MONTH + r")\b\.?(?:,?\s+(\d{4}))?")
+RELATIVE_DAY = re.compile(r"\b(day after tomorrow|tomorrow|today|tonight)\b")
+WEEKDAY = re.compile(r"\b(next\s+|this\s+|on\s+)?(" + "|".join(WEEKDAYS) + r")\b")
+IN_DAYS = re.compile(r"\bin\s+(" + _NUMBER + r")\s+(days?|weeks?)\b")
+# "back in 5 days" counts from the departure, not from today
+RETURN_IN = re.compile(
+    r"\b(?:back|home|return(?:ing)?)\s+in\s+(" + _NUMBER + r")\s+(days?|weeks?)\b"
+)
+# A date the user is not sure of: "Nov 3 or 4", "around Nov 3", "the week of Nov 3"
+HEDGE_BEFORE = re.compile(r"\b(?:or|around|about|approximately|roughly|week of|flexible(?:\s+on)?)\s+(?:the\s+)?$")
+HEDGE_AFTER = re.compile(r"\s*,?\s*(?:or\b|give or take\b|flexible\b|\+/-|±)|-?ish\b")
+STAY_LENGTH = re.compile(r"\bfor\s+(" + _NUMBER + r")\s+(days?|nights?|weeks?)\b")
+
+PASSENGERS = re.compile(
+    r"\b(" + _NUMBER + r")\s+(?:adults?|passengers?|people|persons|travell?ers|pax|tickets?|seats?)\b"
+    r"|\b(?:party|group)\s+of\s+(" + _NUMBER + r")\b"
+)
+SOLO = re.compile(r"\b(?:just me|only me|by myself|solo|alone|one person)\b")
+PAIR = re.compile(
+    r"\b(?:me and my|my (?:wife|husband|partner|girlfriend|boyfriend|friend|colleague|mom|dad|mother|father|brother|sister|son|daughter) and i)\b"
+    r"(?:\s+(?:wife|husband|partner|girlfriend|boyfriend|friend|colleague|mom|dad|mother|father|brother|sister)\b)?"
+)
+# Anyone who may travel on a child or infant fare; the clarifier asks about them
+CHILDREN = re.compile(
+    r"\b(?:(?:grand|step)?(?:child|children|kids?|sons?|daughters?)|grand(?:sons?|daughters?)"
+    r"|infants?|bab(?:y|ies)|newborns?|toddlers?|teens?|teenagers?|minors?|nephews?|nieces?"
+    r"|(?:my|our)\s+(?:(?:" + _NUMBER + r")\s+)?(?:boys?|girls?|little ones?|family))\b"
+)
+
+PREMIUM_ECONOMY = re.compile(r"\bpremium[\s-]+economy\b")
+ECONOMY = re.compile(r"(?<!premium\s)(?<!premium-)\b(?:economy|coach)\b")
+# "business" and "first" alone are often the trip's purpose ("in business meetings")
+# or an order ("fly first to Paris"), so they need a cabin noun or "fly business"
+BUSINESS = re.compile(r"\bbusiness[\s-]+(?:class|cabin)\b|\bfly(?:ing)?\s+business\b")
+FIRST = re.compile(r"\bfirst[\s-]+(?:class|cabin)\b")
+CABINS = (("premium_economy", PREMIUM_ECONOMY), ("business", BUSINESS), ("first", FIRST), ("economy", ECONOMY))
+_CABIN = r"(?:premium[\s-]+economy|economy|coach|business|first)(?:[\s-]+class)?"
+# "premium economy or business": offered alternatives need no cabin noun
+CABIN_CHOICE = re.compile(r"\b" + _CABIN + r"\s*(?:,?\s*or|/)\s*" + _CABIN + r"\b")
+
+ONE_WAY = re.compile(r"\bone[\s-]?way\b")
+ROUND_TRIP = re.compile(r"\bround[\s-]?trip\b|\breturn(?:ing)?\b|\bcoming back\b|\bfly(?:ing)? back\b")
+
+
+@dataclass
+class FlightSlots:
+    """Flight search details found in the user's messages; None where not found."""
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    departure_date: Optional[date] = None
+    return_date: Optional[date] = None
+    trip_type: Optional[str] = None  # 'one_way' or 'round_trip'
+    adults: Optional[int] = None
+    cabin_class: Optional[str] = None
+    # Details the one-search slots cannot hold, which the clarifier should handle
+    extra_places: List[str] = field(default_factory=list)
+    has_children: bool = False
+
+    def missing(self) -> List[str]:
+        """Names of the slots the search still needs."""
+        missing = [name for name in ("origin", "destination", "departure_date", "adults", "cabin_class")
+                   if getattr(self, name) is None]
+        if self.trip_type is None:
+            missing.append("trip_type")
+        elif self.trip_type == "round_trip" and self.return_date is None:
+            missing.append("return_date")
+        return missing
+
+    def is_complete(self) -> bool:
+        """Whether every required slot is filled and nothing needs the clarifier."""
+        return not self.missing() and not self.extra_places and not self.has_children
+
+
+def _count(word: str) -> int:
+    return int(word) if word.isdigit() else NUMBER_WORDS[word]
+
+
+def _days(amount: str, unit: str) -> int:
+    return _count(amount) * (7 if unit.startswith("week") else 1)
+
+
+def _places(text: str, lowered: str) -> List[Tuple[int, Tuple[str, ...], Optional[str]]]:
+    """
+    (position, codes, role) of every place mentioned, in order. Alternatives
+    ("Newark or JFK") are one place with several codes and the role of the first.
+    """
+    found = []
+    taken = []
+    for match in CITY_PATTERN.finditer(lowered):
+        found.append((match.start(), match.end(), CITY_CODES[match.group(1)]))
+        taken.append((match.start(), match.end()))
+    for match in IATA_PATTERN.finditer(text):
+        code = match.group(0)
+        if code in NOT_IATA or any(start < match.end() and match.start() < end for start, end in taken):
+            continue
+        found.append((match.start(), match.end(), code))
+    found.sort()
+
+    places = []
+    previous_end = None
+    for start, end, code in found:
+        if places and ALTERNATIVE.fullmatch(lowered, previous_end, start):
+            first, codes, role = places[-1]
+            places[-1] = (first, codes + (code,), role)
+        else:
+            role = ROLE_PATTERN.search(lowered, max(0, start - 8), start)
+            if role:
+                role = {"from": "origin", "in": "in"}.get(role.group(1), "destination")
+            places.append((start, (code,), role))
+        previous_end = end
+    return places
+
+
+def _on_or_after(month: int, day: int, year: Optional[int], earliest: date) -> Optional[date]:
+    """The date, with the year defaulting to the next time it comes round."""
+    try:
+        if year is not None:
+            return date(year if year > 99 else 2000 + year, month, day)
+        candidate = date(earliest.year, month, day)
+        return candidate if candidate >= earliest else date(earliest.year + 1, month, day)
+    except ValueError:
+        return None  # E.g. February 30
+
+
+def _dates(lowered: str, today: date) -> Tuple[List[Tuple[int, date, bool, bool]], Optional[date]]:
+    """
+    (position, date, is calendar date, is hedged) of every date mentioned,
+    plus the end of a range like "Sep 15-22". Relative dates ("tomorrow",
+    "in 3 days") are not calendar dates, and relative returns ("back in 5
+    days") are left to the caller. Hedged dates ("Nov 3 or 4", "around
+    Nov 3") are ones the user is not sure of.
+    """
+    found = []
+    taken = [match.span() for match in RETURN_IN.finditer(lowered)]
+    range_end = None
+
+    def add(match, value, calendar=True):
+        # Past dates are left for the clarifier to ask about
+        if value is None or value < today or any(start < match.end() and match.start() < end for start, end in taken):
+            return
+        taken.append((match.start(), match.end()))
+        hedged = bool(HEDGE_BEFORE.search(lowered, max(0, match.start() - 20), match.start())
+                      or HEDGE_AFTER.match(lowered, match.end()))
+        found.append((match.start(), value, calendar, hedged))
+
+    for match in ISO_DATE.finditer(lowered):
+        year, month, day = (int(group) for group in match.groups())
+        add(match, _on_or_after(month, day, year, today))
+    for match in MONTH_DAY.finditer(lowered):
+        month, day, end_day, year = match.groups()
+        start = _on_or_after(MONTHS[month], int(day), int(year) if year else None, today)
+        add(match, start)
+        if start and end_day:
+            end = _on_or_after(MONTHS[month], int(end_day), start.year, today)
+            if end and end <= start:
+                end = _on_or_after(MONTHS[month] % 12 + 1, int(end_day), start.year + (MONTHS[month] == 12), today)
+            range_end = end
+    for match in DAY_MONTH.finditer(lowered):
+        day, month, year = match.groups()
+        add(match, _on_or_after(MONTHS[month], int(day), int(year) if year else None, today))
+    for match in NUMERIC_DATE.finditer(lowered):
+        month, day, year = match.groups()
+        if 1 <= int(month) <= 12:
+            add(match, _on_or_after(int(month), int(day), int(year) if year else None, today))
+    for match in RELATIVE_DAY.finditer(lowered):
+        offset = {"today": 0, "tonight": 0, "tomorrow": 1, "day after tomorrow": 2}[match.group(1)]
+        add(match, today + timedelta(days=offset), calendar=False)
+    for match in WEEKDAY.finditer(lowered):
+        ahead = (WEEKDAYS.index(match.group(2)) - today.weekday()) % 7 or 7  # Next occurrence after today
+        add(match, today + timedelta(days=ahead), calendar=False)
+    for match in IN_DAYS.finditer(lowered):
+        amount, unit = match.groups()
+        add(match, today + timedelta(days=_days(amount, unit)), calendar=False)
+
+    found.sort()
+    return found, range_end
+
+
+def parse_flight_slots(text: str, today: Optional[date] = None) -> FlightSlots:
+    """
+    Parse flight search details from free text.
+
+    Args:
+        text: The user's messages
+        today: Date relative dates are resolved against (defaults to today)
+
+    Returns:
+        FlightSlots with every detail that could be read unambiguously
+    """
+    today = today or date.today()
+    lowered = text.lower()
+    slots = FlightSlots()
+
+    # Places: "from"/"to" decide the role, otherwise the first is the origin.
+    # Alternatives take their slot but leave it empty.
+    places = _places(text, lowered)
+    origin = destination = None
+    for _, codes, role in places:
+        if role == "origin" and origin is None and codes != destination:
+            origin = codes
+        elif role == "destination" and destination is None and codes != origin:
+            destination = codes
+    for _, codes, role in places:
+        if role == "in" or codes in (origin, destination):
+            continue
+        if origin is None and role != "destination":
+            origin = codes
+        elif destination is None and role != "origin":
+            destination = codes
+        else:
+            slots.extra_places.extend(code for code in codes if code not in slots.extra_places)
+    # Where the user will be ("in Miami") is the destination only once the origin is known
+    for _, codes, role in places:
+        if role == "in" and origin is not None and destination is None and codes != origin:
+            destination = codes
+    slots.origin = origin[0] if origin and len(origin) == 1 else None
+    slots.destination = destination[0] if destination and len(destination) == 1 else None
+
+    # Dates: the first is the departure, a later one (or a range's end or a stay length) the
+    # return. Hedged dates are left for the clarifier to pin down.
+    dates, range_end = _dates(lowered, today)
+    if dates and not dates[0][3]:
+        slots.departure_date = dates[0][1]
+    relative_return = RETURN_IN.search(lowered)
+    # On a multi-city trip later dates belong to the other legs, not a return
+    if slots.departure_date and not slots.extra_places:
+        later = [(value, hedged) for _, value, _, hedged in dates[1:] if value > slots.departure_date]
+        stay = STAY_LENGTH.search(lowered)
+        if relative_return:
+            # Counted from a calendar departure date; after "tomorrow" or with a
+            # second date it could as well count from today, so it is left empty
+            if dates[0][2] and len(dates) == 1 and not range_end:
+                slots.return_date = slots.departure_date + timedelta(days=_days(*relative_return.groups()))
+        elif range_end:
+            slots.return_date = range_end
+        elif later:
+            slots.return_date = None if later[0][1] else later[0][0]
+        elif stay:
+            slots.return_date = slots.departure_date + timedelta(days=_days(*stay.groups()))
+
+    if ONE_WAY.search(lowered):
+        slots.trip_type = "one_way"
+        slots.return_date = None
+    elif not slots.extra_places and (slots.return_date is not None or relative_return or ROUND_TRIP.search(lowered)):
+        slots.trip_type = "round_trip"
+
+    # Passengers
+    passengers = PASSENGERS.search(lowered)
+    if passengers:
+        slots.adults = _count(passengers.group(1) or passengers.group(2))
+    elif PAIR.search(lowered):
+        slots.adults = 2
+    elif SOLO.search(lowered):
+        slots.adults = 1
+    slots.has_children = bool(CHILDREN.search(lowered))
+
+    # Cabin; a choice between cabins ("premium economy or business") is left for the clarifier
+    cabins = [cabin for cabin, pattern in CABINS if pattern.search(lowered)]
+    if len(cabins) == 1 and not CABIN_CHOICE.search(lowered):
+        slots.cabin_class = cabins[0]
+
+    return slots
@@ -6,8 +6,9 @@ import uuid
 
 load_dotenv('/Users/pdwivedi/Documents/Projects/flight_agent/.env')
 
-from scoping_agents import clarify_with_user, write_flight_search_brief
-from single_agent_mcp import find_flights, search_flights_agent
+from scoping_agents import clarify_with_user, write_flight_search_brief, FlightSearchBrief, StructuredFlightSearch
+from single_agent_mcp import stream_flights
+from fast_path import stream_flights_from_brief
 from agents import SQLiteSession
 from db import (
     save_session_to_db, 
@@ -17,7 +18,7 @@ from db import (
     update_session_title
 )
 # Agent routing function
-async def route_to_agent(query: str, current_agent: str, session):
+def route_to_agent(query: str, current_agent: str, session):
     """
     Route the query to the appropriate agent based on current agent state.
     
@@ -27,7 +28,7 @@ async def route_to_agent(query: str, current_agent: str, session):
         session: SQLiteSession
         
     Returns:
-        Agent response
+        Async iterator of the agent's streamed events
     """
     print(f"🎯 Routing to agent: {current_agent}")
     
@@ -35,10 +36,58 @@ async def route_to_agent(query: str, current_agent: str, session):
         # For now, we'll use the flight agent function but with itinerary context
         # In the future, you might want to create a separate itinerary agent function
         itinerary_context = f"[ITINERARY PLANNING MODE] {query}\n\nNote: You are now in itinerary planning mode. Focus on helping the user plan their trip itinerary, activities, and travel arrangements."
-        return await find_flights(itinerary_context, verbose=False, session=session)
+        return stream_flights(itinerary_context, verbose=False, session=session)
     else:
         # Default to flight agent
-        return await find_flights(query, verbose=False, session=session)
+        return stream_flights(query, verbose=False, session=session)
+
+def ui_agent_name(agent_name: str) -> str:
+    """Map an SDK agent name to the name the UI uses for it."""
+    return "Itinerary Planner Agent" if "Itinerary" in agent_name else "Flight Search Agent"
+
+async def render_agent_stream(events, status, answer):
+    """
+    Render a streamed agent run live: tool calls and handoffs go into the
+    `status` container, the answer is written into `answer` as it arrives.
+    
+    Args:
+        events: Async iterator of AgentEvents from stream_flights
+        status: st.status container
+        answer: st.empty placeholder
+        
+    Returns:
+        Tuple of (final answer text, handoff info or None)
+    """
+    text = ""
+    final_text = ""
+    handoff_info = None
+    failed = False
+    async for event in events:
+        if event.kind == "tool_started":
+            status.update(label=f"🔧 Running {event.text}...")
+            status.write(f"🔧 {event.text}")
+        elif event.kind == "tool_finished":
+            status.write(f"✅ {event.text} finished")
+        elif event.kind == "handoff":
+            handoff_info = {
+                "type": "handoff",
+                "from_agent": ui_agent_name(event.text),
+                "to_agent": ui_agent_name(event.agent),
+                "indicator": "handoff event"
+            }
+            status.write(f"🔄 Handoff: {handoff_info['from_agent']} → {handoff_info['to_agent']}")
+        elif event.kind == "text":
+            text += event.text
+            answer.markdown(text + "▌")
+        elif event.kind in ("final", "error"):
+            final_text = event.text
+            failed = event.kind == "error"
+    
+    if failed:
+        status.update(label="❌ Search failed", state="error", expanded=False)
+    else:
+        status.update(label="✅ Done", state="complete", expanded=False)
+    return final_text, handoff_info
 
 # Simple token estimation for UI display (rough approximation)
 def estimate_tokens_for_session(session_data: dict) -> int:
@@ -319,6 +368,8 @@ if "current_questions" not in st.session_state:
     st.session_state.current_questions = []
 if "research_brief" not in st.session_state:
     st.session_state.research_brief = None
+if "brief_search" not in st.session_state:
+    st.session_state.brief_search = None  # Structured search from the brief, for the fast path
 if "research_results" not in st.session_state:
     st.session_state.research_results = None
 if "conducting_research" not in st.session_state:
@@ -360,7 +411,7 @@ with tab1:
             st.session_state.sqlite_session = SQLiteSession(new_session_id)
             
             # Reset all session state for new search
-            for key in ['messages', 'waiting_for_answers', 'current_questions', 'research_brief', 
+            for key in ['messages', 'waiting_for_answers', 'current_questions', 'research_brief', 'brief_search',
                        'flight_results', 'chat_messages', 'chat_mode', 'processing_chat']:
                 if key in st.session_state:
                     del st.session_state[key]
@@ -419,6 +470,10 @@ with tab2:
                             st.session_state.step = session_data['step']
                             st.session_state.messages = session_data['messages']
                             st.session_state.research_brief = session_data['research_brief']
+                            brief_search = session_data.get('brief_search')
+                            st.session_state.brief_search = (
+                                StructuredFlightSearch.model_validate(brief_search) if brief_search else None
+                            )
                             st.session_state.flight_results = session_data['flight_results']
                             st.session_state.chat_messages = session_data['chat_messages']
                             st.session_state.initial_handoff = session_data.get('initial_handoff', None)
@@ -530,10 +585,12 @@ if st.session_state.error_message:
 # Auto-save session data function
 def save_current_session():
     if st.session_state.current_session_id:
+        brief_search = st.session_state.get('brief_search')
         session_data = {
             'step': st.session_state.step,
             'messages': st.session_state.get('messages', []),
             'research_brief': st.session_state.get('research_brief', ''),
+            'brief_search': brief_search.model_dump() if brief_search else None,
             'flight_results': st.session_state.get('flight_results', ''),
             'chat_messages': st.session_state.get('chat_messages', []),
             'initial_handoff': st.session_state.get('initial_handoff', None),
@@ -607,6 +664,7 @@ if st.session_state.current_session_id:
                     research_brief = asyncio.run(generate_brief())
                 
                 st.session_state.research_brief = research_brief.flight_search_brief
+                st.session_state.brief_search = research_brief.search
                 st.session_state.step = "brief_generated"
                 save_current_session()
                 st.rerun()
@@ -667,7 +725,7 @@ if st.session_state.current_session_id:
         with col2:
             if st.button("🔄 Start Over"):
                 # Reset everything
-                for key in ['messages', 'waiting_for_answers', 'current_questions', 'research_brief', 
+                for key in ['messages', 'waiting_for_answers', 'current_questions', 'research_brief', 'brief_search',
                            'flight_results', 'chat_messages', 'chat_mode', 'processing_chat']:
                     if key in st.session_state:
                         del st.session_state[key]
@@ -678,14 +736,24 @@ if st.session_state.current_session_id:
     # Flight searching
     elif st.session_state.step == "searching":
         try:
-            with st.spinner("✈️ Contacting Duffel API and searching for flights..."):
+            # Show tool calls and the answer as they stream in
+            with st.status("✈️ Contacting Duffel API and searching for flights...", expanded=True) as status:
+                live_answer = st.empty()
+                
                 async def run_flights():
-                    return await find_flights(st.session_state.research_brief, verbose=False, session=st.session_state.sqlite_session)
+                    # Simple briefs are searched directly; the rest go to the flight agent
+                    brief = FlightSearchBrief(
+                        flight_search_brief=st.session_state.research_brief,
+                        search=st.session_state.get('brief_search')
+                    )
+                    events = stream_flights_from_brief(brief, session=st.session_state.sqlite_session,
+                                                       session_id=st.session_state.current_session_id)
+                    return await render_agent_stream(events, status, live_answer)
                 
-                flight_results = asyncio.run(run_flights())
+                flight_results, handoff_info = asyncio.run(run_flights())
                 
                 # Check for handoffs in initial flight search
-                handoff_info = detect_handoff(flight_results)
+                handoff_info = handoff_info or detect_handoff(flight_results)
                 if handoff_info:
                     st.session_state.initial_handoff = handoff_info
                     st.session_state.last_handoff = handoff_info
@@ -758,7 +826,7 @@ if st.session_state.current_session_id:
         with col3:
             if st.button("🔄 New Search", help="Start a completely new flight search"):
                 # Reset everything
-                for key in ['messages', 'waiting_for_answers', 'current_questions', 'research_brief', 
+                for key in ['messages', 'waiting_for_answers', 'current_questions', 'research_brief', 'brief_search',
                            'flight_results', 'chat_messages', 'chat_mode', 'processing_chat']:
                     if key in st.session_state:
                         del st.session_state[key]
@@ -825,7 +893,7 @@ if st.session_state.current_session_id:
         # Process chat message asynchronously
         if st.session_state.get("processing_chat", False):
             try:
-                with st.spinner("🤖 Flight agent is thinking..."):
+                with st.chat_message("assistant", avatar="🤖"):
                     # Build conversation context
                     conversation_context = f"""
                     Original Search Brief: {st.session_state.research_brief}
@@ -849,15 +917,20 @@ if st.session_state.current_session_id:
                     # Create focused query
                     full_query = f"{conversation_context}\n\nLatest User Question: {latest_message}\n\nPlease respond helpfully to the user's question about their flight search."
                     
+                    # Stream the reply into the chat while the agent works
+                    status = st.status("🤖 Flight agent is thinking...", expanded=False)
+                    live_answer = st.empty()
+                    
                     # Run async function with SQLiteSession, routing to correct agent
                     async def run_chat():
                         # Use the SQLiteSession for persistent conversation and route to correct agent
-                        return await route_to_agent(full_query, st.session_state.current_agent, st.session_state.sqlite_session)
+                        events = route_to_agent(full_query, st.session_state.current_agent, st.session_state.sqlite_session)
+                        return await render_agent_stream(events, status, live_answer)
                     
-                    agent_response = asyncio.run(run_chat())
+                    agent_response, handoff_info = asyncio.run(run_chat())
                     
                     # Check for handoffs in the response
-                    handoff_info = detect_handoff(agent_response)
+                    handoff_info = handoff_info or detect_handoff(agent_response)
                     
                     # Update current agent if handoff detected
                     if handoff_info:
@@ -914,7 +987,7 @@ if st.session_state.current_session_id:
         with col3:
             if st.button("🔄 New Search", help="Start a new flight search"):
                 # Reset everything
-                for key in ['messages', 'waiting_for_answers', 'current_questions', 'research_brief', 
+                for key in ['messages', 'waiting_for_answers', 'current_questions', 'research_brief', 'brief_search',
                            'flight_results', 'chat_messages', 'chat_mode', 'processing_chat']:
                     if key in st.session_state:
                         del st.session_state[key]
@@ -0,0 +1,178 @@
+"""
+Tests for the flight agent runtime against fake flight tools and a fake agent run.
+
+The runtime should open the flight tools once and share them across runs,
+reopen them when a health check fails, stream a run's events in order
+(raising a run's error to the listener), keep one Duffel pool open for
+direct calls, and start again cleanly after a shutdown.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("agents")
+pytest.importorskip("logfire")
+
+import single_agent_mcp
+from single_agent_mcp import FlightAgentRuntime
+
+
+class FakeServer:
+    """An MCP server whose pings fail once it is marked unhealthy."""
+
+    def __init__(self):
+        self.healthy = True
+        self.session = SimpleNamespace(send_ping=self.send_ping)
+
+    async def list_tools(self):
+        return []
+
+    async def send_ping(self):
+        if not self.healthy:
+            raise ConnectionError("server went away")
+
+
+class FakeRun:
+    """A streamed run that calls one tool, then answers (or fails if asked to)."""
+
+    def __init__(self, agent, query):
+        self.agent = agent
+        self.query = query
+        self.final_output = f"answer to {query}"
+        self.last_agent = agent
+
+    async def stream_events(self):
+        agent = self.agent
+        yield SimpleNamespace(type='agent_updated_stream_event', new_agent=agent)
+        if self.query == "fail":
+            raise RuntimeError("model error")
+        tool_call = SimpleNamespace(name='search_flights', call_id='call_1')
+        yield SimpleNamespace(type='run_item_stream_event', name='tool_called',
+                              item=SimpleNamespace(agent=agent, raw_item=tool_call))
+        await asyncio.sleep(0)
+        yield SimpleNamespace(type='run_item_stream_event', name='tool_output',
+                              item=SimpleNamespace(agent=agent, raw_item={'call_id': 'call_1'}))
+
+
+@pytest.fixture
+def tools(monkeypatch):
+    """Fake flight tools and agent run, recording every connection opened and closed."""
+    opened, closed = [], []
+
+    @asynccontextmanager
+    async def flight_tools():
+        server = FakeServer()
+        opened.append(server)
+        try:
+            yield [server], []
+        finally:
+            closed.append(server)
+
+    monkeypatch.setattr(single_agent_mcp, "flight_tools", flight_tools)
+    monkeypatch.setattr(single_agent_mcp, "build_flight_agent",
+                        lambda mcp_servers, flights_function_tools: SimpleNamespace(name="Flight Agent"))
+    monkeypatch.setattr(single_agent_mcp, "Runner",
+                        SimpleNamespace(run_streamed=lambda agent, query, **kwargs: FakeRun(agent, query)))
+    return SimpleNamespace(opened=opened, closed=closed)
+
+
+@pytest.fixture
+def runtime(tools):
+    runtime = FlightAgentRuntime()
+    yield runtime
+    runtime.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_runs_share_one_connection(runtime, tools):
+    first = await runtime.run("SFO to JFK")
+    second = await runtime.run("JFK to SFO")
+
+    assert [first.final_output, second.final_output] == ["answer to SFO to JFK", "answer to JFK to SFO"]
+    assert len(tools.opened) == 1
+    assert not tools.closed
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_a_failed_ping(runtime, tools):
+    await runtime.run("SFO to JFK")
+    tools.opened[0].healthy = False
+    runtime.last_checked = 0.0  # Idle for longer than the health check interval
+
+    result = await runtime.run("SFO to JFK")
+
+    assert result.final_output == "answer to SFO to JFK"
+    assert len(tools.opened) == 2
+    assert tools.closed == [tools.opened[0]]
+
+
+@pytest.mark.asyncio
+async def test_run_streamed_yields_events_in_order(runtime):
+    events = [event async for event in runtime.run_streamed("SFO to JFK")]
+
+    assert [(event.kind, event.text, event.agent) for event in events] == [
+        ('agent', '', 'Flight Agent'),
+        ('tool_started', 'search_flights', 'Flight Agent'),
+        ('tool_finished', 'search_flights', 'Flight Agent'),
+        ('final', 'answer to SFO to JFK', 'Flight Agent'),
+    ]
+    assert events[-1].result.final_output == "answer to SFO to JFK"
+
+
+@pytest.mark.asyncio
+async def test_run_streamed_raises_an_error_from_mid_stream(runtime):
+    kinds = []
+    with pytest.raises(RuntimeError, match="model error"):
+        async for event in runtime.run_streamed("fail"):
+            kinds.append(event.kind)
+
+    assert kinds == ['agent']
+    assert runtime.last_checked == 0.0  # The connection is checked before the next run
+    assert (await runtime.run("SFO to JFK")).final_output == "answer to SFO to JFK"
+
+
+@pytest.mark.asyncio
+async def test_restarts_after_shutdown(runtime, tools):
+    await runtime.run("SFO to JFK")
+    first_lock = runtime._connect_lock
+    runtime.shutdown()
+
+    assert runtime.loop is None
+    assert tools.closed == tools.opened
+
+    result = await runtime.run("SFO to JFK")
+
+    assert result.final_output == "answer to SFO to JFK"
+    assert len(tools.opened) == 2
+    assert runtime._connect_lock is not first_lock
+
+
+@pytest.mark.asyncio
+async def test_calls_share_one_duffel_pool_until_shutdown(runtime, monkeypatch):
+    monkeypatch.syspath_prepend(str(Path(__file__).parent / "flights-mcp" / "src"))
+    import flights.inprocess
+
+    pools = []
+
+    @asynccontextmanager
+    async def client_pool():
+        pools.append('opened')
+        try:
+            yield
+        finally:
+            pools.append('closed')
+
+    monkeypatch.setattr(flights.inprocess, "client_pool", client_pool)
+
+    async def search(origin):
+        return f"searched from {origin}"
+
+    assert await runtime.call(search, "SFO") == "searched from SFO"
+    assert await runtime.call(search, "JFK") == "searched from JFK"
+    assert pools == ['opened']
+    runtime.shutdown()
+    assert pools == ['opened', 'closed']
@@ -0,0 +1,157 @@
+"""
+Tests for the fast path: which briefs it takes, its fallbacks and the runs it records.
+
+The search service and the answer writer are faked, so no Duffel or model
+call is made.
+"""
+
+import json
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("agents")
+pytest.importorskip("logfire")
+
+import db
+import fast_path
+from scoping_agents import FlightSearchBrief, StructuredFlightSearch, TripLeg
+
+SOON = date.today() + timedelta(days=30)
+OFFER = {
+    'offer_id': 'off_0001',
+    'price': {'amount': '240.00', 'currency': 'USD'},
+    'slices': [{'origin': 'SFO', 'destination': 'JFK', 'carrier': 'Delta Air Lines',
+                'departure': f'{SOON}T08:00:00', 'arrival': f'{SOON}T16:30:00',
+                'duration': 'PT5H30M', 'stops_description': 'Non-stop'}],
+}
+
+
+def _day(offset: int) -> str:
+    return (SOON + timedelta(days=offset)).isoformat()
+
+
+def _search(**fields) -> StructuredFlightSearch:
+    search = dict(type="round_trip", legs=[TripLeg(origin="SFO", destination="JFK", departure_date=_day(0))],
+                  return_date=_day(7), cabin_class="economy", adults=1, max_connections=None, max_price=None,
+                  complete=True)
+    search.update(fields)
+    return StructuredFlightSearch(**search)
+
+
+@pytest.fixture(autouse=True)
+def flights_package(monkeypatch):
+    """Import the flights package from this repository."""
+    monkeypatch.syspath_prepend(str(Path(__file__).parent / "flights-mcp" / "src"))
+
+
+@pytest.fixture
+def database(monkeypatch, tmp_path):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "searches.db"))
+    db.init_database()
+    return db.DB_PATH
+
+
+@pytest.fixture
+def duffel(monkeypatch):
+    """Fake search tools returning one offer."""
+    import flights.services
+
+    async def search(params):
+        return json.dumps({'result_id': 'rs_1', 'offers': [OFFER]})
+
+    monkeypatch.setattr(flights.services, "search_flights", search)
+    monkeypatch.setattr(flights.services, "search_multi_city", search)
+
+
+def _writer(monkeypatch, answer=None, error=None):
+    async def run(agent, writer_input, max_turns):
+        if error is not None:
+            raise error
+        return SimpleNamespace(final_output=answer,
+                               context_wrapper=SimpleNamespace(usage=SimpleNamespace(total_tokens=321)))
+
+    monkeypatch.setattr(fast_path, "Runner", SimpleNamespace(run=run))
+
+
+@pytest.mark.parametrize("fields, reason", [
+    ({'complete': False}, "brief needs the agent"),
+    ({'legs': []}, "unexpected number of legs"),
+    ({'legs': [TripLeg(origin="SFOX", destination="JFK", departure_date=_day(0))]}, "not an IATA code"),
+    ({'legs': [TripLeg(origin="SFO", destination="J1K", departure_date=_day(0))]}, "not an IATA code"),
+    ({'legs': [TripLeg(origin="SFO", destination="JFK", departure_date="2020-01-10")]}, "invalid or past date"),
+    ({'legs': [TripLeg(origin="SFO", destination="JFK", departure_date="next friday")]}, "invalid or past date"),
+    ({'return_date': _day(-1)}, "invalid or past date"),
+    ({'type': "multi_city", 'return_date': None, 'legs': [
+        TripLeg(origin="SFO", destination="JFK", departure_date=_day(5)),
+        TripLeg(origin="JFK", destination="LHR", departure_date=_day(2)),
+    ]}, "invalid or past date"),
+    ({'max_price': -10.0}, "invalid search parameters"),
+])
+def test_search_params_sends_unusable_briefs_to_the_agent(fields, reason):
+    assert fast_path.search_params(_search(**fields)) == (None, reason)
+
+
+def test_search_params_builds_a_ranked_search():
+    params, reason = fast_path.search_params(_search(legs=[TripLeg(origin="sfo", destination="jfk",
+                                                                   departure_date=_day(0))]))
+
+    assert reason is None
+    assert (params.origin, params.destination, params.return_date) == ("SFO", "JFK", _day(7))
+    assert params.top_k == fast_path.FAST_PATH_TOP_K
+    assert params.score_weights.price == fast_path.FAST_PATH_SCORE_WEIGHTS['price']
+    assert fast_path.search_params(None) == (None, "no structured search")
+
+
+@pytest.mark.asyncio
+async def test_offers_are_listed_when_the_answer_writer_fails(monkeypatch, duffel):
+    _writer(monkeypatch, error=RuntimeError("model unavailable"))
+    params, _ = fast_path.search_params(_search())
+
+    outcome = await fast_path._fast_search(params, "Round trip SFO to JFK")
+
+    assert outcome.fallback_reason is None
+    assert outcome.total_tokens == 0
+    assert outcome.answer == fast_path._format_offers([OFFER])
+    assert "240.00 USD (offer ID: off_0001)" in outcome.answer
+
+
+@pytest.mark.asyncio
+async def test_fast_and_agent_runs_are_recorded(monkeypatch, database, duffel):
+    _writer(monkeypatch, answer="Delta at 240 USD is the best pick.")
+
+    async def call(fn, *args):
+        return await fn(*args)
+
+    async def agent_run(query, verbose, session):
+        result = SimpleNamespace(context_wrapper=SimpleNamespace(usage=SimpleNamespace(total_tokens=5000)))
+        yield fast_path.AgentEvent('final', "The agent's answer", result=result)
+
+    monkeypatch.setattr(fast_path, "get_runtime", lambda: SimpleNamespace(call=call))
+    monkeypatch.setattr(fast_path, "stream_flights", agent_run)
+
+    brief = FlightSearchBrief(flight_search_brief="Round trip SFO to JFK", search=_search())
+    fast = [event async for event in fast_path.stream_flights_from_brief(brief, session_id="s1")]
+    open_ended = FlightSearchBrief(flight_search_brief="Somewhere warm in March", search=None)
+    agent = [event async for event in fast_path.stream_flights_from_brief(open_ended, session_id="s1")]
+
+    assert [event.kind for event in fast] == ['tool_started', 'tool_finished', 'final']
+    assert fast[-1].text == "Delta at 240 USD is the best pick."
+    assert agent[-1].text == "The agent's answer"
+
+    with sqlite3.connect(database) as conn:
+        rows = conn.execute("SELECT session_id, path, total_tokens, fallback_reason, latency_ms "
+                            "FROM search_runs ORDER BY id").fetchall()
+    assert [row[:4] for row in rows] == [
+        ("s1", "fast", 321, None),
+        ("s1", "agent", 5000, "no structured search"),
+    ]
+    assert all(row[4] >= 0 for row in rows)
+
+    report = db.get_fast_path_report()
+    assert (report['runs'], report['fast_path_runs'], report['fast_path_rate']) == (2, 1, 0.5)
+    assert report['paths']['agent']['avg_tokens'] == 5000
+    assert report['fallback_reasons'] == {"no structured search": 1}
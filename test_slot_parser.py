@@ -0,0 +1,215 @@
+"""
+Precision tests for the rule-based flight slot parser.
+
+Each corpus entry is a user message and the slots a careful reader would
+fill from it (None where the message does not say). The parser may leave a
+slot empty, which only costs a clarifier call, but a slot it fills has to be
+right, and a message it calls complete must really be complete, since that
+skips the clarifier.
+"""
+
+import time
+from datetime import date
+
+from slot_parser import parse_flight_slots
+
+TODAY = date(2025, 9, 1)  # A Monday
+
+SLOTS = ("origin", "destination", "departure_date", "return_date", "trip_type", "adults", "cabin_class")
+
+CORPUS = [
+    ("Find a one-way flight from San Francisco to New York on September 15, 2025 for 1 adult in economy",
+     dict(origin="SFO", destination="NYC", departure_date=date(2025, 9, 15), trip_type="one_way",
+          adults=1, cabin_class="economy", complete=True)),
+    ("Search for round-trip flights from LAX to London, departing September 20 and returning September 27, 2025, "
+     "for 2 adults in business class",
+     dict(origin="LAX", destination="LON", departure_date=date(2025, 9, 20), return_date=date(2025, 9, 27),
+          trip_type="round_trip", adults=2, cabin_class="business", complete=True)),
+    ("Find the cheapest flights from SFO to LAX for next week",
+     dict(origin="SFO", destination="LAX")),
+    ("Plan a multi-city trip: NYC to Paris on Sep 28, Paris to Rome on Oct 3, Rome back to NYC on Oct 8",
+     dict(origin="NYC", destination="PAR", departure_date=date(2025, 9, 28))),
+    ("BOS-ORD next friday, one way, just me, economy",
+     dict(origin="BOS", destination="ORD", departure_date=date(2025, 9, 5), trip_type="one_way",
+          adults=1, cabin_class="economy", complete=True)),
+    ("to london from paris 10/12 - 10/19, 2 adults, premium economy",
+     dict(origin="PAR", destination="LON", departure_date=date(2025, 10, 12), return_date=date(2025, 10, 19),
+          trip_type="round_trip", adults=2, cabin_class="premium_economy", complete=True)),
+    ("JFK to CDG Oct 3-10 for two adults, economy",
+     dict(origin="JFK", destination="CDG", departure_date=date(2025, 10, 3), return_date=date(2025, 10, 10),
+          trip_type="round_trip", adults=2, cabin_class="economy", complete=True)),
+    ("I want to fly from Chicago to Tokyo on 2025-11-02 and come back 2025-11-16. 3 passengers, business class.",
+     dict(origin="CHI", destination="TYO", departure_date=date(2025, 11, 2), return_date=date(2025, 11, 16),
+          trip_type="round_trip", adults=3, cabin_class="business", complete=True)),
+    ("Me and my wife want to go from Seattle to Honolulu on December 20th for a week, economy please",
+     dict(origin="SEA", destination="HNL", departure_date=date(2025, 12, 20), return_date=date(2025, 12, 27),
+          trip_type="round_trip", adults=2, cabin_class="economy", complete=True)),
+    ("One way SFO to SEA tomorrow, 1 adult, coach",
+     dict(origin="SFO", destination="SEA", departure_date=date(2025, 9, 2), trip_type="one_way",
+          adults=1, cabin_class="economy", complete=True)),
+    ("Flights from Denver to Atlanta in 2 weeks, one-way, 4 travelers, economy",
+     dict(origin="DEN", destination="ATL", departure_date=date(2025, 9, 15), trip_type="one_way",
+          adults=4, cabin_class="economy", complete=True)),
+    ("Business trip to Boston next month, what are my options from Austin?",
+     dict(origin="AUS", destination="BOS")),
+    ("I need to be in Miami for a conference, flying from Dallas",
+     dict(origin="DFW", destination="MIA")),
+    ("Cheapest way to get from Toronto to Vancouver on Nov 14?",
+     dict(origin="YTO", destination="YVR", departure_date=date(2025, 11, 14))),
+    ("Two adults and a child from Orlando to Las Vegas on 9/20, one way, economy",
+     dict(origin="MCO", destination="LAS", departure_date=date(2025, 9, 20), trip_type="one_way",
+          adults=2, cabin_class="economy")),
+    ("Round trip to Rome from NYC leaving Oct 10, 2 adults, economy",
+     dict(origin="NYC", destination="ROM", departure_date=date(2025, 10, 10), trip_type="round_trip",
+          adults=2, cabin_class="economy")),
+    ("Fly first class from LHR to DXB on the 3rd of November, one way, solo",
+     dict(origin="LHR", destination="DXB", departure_date=date(2025, 11, 3), trip_type="one_way",
+          adults=1, cabin_class="first", complete=True)),
+    ("We're a group of 5 flying Madrid to Lisbon on Saturday, one way in economy",
+     dict(origin="MAD", destination="LIS", departure_date=date(2025, 9, 6), trip_type="one_way",
+          adults=5, cabin_class="economy", complete=True)),
+    ("Any flights to Singapore?",
+     dict(destination="SIN")),
+    ("What's the weather like in Paris in October?",
+     dict()),
+    ("SFO to JFK on Sep 15 returning Sep 22, 1 adult, economy",
+     dict(origin="SFO", destination="JFK", departure_date=date(2025, 9, 15), return_date=date(2025, 9, 22),
+          trip_type="round_trip", adults=1, cabin_class="economy", complete=True)),
+    ("Flights from Boston to Dublin Jan 5 to Jan 12, 2 adults, economy",
+     dict(origin="BOS", destination="DUB", departure_date=date(2026, 1, 5), return_date=date(2026, 1, 12),
+          trip_type="round_trip", adults=2, cabin_class="economy", complete=True)),
+    ("Looking at flights from Sydney to Auckland sometime in early March, flexible",
+     dict(origin="SYD", destination="AKL")),
+    ("NYC to LA on the 15th for 2 people",
+     dict(origin="NYC", adults=2)),
+    ("From Atlanta to Cancun March 3 2024, one way, 1 adult, economy",
+     dict(origin="ATL", destination="CUN", trip_type="one_way", adults=1, cabin_class="economy")),
+    ("I'd like to fly from Mumbai to Singapore on 12 Dec and fly back on 20 Dec in premium economy, party of 3",
+     dict(origin="BOM", destination="SIN", departure_date=date(2025, 12, 12), return_date=date(2025, 12, 20),
+          trip_type="round_trip", adults=3, cabin_class="premium_economy", complete=True)),
+    ("my husband and I are going from Berlin to Athens on Friday, returning Sunday, economy",
+     dict(origin="BER", destination="ATH", departure_date=date(2025, 9, 5), return_date=date(2025, 9, 7),
+          trip_type="round_trip", adults=2, cabin_class="economy", complete=True)),
+    ("EWR to SFO the day after tomorrow one way 1 adult business class",
+     dict(origin="EWR", destination="SFO", departure_date=date(2025, 9, 3), trip_type="one_way",
+          adults=1, cabin_class="business", complete=True)),
+    ("Flights between Frankfurt and Zurich with a baby, Oct 1, one way, 2 adults, economy",
+     dict(origin="FRA", destination="ZRH", departure_date=date(2025, 10, 1), trip_type="one_way",
+          adults=2, cabin_class="economy")),
+    ("Is it cheaper to fly into Newark or JFK from Miami on Sep 30?",
+     dict(origin="MIA", departure_date=date(2025, 9, 30))),
+    ("Hong Kong to Bangkok for 2 adults in 3 days, economy, one way",
+     dict(origin="HKG", destination="BKK", departure_date=date(2025, 9, 4), trip_type="one_way",
+          adults=2, cabin_class="economy", complete=True)),
+    ("PHX -> DEN on 10/5, back on 10/7, 1 adult, economy",
+     dict(origin="PHX", destination="DEN", departure_date=date(2025, 10, 5), return_date=date(2025, 10, 7),
+          trip_type="round_trip", adults=1, cabin_class="economy", complete=True)),
+    ("I will be traveling for business to Houston",
+     dict(destination="IAH")),
+    ("Need 2 tickets Boston to Chicago, Nov 21, first class, one way",
+     dict(origin="BOS", destination="CHI", departure_date=date(2025, 11, 21), trip_type="one_way",
+          adults=2, cabin_class="first", complete=True)),
+    ("Find flights from Seoul to Osaka during the first week of November",
+     dict(origin="SEL", destination="OSA")),
+    ("SFO to NYC then to London then home, October",
+     dict(origin="SFO", destination="NYC")),
+    # A relative return counts from the departure, and only from a calendar date
+    ("From SFO to NYC on Oct 20 for 1 adult in economy, back in 5 days",
+     dict(origin="SFO", destination="NYC", departure_date=date(2025, 10, 20), return_date=date(2025, 10, 25),
+          trip_type="round_trip", adults=1, cabin_class="economy", complete=True)),
+    ("SFO to NYC tomorrow, back in 5 days, 1 adult, economy",
+     dict(origin="SFO", destination="NYC", departure_date=date(2025, 9, 2), trip_type="round_trip",
+          adults=1, cabin_class="economy")),
+    ("Lisbon to Rome on Oct 2 and back on Oct 9, coming home in a week, 1 adult, economy",
+     dict(origin="LIS", destination="ROM", departure_date=date(2025, 10, 2), trip_type="round_trip",
+          adults=1, cabin_class="economy")),
+    # Dependants the adult count does not cover
+    ("2 adults with my 2 sons from Boston to Denver on Oct 4, one way, economy",
+     dict(origin="BOS", destination="DEN", departure_date=date(2025, 10, 4), trip_type="one_way",
+          adults=2, cabin_class="economy")),
+    ("Flying with the grandkids from Atlanta to Orlando Dec 20-27, 2 adults, economy",
+     dict(origin="ATL", destination="MCO", departure_date=date(2025, 12, 20), return_date=date(2025, 12, 27),
+          trip_type="round_trip", adults=2, cabin_class="economy")),
+    ("Seattle to Denver on Oct 10 returning in 2 weeks, 2 adults, business class, my daughter too",
+     dict(origin="SEA", destination="DEN", departure_date=date(2025, 10, 10), return_date=date(2025, 10, 24),
+          trip_type="round_trip", adults=2, cabin_class="business")),
+    # A cabin needs a cabin noun or "fly business", and a choice between cabins is no cabin
+    ("From Chicago to Austin Nov 3 one way 1 adult economy, I'm in business meetings",
+     dict(origin="CHI", destination="AUS", departure_date=date(2025, 11, 3), trip_type="one_way",
+          adults=1, cabin_class="economy", complete=True)),
+    ("We fly business from Boston to London on Oct 8, one way, 2 adults",
+     dict(origin="BOS", destination="LON", departure_date=date(2025, 10, 8), trip_type="one_way",
+          adults=2, cabin_class="business", complete=True)),
+    ("Denver to Phoenix Oct 12, one way, 1 adult, premium economy or business",
+     dict(origin="DEN", destination="PHX", departure_date=date(2025, 10, 12), trip_type="one_way", adults=1)),
+    ("I want to fly first to Denver and then on to Phoenix, 1 adult",
+     dict(destination="DEN", adults=1)),
+    # Hedged dates and alternative airports are left for the clarifier
+    ("Boston to Chicago Nov 3 or Nov 4 one way 1 adult economy",
+     dict(origin="BOS", destination="CHI", trip_type="one_way", adults=1, cabin_class="economy")),
+    ("Boston to Chicago the week of Nov 3 one way 1 adult economy",
+     dict(origin="BOS", destination="CHI", trip_type="one_way", adults=1, cabin_class="economy")),
+    ("Miami to Boston around Oct 12, one way, 2 adults, economy",
+     dict(origin="MIA", destination="BOS", trip_type="one_way", adults=2, cabin_class="economy")),
+    ("SFO to JFK Oct 3, flexible, returning Oct 10 or so, 1 adult, economy",
+     dict(origin="SFO", destination="JFK", trip_type="round_trip", adults=1, cabin_class="economy")),
+    ("Denver to LAX on Oct 3 and back Oct 10 or 11, 1 adult, economy",
+     dict(origin="DEN", destination="LAX", departure_date=date(2025, 10, 3), trip_type="round_trip",
+          adults=1, cabin_class="economy")),
+    ("Flying to Rome from JFK or Newark on Oct 5, one way, 1 adult, economy",
+     dict(destination="ROM", departure_date=date(2025, 10, 5), trip_type="one_way", adults=1,
+          cabin_class="economy")),
+]
+
+
+def _parse(text):
+    return parse_flight_slots(text, today=TODAY)
+
+
+def test_slot_precision():
+    """Slots the parser fills are right."""
+    filled = correct = 0
+    wrong = []
+    for text, expected in CORPUS:
+        slots = _parse(text)
+        for name in SLOTS:
+            value = getattr(slots, name)
+            if value is None:
+                continue
+            filled += 1
+            if value == expected.get(name):
+                correct += 1
+            else:
+                wrong.append((text, name, value, expected.get(name)))
+    assert correct / filled == 1.0, wrong
+
+
+def test_completeness_precision_and_recall():
+    """A message called complete is complete, and most complete messages are recognized."""
+    judged_complete = [text for text, _ in CORPUS if _parse(text).is_complete()]
+    truly_complete = {text for text, expected in CORPUS if expected.get("complete")}
+    false_skips = [text for text in judged_complete if text not in truly_complete]
+    # Every false skip would skip a needed clarification
+    assert (len(judged_complete) - len(false_skips)) / len(judged_complete) == 1.0, false_skips
+    assert len(judged_complete) / len(truly_complete) >= 0.9
+
+
+def test_complete_messages_parse_fully():
+    for text, expected in CORPUS:
+        if expected.get("complete"):
+            slots = _parse(text)
+            assert {name: getattr(slots, name) for name in SLOTS} == {name: expected.get(name) for name in SLOTS}, text
+
+
+def test_parse_is_sub_millisecond():
+    texts = [text for text, _ in CORPUS]
+    for text in texts:  # Warm up
+        _parse(text)
+    timings = []
+    for _ in range(20):
+        for text in texts:
+            started = time.perf_counter()
+            _parse(text)
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    assert timings[len(timings) // 2] < 0.001